@@ -1,9 +1,29 @@
+from .agent_card_cache import AgentCardCache, AgentCardCacheStats
+from .authorization_store import (
+    AuthorizationStore,
+    InMemoryAuthorizationStore,
+    SqliteAuthorizationStore,
+)
+from .fan_out import FanOutEvent, is_answer
+from .requirements_cache import PaymentRequirementsCache, requirements_cache_key
+from .status_dispatcher import StatusDispatcher, StatusDispatcherStats
 from .x402_client import X402Client
 from .x402_client_factory import X402ClientFactory
 from .x402_middleware import x402_middleware
 from .x402_remote_a2a_agent import X402RemoteA2aAgent
 
 __all__ = [
+    "AgentCardCache",
+    "AgentCardCacheStats",
+    "AuthorizationStore",
+    "FanOutEvent",
+    "InMemoryAuthorizationStore",
+    "is_answer",
+    "PaymentRequirementsCache",
+    "requirements_cache_key",
+    "SqliteAuthorizationStore",
+    "StatusDispatcher",
+    "StatusDispatcherStats",
     "x402_middleware",
     "X402Client",
     "X402ClientFactory",
@@ -1,10 +1,16 @@
-from typing import Any
+from typing import Any, Sequence, Tuple
 
 from a2a.client import ClientCallContext, ClientCallInterceptor
+from a2a.client.transports import ClientTransport, JsonRpcTransport, RestTransport
 from a2a.extensions.common import HTTP_EXTENSION_HEADER
 from a2a.types import AgentCard
 from x402_a2a import X402_EXTENSION_URI
 
+try:
+    from a2a.client.transports.grpc import GrpcTransport
+except ImportError:  # grpcio is an optional dependency of a2a-sdk
+    GrpcTransport = None  # type: ignore[assignment, misc]
+
 
 class ExtensionsInterceptor(ClientCallInterceptor):
     """Interceptor that adds X-A2A-Extensions header to all requests."""
@@ -29,7 +35,9 @@ class ExtensionsInterceptor(ClientCallInterceptor):
             headers = http_kwargs.get("headers", {})
             existing_extensions = headers.get(HTTP_EXTENSION_HEADER, "")
             split = existing_extensions.split(", ") if existing_extensions else []
-            headers[HTTP_EXTENSION_HEADER] = ", ".join(self.extensions + split)
+            headers[HTTP_EXTENSION_HEADER] = ", ".join(
+                self.extensions + [e for e in split if e not in self.extensions]
+            )
             http_kwargs["headers"] = headers
 
         return request_payload, http_kwargs
@@ -40,3 +48,73 @@ x402_extension_interceptor = ExtensionsInterceptor(
         X402_EXTENSION_URI,
     ]
 )
+
+
+class _ExtensionsMetadataStub:
+    """
+    gRPC stub sending the extensions as call metadata.
+
+    GrpcTransport does not run ClientCallInterceptors, so the extensions are
+    added to every RPC made through its stub instead, streaming ones included.
+    """
+
+    def __init__(self, stub: Any, interceptor: ExtensionsInterceptor):
+        self._stub = stub
+        self.interceptor = interceptor
+
+    def __getattr__(self, name: str) -> Any:
+        method = getattr(self._stub, name)
+        if not callable(method):
+            return method
+
+        def call(
+            request: Any,
+            *args: Any,
+            metadata: Sequence[Tuple[str, str]] | None = None,
+            **kwargs: Any,
+        ) -> Any:
+            return method(
+                request,
+                *args,
+                metadata=(
+                    *(metadata or ()),
+                    (
+                        HTTP_EXTENSION_HEADER.lower(),
+                        ", ".join(self.interceptor.extensions),
+                    ),
+                ),
+                **kwargs,
+            )
+
+        return call
+
+
+def install_extensions_interceptor(
+    transport: ClientTransport,
+    interceptor: ExtensionsInterceptor = x402_extension_interceptor,
+) -> bool:
+    """
+    Signal the interceptor's extensions on every request made by a transport.
+
+    Supports the JSON-RPC and REST transports, through their interceptors,
+    and the gRPC transport, through call metadata. Installing twice is a
+    no-op.
+
+    Returns:
+        False if the transport is not supported
+    """
+    if isinstance(transport, (JsonRpcTransport, RestTransport)):
+        if interceptor not in transport.interceptors:
+            transport.interceptors.append(interceptor)
+        return True
+
+    if GrpcTransport is not None and isinstance(transport, GrpcTransport):
+        stub = transport.stub
+        if not (
+            isinstance(stub, _ExtensionsMetadataStub)
+            and stub.interceptor is interceptor
+        ):
+            transport.stub = _ExtensionsMetadataStub(stub, interceptor)  # type: ignore[assignment]
+        return True
+
+    return False
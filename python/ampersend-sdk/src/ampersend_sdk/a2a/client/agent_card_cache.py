@@ -0,0 +1,219 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from typing import Any, Dict, NamedTuple, Optional, Set
+
+import httpx
+from a2a.types import AgentCard
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class AgentCardCacheStats(BaseModel):
+    """Counters for an AgentCardCache."""
+
+    hits: int = 0
+    stale_hits: int = 0
+    fetched: int = 0
+    revalidated: int = 0
+    errors: int = 0
+
+
+class _Entry(NamedTuple):
+    card: AgentCard
+    fetched_at: float
+    max_age: float
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class AgentCardCache:
+    """
+    Agent cards shared by buyers, revalidated with HTTP cache validators.
+
+    A card is used as is for `ttl` seconds, or the `max-age` the seller's
+    `Cache-Control` asks for. Past that, it is revalidated with a conditional
+    GET (`If-None-Match` / `If-Modified-Since`), which costs the seller no
+    body when the card has not changed. Cards stale by less than `max_stale`
+    seconds are returned right away and revalidated in the background; older
+    ones are revalidated before returning. When revalidation fails, the
+    stale card is kept.
+
+    With a `snapshot_path`, cards are saved to a JSON file after each fetch
+    and loaded from it on start, so a cold start is served from the snapshot
+    while the cards are revalidated in the background.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = 300.0,
+        max_stale: float = 86400.0,
+        snapshot_path: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds a card is used without revalidating when the seller
+                does not set a max-age
+            max_stale: Seconds past expiry a card is still returned while
+                being revalidated in the background
+            snapshot_path: JSON file the cards are persisted to
+        """
+        self._ttl = ttl
+        self._max_stale = max_stale
+        self._snapshot_path = snapshot_path
+        self._entries: Dict[str, _Entry] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._tasks: Set[asyncio.Task[Any]] = set()
+        self._snapshot_lock = asyncio.Lock()
+        self.stats = AgentCardCacheStats()
+        if snapshot_path is not None:
+            self._entries = _load_snapshot(snapshot_path)
+
+    async def get(self, url: str, httpx_client: httpx.AsyncClient) -> AgentCard:
+        """
+        Agent card at `url`.
+
+        Raises:
+            httpx.HTTPError: If the card is not cached and cannot be fetched
+        """
+        entry = self._entries.get(url)
+        if entry is not None:
+            age = time.time() - entry.fetched_at
+            if age < entry.max_age:
+                self.stats.hits += 1
+                return entry.card
+            if age < entry.max_age + self._max_stale:
+                self.stats.stale_hits += 1
+                self._revalidate_in_background(url, httpx_client)
+                return entry.card
+
+        return (await self._refresh(url, httpx_client)).card
+
+    def invalidate(self, url: str) -> None:
+        """Forget the card at `url`."""
+        self._entries.pop(url, None)
+
+    async def close(self) -> None:
+        """Wait for background revalidations."""
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _revalidate_in_background(
+        self, url: str, httpx_client: httpx.AsyncClient
+    ) -> None:
+        lock = self._locks.get(url)
+        if lock is not None and lock.locked():
+            return
+
+        async def revalidate() -> None:
+            try:
+                await self._refresh(url, httpx_client)
+            except Exception as e:
+                logger.warning(f'revalidating agent card {url} failed with "{e}"')
+
+        task = asyncio.create_task(revalidate())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, url: str, httpx_client: httpx.AsyncClient) -> _Entry:
+        lock = self._locks.setdefault(url, asyncio.Lock())
+        async with lock:
+            cached = self._entries.get(url)
+            if cached is not None and time.time() - cached.fetched_at < cached.max_age:
+                # Refreshed while waiting for the lock
+                return cached
+
+            headers = {}
+            if cached is not None and cached.etag is not None:
+                headers["If-None-Match"] = cached.etag
+            if cached is not None and cached.last_modified is not None:
+                headers["If-Modified-Since"] = cached.last_modified
+
+            try:
+                response = await httpx_client.get(url, headers=headers)
+                if cached is not None and response.status_code == 304:
+                    self.stats.revalidated += 1
+                    entry = cached._replace(
+                        fetched_at=time.time(),
+                        max_age=self._max_age(response, cached.max_age),
+                    )
+                else:
+                    response.raise_for_status()
+                    self.stats.fetched += 1
+                    entry = _Entry(
+                        card=AgentCard.model_validate(response.json()),
+                        fetched_at=time.time(),
+                        max_age=self._max_age(response, self._ttl),
+                        etag=response.headers.get("etag"),
+                        last_modified=response.headers.get("last-modified"),
+                    )
+            except Exception:
+                self.stats.errors += 1
+                raise
+
+            self._entries[url] = entry
+            if self._snapshot_path is not None:
+                async with self._snapshot_lock:
+                    await asyncio.to_thread(
+                        _save_snapshot, self._snapshot_path, dict(self._entries)
+                    )
+            return entry
+
+    def _max_age(self, response: httpx.Response, default: float) -> float:
+        cache_control = response.headers.get("cache-control", "")
+        if "no-cache" in cache_control or "no-store" in cache_control:
+            return 0.0
+        match = _MAX_AGE.search(cache_control)
+        return float(match.group(1)) if match else default
+
+
+def _load_snapshot(path: str) -> Dict[str, _Entry]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            rows = json.load(f)
+        return {
+            url: _Entry(
+                card=AgentCard.model_validate(row["card"]),
+                fetched_at=row["fetched_at"],
+                max_age=row["max_age"],
+                etag=row.get("etag"),
+                last_modified=row.get("last_modified"),
+            )
+            for url, row in rows.items()
+        }
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f'loading agent card snapshot {path} failed with "{e}"')
+        return {}
+
+
+def _save_snapshot(path: str, entries: Dict[str, _Entry]) -> None:
+    rows = {
+        url: {
+            "card": entry.card.model_dump(
+                mode="json", exclude_none=True, by_alias=True
+            ),
+            "fetched_at": entry.fetched_at,
+            "max_age": entry.max_age,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+        }
+        for url, entry in entries.items()
+    }
+    # Written aside and renamed so a crash never leaves a partial snapshot
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(rows, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f'saving agent card snapshot {path} failed with "{e}"')
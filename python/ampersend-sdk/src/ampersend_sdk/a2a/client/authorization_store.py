@@ -0,0 +1,154 @@
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Optional, Protocol, Tuple
+
+from x402_a2a.types import PaymentPayload
+
+from ...sqlite import SqliteDatabase
+from ...x402.treasurer import X402Authorization
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS authorizations (
+    task_id TEXT NOT NULL,
+    context_id TEXT NOT NULL,
+    authorization_id TEXT NOT NULL,
+    payment TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (task_id, context_id)
+)
+"""
+
+
+def authorization_expires_at(authorization: X402Authorization) -> float:
+    """Unix time after which the authorization's payment can no longer settle."""
+    try:
+        return float(authorization.payment.payload.authorization.valid_before)
+    except (AttributeError, TypeError, ValueError):
+        return float("inf")
+
+
+class AuthorizationStore(Protocol):
+    """
+    Remembers the payment made for a task.
+
+    Lets x402_middleware resubmit the same payment, instead of paying again,
+    when a task asks for payment after a reconnect or a restart.
+    """
+
+    async def get(self, task_id: str, context_id: str) -> Optional[X402Authorization]:
+        """Authorization stored for the task, None if missing or expired."""
+        ...
+
+    async def put(
+        self, task_id: str, context_id: str, authorization: X402Authorization
+    ) -> None:
+        """Store the authorization paid for the task."""
+        ...
+
+    async def delete(self, task_id: str, context_id: str) -> None:
+        """Forget the task's authorization."""
+        ...
+
+
+class InMemoryAuthorizationStore:
+    """AuthorizationStore holding the most recently used `max_entries` tasks."""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[Tuple[str, str], X402Authorization] = OrderedDict()
+
+    async def get(self, task_id: str, context_id: str) -> Optional[X402Authorization]:
+        key = (task_id, context_id)
+        authorization = self._entries.get(key)
+        if authorization is None:
+            return None
+        if authorization_expires_at(authorization) <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return authorization
+
+    async def put(
+        self, task_id: str, context_id: str, authorization: X402Authorization
+    ) -> None:
+        key = (task_id, context_id)
+        self._entries[key] = authorization
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, task_id: str, context_id: str) -> None:
+        self._entries.pop((task_id, context_id), None)
+
+
+class SqliteAuthorizationStore:
+    """
+    AuthorizationStore persisted in SQLite, surviving process restarts.
+
+    `put` returns once the row is committed, so a payment is never
+    submitted before it is recorded. Expired rows are removed on `put`.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            path: SQLite database file
+        """
+        self._db = SqliteDatabase(path, _SCHEMA)
+
+    async def get(self, task_id: str, context_id: str) -> Optional[X402Authorization]:
+        row = await self._db.run(
+            lambda db: db.execute(
+                "SELECT authorization_id, payment FROM authorizations"
+                " WHERE task_id = ? AND context_id = ? AND expires_at > ?",
+                (task_id, context_id, time.time()),
+            ).fetchone()
+        )
+        if row is None:
+            return None
+        return X402Authorization(
+            authorization_id=row[0],
+            payment=PaymentPayload.model_validate_json(row[1]),
+        )
+
+    async def put(
+        self, task_id: str, context_id: str, authorization: X402Authorization
+    ) -> None:
+        row = (
+            task_id,
+            context_id,
+            authorization.authorization_id,
+            authorization.payment.model_dump_json(by_alias=True),
+            authorization_expires_at(authorization),
+        )
+
+        def insert(db: sqlite3.Connection) -> None:
+            with db:
+                db.execute(
+                    "DELETE FROM authorizations WHERE expires_at <= ?", (time.time(),)
+                )
+                db.execute(
+                    "INSERT OR REPLACE INTO authorizations"
+                    " (task_id, context_id, authorization_id, payment, expires_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    row,
+                )
+
+        await self._db.run(insert)
+
+    async def delete(self, task_id: str, context_id: str) -> None:
+        def delete(db: sqlite3.Connection) -> None:
+            with db:
+                db.execute(
+                    "DELETE FROM authorizations WHERE task_id = ? AND context_id = ?",
+                    (task_id, context_id),
+                )
+
+        await self._db.run(delete)
+
+    async def close(self) -> None:
+        """Close the database."""
+        await self._db.close()
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+from typing import (
+    AsyncIterator,
+    Callable,
+    Dict,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from a2a.client import Client, ClientCallContext, ClientEvent
+from a2a.types import AgentCard, Message, TaskIdParams, TaskState
+
+logger = logging.getLogger(__name__)
+
+# Decides whether a seller's event is the answer the fan-out waits for
+WinnerPredicate = Callable[[ClientEvent | Message], bool]
+
+_TERMINAL_STATES = (
+    TaskState.completed,
+    TaskState.canceled,
+    TaskState.failed,
+    TaskState.rejected,
+)
+
+
+class FanOutEvent(NamedTuple):
+    """Event from one of the sellers a request was fanned out to."""
+
+    card: AgentCard
+    event: ClientEvent | Message
+
+
+def is_answer(event: ClientEvent | Message) -> bool:
+    """Default winner: a message reply or a completed task."""
+    if isinstance(event, Message):
+        return True
+    task, _update = event
+    return task.status.state == TaskState.completed
+
+
+async def fan_out(
+    clients: Sequence[Tuple[AgentCard, Client]],
+    request: Message,
+    *,
+    winner: WinnerPredicate = is_answer,
+    on_winner: Optional[Callable[[], None]] = None,
+    paid_seller: Optional[Callable[[], Optional[int]]] = None,
+    context: ClientCallContext | None = None,
+    cancel_timeout: float = 5.0,
+) -> AsyncIterator[FanOutEvent]:
+    """
+    Send a request to several sellers at once and merge their events.
+
+    Events are yielded as they arrive. The first event `winner` accepts
+    decides the winner: `on_winner` is called (e.g. to stop paying), the
+    other sellers' streams are cancelled and their unfinished tasks are
+    cancelled on the seller, best effort. The winner's stream is relayed
+    to its end. A seller whose request fails is logged and left out.
+
+    Once `paid_seller` names the seller already paid, only its events can
+    win, so the answer is never taken from a seller other than the one
+    paid.
+
+    Args:
+        clients: Seller cards with the clients to reach them
+        request: Message sent to every seller
+        winner: Whether an event is the answer waited for
+        on_winner: Called once the winner is known
+        paid_seller: Index in `clients` of the seller paid, None while no
+            seller is
+        context: Client call context for every request
+        cancel_timeout: Seconds to wait for the losers' remote cancellations
+    """
+    queue: asyncio.Queue[Tuple[int, Optional[ClientEvent | Message]]] = asyncio.Queue()
+    # Last task id seen per seller, for remote cancellation
+    task_ids: Dict[int, str] = {}
+    finished: set[int] = set()
+
+    async def pump(i: int, client: Client) -> None:
+        try:
+            async for event in client.send_message(
+                request.model_copy(), context=context
+            ):
+                if not isinstance(event, Message):
+                    task = event[0]
+                    task_ids[i] = task.id
+                    if task.status.state in _TERMINAL_STATES:
+                        finished.add(i)
+                await queue.put((i, event))
+        except Exception as e:
+            logger.warning(f'fan-out to {clients[i][0].url} failed with "{e}"')
+        finally:
+            await queue.put((i, None))
+
+    pumps = {
+        i: asyncio.create_task(pump(i, client))
+        for i, (_card, client) in enumerate(clients)
+    }
+    running = set(pumps)
+    winner_index: Optional[int] = None
+    try:
+        while running:
+            i, event = await queue.get()
+            if event is None:
+                running.discard(i)
+                continue
+            if winner_index is not None and i != winner_index:
+                continue
+
+            yield FanOutEvent(clients[i][0], event)
+
+            if (
+                winner_index is None
+                and (paid_seller is None or paid_seller() in (None, i))
+                and winner(event)
+            ):
+                winner_index = i
+                if on_winner is not None:
+                    on_winner()
+                losers = [j for j in running if j != i]
+                await _cancel([pumps[j] for j in losers])
+                running.difference_update(losers)
+                await _cancel_remote(
+                    [
+                        (clients[j][1], task_ids[j])
+                        for j in losers
+                        if j in task_ids and j not in finished
+                    ],
+                    cancel_timeout,
+                )
+    finally:
+        await _cancel(list(pumps.values()))
+
+
+async def _cancel(tasks: Sequence["asyncio.Task[None]"]) -> None:
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _cancel_remote(tasks: Sequence[Tuple[Client, str]], timeout: float) -> None:
+    async def cancel(client: Client, task_id: str) -> None:
+        try:
+            await asyncio.wait_for(
+                client.cancel_task(TaskIdParams(id=task_id)), timeout
+            )
+        except Exception as e:
+            logger.info(f'cancelling task {task_id} failed with "{e}"')
+
+    await asyncio.gather(*(cancel(client, task_id) for client, task_id in tasks))
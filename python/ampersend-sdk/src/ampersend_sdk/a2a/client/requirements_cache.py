@@ -0,0 +1,100 @@
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from a2a.client import ClientCallContext
+from a2a.types import AgentCard
+from x402_a2a.types import x402PaymentRequiredResponse
+
+RequirementsCacheKey = Tuple[str, Optional[str]]
+
+# ClientCallContext.state entry naming the skill a message is for
+SKILL_ID_STATE_KEY = "skill_id"
+
+
+def requirements_cache_key(
+    card: AgentCard, context: ClientCallContext | None = None
+) -> RequirementsCacheKey:
+    """
+    Cache key for a call: the agent card URL and the skill called.
+
+    The skill is read from `context.state["skill_id"]`, defaulting to the
+    card's only skill when it has exactly one.
+    """
+    skill_id = context.state.get(SKILL_ID_STATE_KEY) if context is not None else None
+    if skill_id is None and len(card.skills) == 1:
+        skill_id = card.skills[0].id
+    return (card.url, skill_id)
+
+
+class PaymentRequirementsCache:
+    """
+    Remembers the payment requirements sellers asked for, per agent and skill.
+
+    Used for payment preflight: a repeat call attaches a payment for the
+    cached requirements to its first message, saving the payment-required
+    round trip. Entries are replaced whenever the seller asks for payment
+    again and invalidated when a preflight payment is rejected. Sellers
+    ignoring preflight payments are marked unsupported, and their
+    requirements are not cached for `unsupported_ttl` seconds.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = 300.0,
+        max_entries: int = 256,
+        unsupported_ttl: float = 3600.0,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds cached requirements are used for preflight
+            max_entries: Maximum number of (agent, skill) entries
+            unsupported_ttl: Seconds an (agent, skill) ignoring preflight is
+                not preflighted again
+        """
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._unsupported_ttl = unsupported_ttl
+        self._entries: OrderedDict[
+            RequirementsCacheKey, Tuple[float, x402PaymentRequiredResponse]
+        ] = OrderedDict()
+        # Keys ignoring preflight, with the time they may be tried again
+        self._unsupported: OrderedDict[RequirementsCacheKey, float] = OrderedDict()
+
+    def get(self, key: RequirementsCacheKey) -> Optional[x402PaymentRequiredResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, payment_required = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return payment_required
+
+    def put(
+        self, key: RequirementsCacheKey, payment_required: x402PaymentRequiredResponse
+    ) -> None:
+        retry_at = self._unsupported.get(key)
+        if retry_at is not None:
+            if retry_at > time.monotonic():
+                return
+            del self._unsupported[key]
+        self._entries[key] = (time.monotonic() + self._ttl, payment_required)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: RequirementsCacheKey) -> None:
+        self._entries.pop(key, None)
+
+    def mark_unsupported(self, key: RequirementsCacheKey) -> None:
+        """Stop preflighting a seller that ignored a preflight payment."""
+        self._entries.pop(key, None)
+        self._unsupported[key] = time.monotonic() + self._unsupported_ttl
+        self._unsupported.move_to_end(key)
+        while len(self._unsupported) > self._max_entries:
+            self._unsupported.popitem(last=False)
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, NamedTuple, Set
+
+from pydantic import BaseModel
+from x402_a2a.types import PaymentStatus
+
+from ...x402.treasurer import X402Authorization, X402Treasurer
+
+logger = logging.getLogger(__name__)
+
+
+class StatusDispatcherStats(BaseModel):
+    """Counters for a StatusDispatcher."""
+
+    dispatched: int = 0
+    delivered: int = 0
+    failed: int = 0
+    dropped: int = 0
+
+
+class _StatusUpdate(NamedTuple):
+    status: PaymentStatus
+    authorization: X402Authorization
+    context: Dict[str, Any] | None
+
+
+class StatusDispatcher:
+    """
+    Delivers payment status updates to a treasurer in the background.
+
+    `dispatch` returns immediately so seller responses reach the caller
+    without waiting for `treasurer.onStatus` (an HTTP call for
+    AmpersendTreasurer). Updates for the same authorization are delivered
+    in order by a single task; different authorizations are delivered
+    concurrently. At most `max_pending` updates are queued at once, beyond
+    which new updates are dropped and counted in `stats.dropped`.
+    """
+
+    def __init__(self, treasurer: X402Treasurer, *, max_pending: int = 1000):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            treasurer: Treasurer receiving the status updates
+            max_pending: Maximum number of undelivered updates
+        """
+        self._treasurer = treasurer
+        self._max_pending = max_pending
+        self._pending = 0
+        self._queues: Dict[str, Deque[_StatusUpdate]] = {}
+        self._tasks: Set[asyncio.Task[None]] = set()
+        self._closed = False
+        self.stats = StatusDispatcherStats()
+
+    @property
+    def pending(self) -> int:
+        """Number of updates not yet delivered."""
+        return self._pending
+
+    def dispatch(
+        self,
+        status: PaymentStatus,
+        authorization: X402Authorization,
+        context: Dict[str, Any] | None = None,
+    ) -> None:
+        """Queue a status update for delivery without waiting for it."""
+        if self._closed or self._pending >= self._max_pending:
+            self.stats.dropped += 1
+            logger.warning(
+                f"dropped payment status {status} for {authorization.authorization_id}"
+            )
+            return
+
+        self._pending += 1
+        self.stats.dispatched += 1
+        key = authorization.authorization_id
+        queue = self._queues.get(key)
+        if queue is not None:
+            # The authorization's worker is running and will pick it up
+            queue.append(_StatusUpdate(status, authorization, context))
+            return
+
+        self._queues[key] = deque([_StatusUpdate(status, authorization, context)])
+        task = asyncio.create_task(self._deliver(key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def drain(self) -> None:
+        """Wait until every queued update has been delivered."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def close(self, timeout: float | None = 5.0) -> None:
+        """
+        Stop accepting updates and drain the queued ones.
+
+        Args:
+            timeout: Seconds to wait for the drain before cancelling
+                delivery, wait indefinitely if None
+        """
+        self._closed = True
+        try:
+            await asyncio.wait_for(self.drain(), timeout)
+        except TimeoutError:
+            logger.warning(f"dropping {self._pending} payment status updates on close")
+            for task in list(self._tasks):
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self.stats.dropped += self._pending
+            self._pending = 0
+            self._queues.clear()
+
+    async def _deliver(self, key: str) -> None:
+        queue = self._queues[key]
+        try:
+            while queue:
+                update = queue[0]
+                try:
+                    await self._treasurer.onStatus(
+                        status=update.status,
+                        authorization=update.authorization,
+                        context=update.context,
+                    )
+                except Exception as e:
+                    self.stats.failed += 1
+                    logger.error(f'treasurer.onStatus failed with "{e}"')
+                else:
+                    self.stats.delivered += 1
+                queue.popleft()
+                self._pending -= 1
+        finally:
+            if self._queues.get(key) is queue:
+                del self._queues[key]
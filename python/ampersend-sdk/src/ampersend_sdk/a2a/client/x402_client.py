@@ -16,7 +16,13 @@ from a2a.types import (
 from x402_a2a.core.utils import x402Utils
 
 from ...x402.treasurer import X402Treasurer
-from .a2a_client_extensions_interceptor import x402_extension_interceptor
+from .a2a_client_extensions_interceptor import (
+    install_extensions_interceptor,
+    x402_extension_interceptor,
+)
+from .authorization_store import AuthorizationStore, InMemoryAuthorizationStore
+from .requirements_cache import PaymentRequirementsCache, requirements_cache_key
+from .status_dispatcher import StatusDispatcher
 from .x402_middleware import x402_middleware
 
 
@@ -30,11 +36,16 @@ class X402Client(BaseClient):
         transport: ClientTransport,
         consumers: list[Consumer],
         middleware: list[ClientCallInterceptor],
+        authorization_store: AuthorizationStore | None = None,
+        requirements_cache: PaymentRequirementsCache | None = None,
+        max_payment_rounds: int = 1,
         **kwargs: Any,
     ):
         middleware = middleware or []
         if x402_extension_interceptor not in middleware:
             middleware.append(x402_extension_interceptor)
+        # Transports do not run the client's middleware themselves
+        install_extensions_interceptor(transport)
 
         super().__init__(
             card=card,
@@ -44,11 +55,27 @@ class X402Client(BaseClient):
             middleware=middleware,
             **kwargs,
         )
-        self.manual_init(treasurer=treasurer)
+        self.manual_init(
+            treasurer=treasurer,
+            authorization_store=authorization_store,
+            requirements_cache=requirements_cache,
+            max_payment_rounds=max_payment_rounds,
+        )
 
-    def manual_init(self, treasurer: X402Treasurer) -> None:
+    def manual_init(
+        self,
+        treasurer: X402Treasurer,
+        authorization_store: AuthorizationStore | None = None,
+        requirements_cache: PaymentRequirementsCache | None = None,
+        max_payment_rounds: int = 1,
+    ) -> None:
         self._treasurer = treasurer
+        self.authorization_store = authorization_store or InMemoryAuthorizationStore()
+        # Payment preflight is enabled by giving a cache
+        self.requirements_cache = requirements_cache
+        self.max_payment_rounds = max_payment_rounds
         self._x402Utils = x402Utils()
+        self.status_dispatcher = StatusDispatcher(treasurer)
 
     @override
     async def send_message(
@@ -63,5 +90,18 @@ class X402Client(BaseClient):
             request=request,
             send_message=super().send_message,
             utils=self._x402Utils,
+            dispatcher=self.status_dispatcher,
+            store=self.authorization_store,
+            requirements_cache=self.requirements_cache,
+            cache_key=requirements_cache_key(self._card, context),
+            max_payment_rounds=self.max_payment_rounds,
         ):
             yield i
+
+    @override
+    async def close(self) -> None:
+        """Deliver pending payment status updates and close the transport."""
+        try:
+            await self.status_dispatcher.close()
+        finally:
+            await super().close()
@@ -1,27 +1,43 @@
+import logging
 from typing import Any, AsyncIterator
 
 from a2a.client import ClientCallContext, ClientEvent
 from a2a.client.base_client import BaseClient
-from a2a.client.transports import JsonRpcTransport, RestTransport
 from a2a.types import Message
 from x402_a2a.core.utils import x402Utils
 
 from ...x402.treasurer import X402Treasurer
-from .a2a_client_extensions_interceptor import x402_extension_interceptor
+from .a2a_client_extensions_interceptor import install_extensions_interceptor
+from .authorization_store import AuthorizationStore, InMemoryAuthorizationStore
+from .requirements_cache import PaymentRequirementsCache, requirements_cache_key
+from .status_dispatcher import StatusDispatcher
 from .x402_middleware import x402_middleware
 
+logger = logging.getLogger(__name__)
+
 
 class X402ClientComposed:
-    def __init__(self, client: BaseClient, treasurer: X402Treasurer):
-        if (
-            isinstance(client._transport, (JsonRpcTransport, RestTransport))
-            and x402_extension_interceptor not in client._transport.interceptors
-        ):
-            client._transport.interceptors.append(x402_extension_interceptor)
+    def __init__(
+        self,
+        client: BaseClient,
+        treasurer: X402Treasurer,
+        authorization_store: AuthorizationStore | None = None,
+        requirements_cache: PaymentRequirementsCache | None = None,
+        max_payment_rounds: int = 1,
+    ):
+        if not install_extensions_interceptor(client._transport):
+            logger.warning(
+                f"cannot signal the x402 extension over {type(client._transport).__name__}"
+            )
 
         self._client = client
         self._treasurer = treasurer
         self._x402Utils = x402Utils()
+        self.status_dispatcher = StatusDispatcher(treasurer)
+        self.authorization_store = authorization_store or InMemoryAuthorizationStore()
+        # Payment preflight is enabled by giving a cache
+        self.requirements_cache = requirements_cache
+        self.max_payment_rounds = max_payment_rounds
 
     async def send_message(
         self,
@@ -35,9 +51,21 @@ class X402ClientComposed:
             request=request,
             send_message=self._client.send_message,
             utils=self._x402Utils,
+            dispatcher=self.status_dispatcher,
+            store=self.authorization_store,
+            requirements_cache=self.requirements_cache,
+            cache_key=requirements_cache_key(self._client._card, context),
+            max_payment_rounds=self.max_payment_rounds,
         ):
             yield i
 
+    async def close(self) -> None:
+        """Deliver pending payment status updates and close the client."""
+        try:
+            await self.status_dispatcher.close()
+        finally:
+            await self._client.close()
+
     def __getattr__(self, name: str) -> Any:
         return getattr(self._client, name)
 
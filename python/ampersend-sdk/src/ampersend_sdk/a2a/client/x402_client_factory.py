@@ -1,14 +1,22 @@
-from typing import override
+import dataclasses
+from typing import Any, AsyncIterator, Dict, Optional, Sequence, override
 
-from a2a.client import Client, ClientFactory
+from a2a.client import Client, ClientCallContext, ClientFactory
 from a2a.client.base_client import BaseClient
 from a2a.client.client import ClientConfig, Consumer
 from a2a.client.middleware import ClientCallInterceptor
 from a2a.types import (
     AgentCard,
+    Message,
 )
+from x402_a2a.types import PaymentStatus, x402PaymentRequiredResponse
 
-from ...x402.treasurer import X402Treasurer
+from ...connections import ConnectionManager
+from ...x402.treasurer import X402Authorization, X402Treasurer
+from ...x402.treasurers import BudgetTreasurer
+from .authorization_store import AuthorizationStore
+from .fan_out import FanOutEvent, WinnerPredicate, fan_out, is_answer
+from .requirements_cache import PaymentRequirementsCache
 from .x402_client_composed import X402ClientComposed
 
 
@@ -19,9 +27,34 @@ class X402ClientFactory(ClientFactory):
         treasurer: X402Treasurer,
         config: ClientConfig,
         consumers: list[Consumer] | None = None,
+        authorization_store: AuthorizationStore | None = None,
+        requirements_cache: PaymentRequirementsCache | None = None,
+        max_payment_rounds: int = 1,
+        connection_manager: ConnectionManager | None = None,
     ):
+        """
+        Args:
+            treasurer: Treasurer paying for x402 tasks
+            config: Client configuration
+            consumers: Event consumers
+            authorization_store: Store shared by the created clients to
+                remember payments made per task (default: one in-memory
+                store per client)
+            requirements_cache: Cache of the payment requirements sellers
+                asked for, shared by the created clients; enables paying
+                up front on repeat calls (default: disabled)
+            max_payment_rounds: Maximum number of payments made for one
+                task, for workflows asking for payment at several steps
+            connection_manager: Shares its connections with the created
+                clients when `config` has no httpx client
+        """
+        if config.httpx_client is None and connection_manager is not None:
+            config = dataclasses.replace(config, httpx_client=connection_manager.client)
         super().__init__(config=config, consumers=consumers)
         self._treasurer = treasurer
+        self._authorization_store = authorization_store
+        self._requirements_cache = requirements_cache
+        self._max_payment_rounds = max_payment_rounds
 
     @override
     def create(
@@ -30,9 +63,124 @@ class X402ClientFactory(ClientFactory):
         consumers: list[Consumer] | None = None,
         interceptors: list[ClientCallInterceptor] | None = None,
     ) -> Client:
+        return self._create(card, self._treasurer, consumers, interceptors)  # type: ignore[return-value]
+
+    async def fan_out(
+        self,
+        cards: Sequence[AgentCard],
+        request: Message,
+        *,
+        budget: int | None = None,
+        winner: WinnerPredicate = is_answer,
+        context: ClientCallContext | None = None,
+    ) -> AsyncIterator[FanOutEvent]:
+        """
+        Send a request to several sellers concurrently, keeping the first answer.
+
+        Events from every seller are merged as they arrive. Only one seller
+        is paid: the first whose payment the treasurer authorizes. Payments
+        asked by the other sellers are refused, and the answer is then only
+        taken from the paid seller. Once `winner` accepts an event, the other
+        sellers' streams are cancelled and their tasks cancelled on the
+        seller. With a `budget`, the payment never exceeds it.
+
+        Args:
+            cards: Sellers to send the request to
+            request: Message sent to every seller
+            budget: Maximum total paid, in atomic units of the payment asset
+                (default: no limit besides the treasurer's)
+            winner: Whether an event is the answer waited for (default: a
+                message reply or a completed task)
+            context: Client call context for every request
+        """
+        treasurer = BudgetTreasurer(self._treasurer, budget)
+        payee = _Payee()
+        clients = [
+            (card, self._create(card, _SellerTreasurer(treasurer, payee, i)))
+            for i, card in enumerate(cards)
+        ]
+        try:
+            async for event in fan_out(
+                clients,  # type: ignore[arg-type]
+                request,
+                winner=winner,
+                on_winner=treasurer.close,
+                paid_seller=lambda: payee.index,
+                context=context,
+            ):
+                yield event
+        finally:
+            for _card, client in clients:
+                if self._config.httpx_client is None:
+                    # Own httpx client, created for this fan-out
+                    await client.close()
+                else:
+                    await client.status_dispatcher.close()
+
+    def _create(
+        self,
+        card: AgentCard,
+        treasurer: X402Treasurer,
+        consumers: list[Consumer] | None = None,
+        interceptors: list[ClientCallInterceptor] | None = None,
+    ) -> X402ClientComposed:
         base_client = super().create(
             card=card, consumers=consumers, interceptors=interceptors
         )
         assert isinstance(base_client, BaseClient)
-        x402_client = X402ClientComposed(client=base_client, treasurer=self._treasurer)
-        return x402_client  # type: ignore[return-value]
+        return X402ClientComposed(
+            client=base_client,
+            treasurer=treasurer,
+            authorization_store=self._authorization_store,
+            requirements_cache=self._requirements_cache,
+            max_payment_rounds=self._max_payment_rounds,
+        )
+
+
+class _Payee:
+    """The one seller of a fan-out allowed to be paid."""
+
+    def __init__(self) -> None:
+        self.index: Optional[int] = None
+
+
+class _SellerTreasurer(X402Treasurer):
+    """Pays a fan-out's seller only if no other seller was paid first."""
+
+    def __init__(self, treasurer: X402Treasurer, payee: _Payee, index: int):
+        self._treasurer = treasurer
+        self._payee = payee
+        self._index = index
+
+    async def onPaymentRequired(
+        self,
+        payment_required: x402PaymentRequiredResponse,
+        context: Dict[str, Any] | None = None,
+    ) -> X402Authorization | None:
+        if self._payee.index not in (None, self._index):
+            return None
+
+        # Claimed before authorizing, so sellers asking at the same time
+        # cannot both be paid
+        claimed = self._payee.index is None
+        self._payee.index = self._index
+        authorization: X402Authorization | None = None
+        try:
+            authorization = await self._treasurer.onPaymentRequired(
+                payment_required=payment_required, context=context
+            )
+        finally:
+            if authorization is None and claimed:
+                # Not paid after all, let another seller be
+                self._payee.index = None
+        return authorization
+
+    async def onStatus(
+        self,
+        status: PaymentStatus,
+        authorization: X402Authorization,
+        context: Dict[str, Any] | None = None,
+    ) -> None:
+        await self._treasurer.onStatus(
+            status=status, authorization=authorization, context=context
+        )
@@ -1,13 +1,17 @@
 import logging
+import uuid
 from typing import Any, AsyncIterator, Dict, Protocol
 
 from a2a.client import ClientCallContext, ClientEvent
-from a2a.types import Message, TaskState
+from a2a.types import Message, Task, TaskState, TaskStatusUpdateEvent
 from x402_a2a import create_payment_submission_message
 from x402_a2a.core.utils import x402Utils
 from x402_a2a.types import PaymentStatus
 
 from ...x402.treasurer import X402Authorization, X402Treasurer
+from .authorization_store import AuthorizationStore
+from .requirements_cache import PaymentRequirementsCache, RequirementsCacheKey
+from .status_dispatcher import StatusDispatcher
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +32,6 @@ async def _onStatus(
     context: Dict[str, Any] | None = None,
 ) -> None:
     try:
-        # TODO: don't await
         await treasurer.onStatus(
             status=status,
             authorization=authorization,
@@ -38,89 +41,274 @@ async def _onStatus(
         logger.error(f'treasurer.onStatus failed with "{e}"')
 
 
+_FINAL_PAYMENT_STATUSES = (
+    PaymentStatus.PAYMENT_COMPLETED,
+    PaymentStatus.PAYMENT_FAILED,
+    PaymentStatus.PAYMENT_REJECTED,
+)
+
+
+def _payment_submission(task: Task, authorization: X402Authorization) -> Message:
+    message: Message = create_payment_submission_message(
+        task_id=task.id, payment_payload=authorization.payment
+    )
+
+    # FIX-ME: this is required by the server, there might be bug in
+    # A2aAgentExecutor because context_id is, in theory, optional.
+    message.context_id = task.context_id
+    return message
+
+
+def _with_payment(request: Message, authorization: X402Authorization) -> Message:
+    """Copy of a first message carrying a payment submission."""
+    submission: Message = create_payment_submission_message(
+        task_id=request.task_id or "", payment_payload=authorization.payment
+    )
+    return request.model_copy(
+        update={"metadata": {**(request.metadata or {}), **(submission.metadata or {})}}
+    )
+
+
+async def _aclose(stream: AsyncIterator[Any]) -> None:
+    aclose = getattr(stream, "aclose", None)
+    if aclose is None:
+        return
+    try:
+        await aclose()
+    except Exception as e:
+        logger.warning(f'closing response stream failed with "{e}"')
+
+
 async def x402_middleware(
     treasurer: X402Treasurer,
     send_message: MessageSender,
     request: Message,
     utils: x402Utils,
     context: ClientCallContext | None = None,
+    dispatcher: StatusDispatcher | None = None,
+    store: AuthorizationStore | None = None,
+    requirements_cache: PaymentRequirementsCache | None = None,
+    cache_key: RequirementsCacheKey | None = None,
+    max_payment_rounds: int = 1,
 ) -> AsyncIterator[ClientEvent | Message]:
-    # TODO: move authorization to a store.
-    async def recursive(
-        request: Message,
-        authorization: X402Authorization | None = None,
-    ) -> AsyncIterator[ClientEvent | Message]:
-        async for base_response in send_message(request=request, context=context):
-            # case: not x402 related
-            if isinstance(base_response, Message):
-                yield base_response
-                continue
-
-            # TODO: support streaming responses
-            # should check for TaskUpdate events
-            task, _ = base_response
-            payment_status = utils.get_payment_status(task)
-
-            # case: not x402 related
-            if payment_status is None:
-                yield base_response
-                continue
-
-            if authorization is not None:
-                await _onStatus(
-                    treasurer=treasurer,
-                    status=payment_status,
-                    authorization=authorization,
-                )
+    """
+    Pay for x402 tasks while relaying the agent's responses.
 
-            # case: after payment submitted
-            if (
-                task.status.state != TaskState.input_required
-                or payment_status != PaymentStatus.PAYMENT_REQUIRED
-            ):
-                yield base_response
-                continue
-
-            if authorization is not None:
-                logger.error(f"x402 spec issue: payment required but have already paid")
-                yield base_response
-                continue
-
-            # case: payment required
-            payment_required = utils.get_payment_requirements(task)
-            if payment_required is None:
-                logger.error(
-                    f"x402 spec issue: missing x402PaymentRequiredResponse in task {task.id}"
-                )
-                yield base_response
-                continue
+    Works for both blocking responses, where each event is a `(task, None)`
+    tuple, and streams, where `(task, update)` tuples carry the task as
+    aggregated so far. Payment status is only read from status changes:
+    artifact updates are relayed untouched, so a status seen once is not
+    acted on again for every later chunk of the same stream.
+
+    Requests are driven one `send_message` stream at a time: when a status
+    update asks for payment mid-stream, the payment is made right away, the
+    current stream is closed and the payment submission's stream takes over,
+    so the resumed task streams without a round trip through a blocking
+    request. Each event passes through a single loop however many payment
+    rounds a task goes through. A task is paid at most `max_payment_rounds`
+    times; raise it for multi-step workflows that ask for payment again
+    once a paid step is done.
 
+    Status updates are handed to `dispatcher` when given, so responses are
+    relayed without waiting for `treasurer.onStatus`; otherwise they are
+    awaited inline.
+
+    With a `store`, the payment made for a task is recorded before it is
+    submitted. When a task asks for payment and the store already holds an
+    unexpired authorization for it (e.g. after a reconnect or a restart), the
+    same payment is resubmitted instead of asking the treasurer again, so
+    a task is never paid twice. Authorizations are forgotten once the task's
+    payment completes, fails or is rejected.
+
+    With a `requirements_cache` and a `cache_key`, the requirements a seller
+    asks for are cached, and a new task (a request without task_id) whose
+    requirements are cached is paid up front: the payment rides on the first
+    message (preflight), skipping the payment-required round trip. The
+    preflight payment counts as the task's first payment round and is
+    recorded in `store` once the seller names the task.
+    If the seller asks for payment anyway, the preflight payment is reported
+    as failed, the seller is no longer preflighted (see
+    `PaymentRequirementsCache.mark_unsupported`) and the regular flow takes
+    over; if its payment status is
+    failed or rejected, the cache entry is dropped and the request is sent
+    again without payment. A task failing for any other reason is relayed
+    as is, so a paid task is never run again.
+    """
+    authorization: X402Authorization | None = None
+    # Payments submitted for the task so far
+    rounds = 0
+    next_request: Message | None = request
+
+    # Preflight: an authorization attached to the first message, pending
+    # until the seller verifies it
+    preflight: X402Authorization | None = None
+    preflight_stored = False
+    if (
+        requirements_cache is not None
+        and cache_key is not None
+        and request.task_id is None
+    ):
+        cached = requirements_cache.get(cache_key)
+        if cached is not None:
             try:
-                authorization = await treasurer.onPaymentRequired(
-                    payment_required=payment_required
-                )
+                preflight = await treasurer.onPaymentRequired(payment_required=cached)
             except Exception as e:
                 logger.error(f'treasurer.onPaymentRequired failed with "{e}"')
-                yield base_response
-                continue
+            if preflight is not None:
+                authorization = preflight
+                next_request = _with_payment(request, preflight)
+                rounds = 1
 
-            if authorization is None:
-                logger.info(f"treasurer rejected to pay for task {task.id}")
-                yield base_response
-                continue
-
-            message = create_payment_submission_message(
-                task_id=task.id, payment_payload=authorization.payment
+    async def report(status: PaymentStatus, authorization: X402Authorization) -> None:
+        if dispatcher is not None:
+            dispatcher.dispatch(status=status, authorization=authorization)
+        else:
+            await _onStatus(
+                treasurer=treasurer, status=status, authorization=authorization
             )
 
-            # FIX-ME: this is required by the server, there might be bug in
-            # A2aAgentExecutor because context_id is, in theory, optional.
-            message.context_id = task.context_id
+    while next_request is not None:
+        stream = send_message(request=next_request, context=context)
+        next_request = None
+        last_status: PaymentStatus | None = None
+        try:
+            async for base_response in stream:
+                # case: not x402 related
+                if isinstance(base_response, Message):
+                    yield base_response
+                    continue
+
+                task, update = base_response
+                # case: artifact chunk, the task status has not changed
+                if update is not None and not isinstance(update, TaskStatusUpdateEvent):
+                    yield base_response
+                    continue
+
+                payment_status = utils.get_payment_status(task)
+
+                if preflight is not None:
+                    if store is not None and not preflight_stored:
+                        # First sight of the task id: make the preflight
+                        # payment resumable like any other
+                        await store.put(task.id, task.context_id, preflight)
+                        preflight_stored = True
+
+                    if payment_status in (
+                        PaymentStatus.PAYMENT_FAILED,
+                        PaymentStatus.PAYMENT_REJECTED,
+                    ):
+                        # case: seller refused the preflight payment, retry
+                        # the request without it
+                        logger.info(f"preflight payment refused for task {task.id}")
+                        assert requirements_cache is not None and cache_key is not None
+                        requirements_cache.invalidate(cache_key)
+                        await report(payment_status, preflight)
+                        if store is not None:
+                            await store.delete(task.id, task.context_id)
+                        authorization = preflight = None
+                        rounds = 0
+                        next_request = request.model_copy(
+                            update={"message_id": uuid.uuid4().hex}
+                        )
+                        break
+
+                    if payment_status == PaymentStatus.PAYMENT_REQUIRED:
+                        # case: seller ignored the preflight payment, e.g.
+                        # because it does not support preflight
+                        assert requirements_cache is not None and cache_key is not None
+                        requirements_cache.mark_unsupported(cache_key)
+                        await report(PaymentStatus.PAYMENT_FAILED, preflight)
+                        if store is not None:
+                            await store.delete(task.id, task.context_id)
+                        authorization = preflight = None
+                        rounds = 0
+                    elif payment_status is not None:
+                        preflight = None
+
+                # case: not x402 related
+                if payment_status is None:
+                    yield base_response
+                    continue
+
+                if (
+                    authorization is None
+                    and store is not None
+                    and payment_status != PaymentStatus.PAYMENT_REQUIRED
+                ):
+                    # Status of a task paid earlier, e.g. before a restart
+                    authorization = await store.get(task.id, task.context_id)
+
+                if authorization is not None and payment_status != last_status:
+                    await report(payment_status, authorization)
+                last_status = payment_status
+
+                if store is not None and payment_status in _FINAL_PAYMENT_STATUSES:
+                    await store.delete(task.id, task.context_id)
+
+                # case: after payment submitted
+                if (
+                    task.status.state != TaskState.input_required
+                    or payment_status != PaymentStatus.PAYMENT_REQUIRED
+                ):
+                    yield base_response
+                    continue
+
+                if rounds >= max_payment_rounds:
+                    logger.error(
+                        f"payment required but already paid {rounds} times for task {task.id}"
+                    )
+                    yield base_response
+                    continue
+
+                stored = (
+                    await store.get(task.id, task.context_id)
+                    if store is not None
+                    else None
+                )
+                if stored is not None and (
+                    authorization is None
+                    or stored.authorization_id != authorization.authorization_id
+                ):
+                    logger.info(f"resubmitting stored payment for task {task.id}")
+                    authorization = stored
+                    next_request = _payment_submission(task, authorization)
+                    rounds += 1
+                    break
+
+                # case: payment required
+                payment_required = utils.get_payment_requirements(task)
+                if payment_required is None:
+                    logger.error(
+                        f"x402 spec issue: missing x402PaymentRequiredResponse in task {task.id}"
+                    )
+                    yield base_response
+                    continue
+
+                if requirements_cache is not None and cache_key is not None:
+                    requirements_cache.put(cache_key, payment_required)
+
+                try:
+                    authorization = await treasurer.onPaymentRequired(
+                        payment_required=payment_required
+                    )
+                except Exception as e:
+                    logger.error(f'treasurer.onPaymentRequired failed with "{e}"')
+                    yield base_response
+                    continue
+
+                if authorization is None:
+                    logger.info(f"treasurer rejected to pay for task {task.id}")
+                    yield base_response
+                    continue
+
+                if store is not None:
+                    # Record before submitting so the payment is never made twice
+                    await store.put(task.id, task.context_id, authorization)
 
-            async for response in recursive(
-                request=message, authorization=authorization
-            ):
-                yield response
+                next_request = _payment_submission(task, authorization)
+                rounds += 1
 
-    async for response in recursive(request=request):
-        yield response
+                # Stop reading the payment-required stream and resume the task
+                break
+        finally:
+            await _aclose(stream)
@@ -8,10 +8,16 @@ from google.adk.a2a.converters.part_converter import (
     convert_a2a_part_to_genai_part,
     convert_genai_part_to_a2a_part,
 )
-from google.adk.agents.remote_a2a_agent import DEFAULT_TIMEOUT, RemoteA2aAgent
+from google.adk.agents.remote_a2a_agent import (
+    DEFAULT_TIMEOUT,
+    AgentCardResolutionError,
+    RemoteA2aAgent,
+)
 from httpx import AsyncClient
 
+from ...connections import ConnectionManager
 from ...x402.treasurer import X402Treasurer
+from .agent_card_cache import AgentCardCache
 from .x402_client_factory import X402ClientFactory
 
 
@@ -28,8 +34,15 @@ class X402RemoteA2aAgent(RemoteA2aAgent):
         genai_part_converter: GenAIPartToA2APartConverter = convert_genai_part_to_a2a_part,
         a2a_part_converter: A2APartToGenAIPartConverter = convert_a2a_part_to_genai_part,
         a2a_client_factory: A2AClientFactory | None = None,
+        connection_manager: ConnectionManager | None = None,
+        agent_card_cache: AgentCardCache | None = None,
         **kwargs: Any,
     ):
+        # The manager's client is shared and outlives this agent: RemoteA2aAgent
+        # only closes clients it created itself
+        if httpx_client is None and connection_manager is not None:
+            httpx_client = connection_manager.client_with_timeout(timeout)
+
         super().__init__(
             name=name,
             agent_card=agent_card,
@@ -42,6 +55,7 @@ class X402RemoteA2aAgent(RemoteA2aAgent):
             **kwargs,
         )
         self._treasurer = treasurer
+        self._agent_card_cache = agent_card_cache
 
     @override
     async def _ensure_httpx_client(self) -> AsyncClient:
@@ -54,3 +68,16 @@ class X402RemoteA2aAgent(RemoteA2aAgent):
         )
 
         return httpx_client
+
+    @override
+    async def _resolve_agent_card_from_url(self, url: str) -> AgentCard:
+        if self._agent_card_cache is None:
+            return await super()._resolve_agent_card_from_url(url)
+
+        try:
+            httpx_client = await self._ensure_httpx_client()
+            return await self._agent_card_cache.get(url, httpx_client)
+        except Exception as e:
+            raise AgentCardResolutionError(
+                f"Failed to resolve AgentCard from URL {url}: {e}"
+            ) from e
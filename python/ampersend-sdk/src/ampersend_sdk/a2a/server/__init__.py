@@ -2,11 +2,35 @@ from .a2a_executor import (
     X402A2aAgentExecutor,
 )
 from .before_agent_callback import make_x402_before_agent_callback
+from .nonce_index import InMemoryNonceIndex, NonceIndex, SqliteNonceIndex
+from .payment_checks import PaymentPreverifier
+from .settlement_queue import (
+    InMemorySettlementQueue,
+    PendingSettlement,
+    SettlementQueue,
+    SqliteSettlementQueue,
+)
+from .settlement_scheduler import (
+    SettlementMode,
+    SettlementReport,
+    SettlementScheduler,
+)
 from .to_a2a import to_a2a
 from .x402_server_executor import X402ServerExecutor
 
 __all__ = [
+    "InMemoryNonceIndex",
+    "InMemorySettlementQueue",
     "make_x402_before_agent_callback",
+    "NonceIndex",
+    "PaymentPreverifier",
+    "PendingSettlement",
+    "SettlementMode",
+    "SettlementQueue",
+    "SettlementReport",
+    "SettlementScheduler",
+    "SqliteNonceIndex",
+    "SqliteSettlementQueue",
     "to_a2a",
     "X402A2aAgentExecutor",
     "X402ServerExecutor",
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Awaitable, Callable, Optional, override
+from typing import Any, Awaitable, Callable, Dict, Optional, override
 
 from a2a.types import Message, Part, Role, TaskStatusUpdateEvent, TextPart
 from google.adk.a2a.executor.a2a_agent_executor import A2aAgentExecutorConfig, logger
@@ -15,6 +15,7 @@ from x402_a2a.types import (
 )
 
 from .a2a_monkey import MonkeyA2aAgentExecutor
+from .adk_session_fork import AdkSessionFork
 from .facilitator_x402_server_executor import FacilitatorX402ServerExecutor
 from .x402_server_executor import X402ServerExecutor
 
@@ -26,10 +27,25 @@ class X402A2aAgentExecutor(AgentExecutor):
         runner: Runner | Callable[..., Runner | Awaitable[Runner]],
         config: Optional[A2aAgentExecutorConfig] = None,
         x402_executor_class: type[X402ServerExecutor] = FacilitatorX402ServerExecutor,
+        x402_executor_kwargs: Optional[Dict[str, Any]] = None,
         **kwargs: Any,
     ):
+        """
+        Args:
+            runner: Runner of the ADK agent, or a factory for it
+            config: A2A agent executor configuration
+            x402_executor_class: Executor handling x402 payments
+            x402_executor_kwargs: Extra arguments for `x402_executor_class`,
+                e.g. `nonce_index` or `facilitator_config`; with `optimistic`,
+                optimistic runs work on a fork of the ADK session
+        """
         inner = InnerA2aAgentExecutor(runner=runner, config=config, **kwargs)
-        x402 = x402_executor_class(config=x402ExtensionConfig(), delegate=inner)
+        x402_kwargs = dict(x402_executor_kwargs or {})
+        if x402_kwargs.get("optimistic"):
+            x402_kwargs.setdefault("session_fork", AdkSessionFork(inner))
+        x402 = x402_executor_class(
+            config=x402ExtensionConfig(), delegate=inner, **x402_kwargs
+        )
         # TODO: fix typing in x402-a2a
         self._executor = OuterA2aAgentExecutor(delegate=x402)  # type: ignore[arg-type]
 
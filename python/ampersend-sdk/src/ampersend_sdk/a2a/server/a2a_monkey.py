@@ -10,6 +10,8 @@ from google.adk.a2a.converters.request_converter import (
 )
 from x402_a2a.types import RequestContext
 
+from .adk_session_fork import SESSION_FORK_KEY
+
 
 def override_convert_a2a_request_to_adk_run_args(
     request: RequestContext,
@@ -19,6 +21,10 @@ def override_convert_a2a_request_to_adk_run_args(
     if request.current_task and request.current_task.metadata:
         og["state_delta"] = {}
         for key, value in request.current_task.metadata.items():
+            if key == SESSION_FORK_KEY:
+                # Optimistic run, on a copy of the session
+                og["session_id"] = value
+                continue
             og["state_delta"][key] = value
     return og  # type: ignore[no-any-return]
 
@@ -0,0 +1,117 @@
+import copy
+import logging
+import uuid
+from typing import Any, Dict, NamedTuple
+
+from google.adk.a2a.converters.request_converter import (
+    convert_a2a_request_to_adk_run_args,
+)
+from google.adk.a2a.executor.a2a_agent_executor import A2aAgentExecutor
+from google.adk.sessions import State
+from x402_a2a.types import RequestContext
+
+logger = logging.getLogger(__name__)
+
+# Task metadata naming the session an ADK run uses instead of the context's,
+# read by the request converter patched in a2a_monkey
+SESSION_FORK_KEY = "x402_session_fork"
+
+
+class _Fork(NamedTuple):
+    user_id: str
+    session_id: str
+    fork_id: str
+    # Events copied from the original session
+    copied: int
+
+
+class AdkSessionFork:
+    """
+    SessionFork for ADK agents, copying sessions in the runner's service.
+
+    The fork starts with the session's events and session-scoped state.
+    App and user state are shared with the original session.
+    """
+
+    def __init__(self, executor: A2aAgentExecutor) -> None:
+        """
+        Args:
+            executor: Executor running the ADK agent
+        """
+        self._executor = executor
+        self._forks: Dict[str, _Fork] = {}
+
+    async def fork(self, context: RequestContext) -> RequestContext:
+        assert context.current_task is not None, "current_task must be set"
+        runner = await self._executor._resolve_runner()
+        run_args = convert_a2a_request_to_adk_run_args(context)
+        user_id: str = run_args["user_id"]
+        session_id: str = run_args["session_id"]
+        fork_id = f"{session_id}-fork-{uuid.uuid4().hex}"
+
+        sessions = runner.session_service
+        session = await sessions.get_session(
+            app_name=runner.app_name, user_id=user_id, session_id=session_id
+        )
+        fork = await sessions.create_session(
+            app_name=runner.app_name,
+            user_id=user_id,
+            session_id=fork_id,
+            state=_session_state(session.state) if session is not None else None,
+        )
+        events = session.events if session is not None else []
+        for event in events:
+            # State already copied, its changes are not applied again
+            actions = event.actions.model_copy(update={"state_delta": {}})
+            await sessions.append_event(
+                fork, event.model_copy(update={"actions": actions})
+            )
+        self._forks[fork_id] = _Fork(user_id, session_id, fork_id, len(events))
+
+        forked = copy.copy(context)
+        task = context.current_task
+        forked.current_task = task.model_copy(
+            update={"metadata": {**(task.metadata or {}), SESSION_FORK_KEY: fork_id}}
+        )
+        return forked
+
+    async def commit(self, fork: RequestContext) -> None:
+        entry = self._pop(fork)
+        runner = await self._executor._resolve_runner()
+        sessions = runner.session_service
+        forked = await sessions.get_session(
+            app_name=runner.app_name, user_id=entry.user_id, session_id=entry.fork_id
+        )
+        session = await sessions.get_session(
+            app_name=runner.app_name, user_id=entry.user_id, session_id=entry.session_id
+        )
+        if session is None:
+            session = await sessions.create_session(
+                app_name=runner.app_name,
+                user_id=entry.user_id,
+                session_id=entry.session_id,
+            )
+        if forked is not None:
+            for event in forked.events[entry.copied :]:
+                await sessions.append_event(session, event)
+        await self._delete(entry)
+
+    async def drop(self, fork: RequestContext) -> None:
+        await self._delete(self._pop(fork))
+
+    def _pop(self, fork: RequestContext) -> _Fork:
+        assert fork.current_task is not None, "current_task must be set"
+        metadata = fork.current_task.metadata or {}
+        return self._forks.pop(metadata[SESSION_FORK_KEY])
+
+    async def _delete(self, entry: _Fork) -> None:
+        runner = await self._executor._resolve_runner()
+        await runner.session_service.delete_session(
+            app_name=runner.app_name, user_id=entry.user_id, session_id=entry.fork_id
+        )
+
+
+def _session_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    # App and user state are stored apart from the session, and shared
+    prefixes = (State.APP_PREFIX, State.USER_PREFIX, State.TEMP_PREFIX)
+    return {k: v for k, v in state.items() if not k.startswith(prefixes)}
@@ -0,0 +1,59 @@
+import hashlib
+import json
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Awaitable, Callable
+
+from a2a.types import AgentCard
+from starlette.requests import Request
+from starlette.responses import Response
+
+
+def agent_card_endpoint(
+    agent_card: AgentCard, *, max_age: int = 300
+) -> Callable[[Request], Awaitable[Response]]:
+    """
+    Starlette endpoint serving the agent card with HTTP cache validators.
+
+    The card is serialized once. Responses carry an ETag (hash of the body),
+    a Last-Modified date (when the endpoint was created) and a
+    `Cache-Control: max-age`, and conditional requests that still match are
+    answered with an empty 304.
+
+    Args:
+        agent_card: Card to serve
+        max_age: Seconds clients may use the card without revalidating
+    """
+    body = json.dumps(
+        agent_card.model_dump(exclude_none=True, by_alias=True),
+        separators=(",", ":"),
+    ).encode()
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    modified_at = int(time.time())
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(modified_at, usegmt=True),
+        "Cache-Control": f"public, max-age={max_age}",
+    }
+
+    def not_modified(request: Request) -> bool:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return modified_at <= since
+        return False
+
+    async def endpoint(request: Request) -> Response:
+        if not_modified(request):
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+    return endpoint
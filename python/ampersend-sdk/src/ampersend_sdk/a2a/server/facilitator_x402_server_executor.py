@@ -1,4 +1,5 @@
-from typing import Any
+import logging
+from typing import Any, Optional
 
 from x402_a2a import (
     FacilitatorClient,
@@ -7,14 +8,19 @@ from x402_a2a import (
 )
 from x402_a2a.types import (
     AgentExecutor,
+    EIP3009Authorization,
     PaymentPayload,
     PaymentRequirements,
     SettleResponse,
     VerifyResponse,
 )
 
+from .nonce_index import InMemoryNonceIndex, NonceIndex
+from .settlement_scheduler import SettlementScheduler
 from .x402_server_executor import X402ServerExecutor
 
+logger = logging.getLogger(__name__)
+
 
 class FacilitatorX402ServerExecutor(X402ServerExecutor):
     def __init__(
@@ -23,19 +29,76 @@ class FacilitatorX402ServerExecutor(X402ServerExecutor):
         delegate: AgentExecutor,
         config: x402ExtensionConfig,
         facilitator_config: FacilitatorConfig | None = None,
+        nonce_index: Optional[NonceIndex] = None,
+        settlement: Optional[SettlementScheduler] = None,
         **kwargs: Any,
     ):
+        """
+        Args:
+            delegate: Executor of the paid agent
+            config: x402 extension configuration
+            facilitator_config: Facilitator verifying and settling payments
+            nonce_index: Authorization nonces already submitted, to reject
+                replays without the facilitator (default: in memory)
+            settlement: Scheduler settling payments through the facilitator,
+                e.g. off the response path (default: settle inline)
+        """
         super().__init__(delegate=delegate, config=config, **kwargs)
         self._facilitator = FacilitatorClient(facilitator_config)
+        self._nonce_index = nonce_index or InMemoryNonceIndex()
+        self._settlement = settlement
+        if settlement is not None:
+            settlement.attach(self._facilitator.settle)
 
     async def verify_payment(
         self, payload: PaymentPayload, requirements: PaymentRequirements
     ) -> VerifyResponse:
-        """Verifies the payment with the facilitator."""
-        return await self._facilitator.verify(payload, requirements)
+        """
+        Verifies the payment with the facilitator.
+
+        Payments failing `preverify_payment` and replayed payments are
+        rejected locally. A payment's nonce is claimed before asking the
+        facilitator and released if the facilitator does not find the payment
+        valid, so it can be submitted again.
+        """
+        check = self.preverify_payment(payload, requirements)
+        authorization = check.authorization
+        if check.invalid_reason is not None or authorization is None:
+            return _invalid(check.invalid_reason or "invalid_payload", authorization)
+
+        if not await self._nonce_index.claim(
+            authorization.from_, authorization.nonce, float(authorization.valid_before)
+        ):
+            logger.info(f"rejecting replayed nonce {authorization.nonce}")
+            return _invalid(
+                "invalid_exact_evm_payload_authorization_nonce", authorization
+            )
+
+        try:
+            response = await self._facilitator.verify(payload, requirements)
+        except BaseException:
+            await self._nonce_index.release(authorization.from_, authorization.nonce)
+            raise
+        if not response.is_valid:
+            await self._nonce_index.release(authorization.from_, authorization.nonce)
+        return response
 
     async def settle_payment(
         self, payload: PaymentPayload, requirements: PaymentRequirements
     ) -> SettleResponse:
-        """Settles the payment with the facilitator."""
+        """Settles the payment with the facilitator, or via the scheduler."""
+        if self._settlement is not None:
+            return await self._settlement.settle(payload, requirements)
         return await self._facilitator.settle(payload, requirements)
+
+
+def _invalid(
+    reason: str, authorization: Optional[EIP3009Authorization]
+) -> VerifyResponse:
+    return VerifyResponse.model_validate(
+        {
+            "isValid": False,
+            "invalidReason": reason,
+            "payer": authorization.from_ if authorization is not None else None,
+        }
+    )
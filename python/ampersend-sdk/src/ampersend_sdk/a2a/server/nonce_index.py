@@ -0,0 +1,164 @@
+import heapq
+import sqlite3
+import time
+from typing import Dict, List, Protocol, Tuple
+
+from ...sqlite import SqliteDatabase
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nonces (
+    from_address TEXT NOT NULL,
+    nonce TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (from_address, nonce)
+)
+"""
+
+
+class NonceIndex(Protocol):
+    """
+    ERC-3009 authorization nonces already submitted to this seller.
+
+    Lets the seller reject replayed payments locally instead of asking the
+    facilitator. A nonce only needs remembering until its authorization's
+    validBefore, after which the payment can no longer settle.
+    """
+
+    async def claim(self, from_address: str, nonce: str, expires_at: float) -> bool:
+        """
+        Record a nonce, unless it is already recorded and unexpired.
+
+        Returns:
+            False if the nonce was already claimed (a replay)
+        """
+        ...
+
+    async def release(self, from_address: str, nonce: str) -> None:
+        """Forget a nonce, e.g. when its payment was found invalid."""
+        ...
+
+
+def _key(from_address: str, nonce: str) -> Tuple[str, str]:
+    return (from_address.lower(), nonce.lower().removeprefix("0x"))
+
+
+class InMemoryNonceIndex:
+    """
+    NonceIndex holding at most `max_entries` nonces.
+
+    When full, the nonces closest to expiry are dropped first, and nonces
+    are kept at most `max_validity` seconds whatever their validBefore. A
+    replay of a dropped nonce is no longer caught locally, but still is by
+    the facilitator.
+    """
+
+    def __init__(
+        self, max_entries: int = 100_000, *, max_validity: float = 3600.0
+    ) -> None:
+        """
+        Initialize the index.
+
+        Args:
+            max_entries: Maximum number of nonces held
+            max_validity: Maximum seconds a nonce is held
+        """
+        self._max_entries = max_entries
+        self._max_validity = max_validity
+        self._entries: Dict[Tuple[str, str], float] = {}
+        # (expires_at, key), may hold entries since released or reclaimed
+        self._expiry: List[Tuple[float, Tuple[str, str]]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def claim(self, from_address: str, nonce: str, expires_at: float) -> bool:
+        now = time.time()
+        self._evict(now)
+        key = _key(from_address, nonce)
+        if self._entries.get(key, 0.0) > now:
+            return False
+
+        expires_at = min(expires_at, now + self._max_validity)
+        self._entries[key] = expires_at
+        heapq.heappush(self._expiry, (expires_at, key))
+        while len(self._entries) > self._max_entries:
+            self._pop()
+        self._compact()
+        return True
+
+    async def release(self, from_address: str, nonce: str) -> None:
+        self._entries.pop(_key(from_address, nonce), None)
+        self._compact()
+
+    def _compact(self) -> None:
+        # Rebuild the heap once stale items outnumber live ones
+        if len(self._expiry) > 2 * len(self._entries) + 64:
+            self._expiry = [(e, key) for key, e in self._entries.items()]
+            heapq.heapify(self._expiry)
+
+    def _evict(self, now: float) -> None:
+        while self._expiry and self._expiry[0][0] <= now:
+            self._pop()
+
+    def _pop(self) -> None:
+        expires_at, key = heapq.heappop(self._expiry)
+        if self._entries.get(key) == expires_at:
+            del self._entries[key]
+
+
+class SqliteNonceIndex:
+    """
+    NonceIndex persisted in SQLite, shareable between seller processes.
+
+    Claims are atomic across processes using the same database file.
+    Expired nonces are purged every `purge_every` claims.
+    """
+
+    def __init__(self, path: str, *, purge_every: int = 1000) -> None:
+        """
+        Initialize the index.
+
+        Args:
+            path: SQLite database file
+            purge_every: Number of claims between purges of expired nonces
+        """
+        self._purge_every = purge_every
+        self._claims = 0
+        self._db = SqliteDatabase(path, _SCHEMA, synchronous="NORMAL", timeout=30.0)
+
+    async def claim(self, from_address: str, nonce: str, expires_at: float) -> bool:
+        from_address, nonce = _key(from_address, nonce)
+        self._claims += 1
+        purge = self._claims % self._purge_every == 0
+
+        def insert(db: sqlite3.Connection) -> bool:
+            now = time.time()
+            with db:
+                if purge:
+                    db.execute("DELETE FROM nonces WHERE expires_at <= ?", (now,))
+                cursor = db.execute(
+                    "INSERT INTO nonces (from_address, nonce, expires_at)"
+                    " VALUES (?, ?, ?)"
+                    " ON CONFLICT (from_address, nonce) DO UPDATE"
+                    " SET expires_at = excluded.expires_at"
+                    " WHERE nonces.expires_at <= ?",
+                    (from_address, nonce, expires_at, now),
+                )
+                return cursor.rowcount == 1
+
+        return await self._db.run(insert)
+
+    async def release(self, from_address: str, nonce: str) -> None:
+        key = _key(from_address, nonce)
+
+        def delete(db: sqlite3.Connection) -> None:
+            with db:
+                db.execute(
+                    "DELETE FROM nonces WHERE from_address = ? AND nonce = ?", key
+                )
+
+        await self._db.run(delete)
+
+    async def close(self) -> None:
+        """Close the database."""
+        await self._db.close()
@@ -0,0 +1,165 @@
+import asyncio
+import copy
+import logging
+from typing import Dict, List, Optional, Protocol, override
+
+from a2a.server.events import Event, EventQueue
+from x402_a2a.types import AgentExecutor, RequestContext
+
+logger = logging.getLogger(__name__)
+
+# Task metadata flag read by make_x402_before_agent_callback
+PAYMENT_VERIFIED_KEY = "x402_payment_verified"
+
+
+class EventBuffer(EventQueue):
+    """
+    Event queue holding events until released to another queue.
+
+    Once released, buffered events are forwarded in order and later events
+    go straight through.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._events: List[Event] = []
+        self._target: Optional[EventQueue] = None
+
+    @property
+    def buffered(self) -> int:
+        """Number of events held."""
+        return len(self._events)
+
+    @override
+    async def enqueue_event(self, event: Event) -> None:
+        if self._target is None:
+            self._events.append(event)
+        else:
+            await self._target.enqueue_event(event)
+
+    async def release(self, target: EventQueue) -> None:
+        """Forward the held events, and every later one, to `target`."""
+        while self._events:
+            await target.enqueue_event(self._events.pop(0))
+        self._target = target
+
+
+class SessionFork(Protocol):
+    """
+    Isolates the session writes of an optimistic run.
+
+    The agent runs on a copy of the task's session, so a run discarded
+    after a failed verification leaves nothing behind: neither the paid
+    flag nor the agent's events reach the session a later request sees.
+    """
+
+    async def fork(self, context: RequestContext) -> RequestContext:
+        """Copy of `context` running on a copy of its session."""
+        ...
+
+    async def commit(self, fork: RequestContext) -> None:
+        """Apply the fork's session writes to the original session, then drop it."""
+        ...
+
+    async def drop(self, fork: RequestContext) -> None:
+        """Forget the fork's session writes."""
+        ...
+
+
+class _OptimisticRun:
+    def __init__(self, buffer: EventBuffer) -> None:
+        self.buffer = buffer
+        # Set once the run's session is forked
+        self.fork: Optional[RequestContext] = None
+        self.task: Optional[asyncio.Task[None]] = None
+
+
+class OptimisticDelegate(AgentExecutor):
+    """
+    Runs an agent ahead of payment verification, holding back its output.
+
+    `start` runs the agent for a task whose payment is being verified, with
+    the task marked as paid and its events buffered. When verification
+    passes and the x402 executor calls `execute` for that task, the buffered
+    events are released and the run is awaited instead of starting the
+    agent again. `discard` cancels a run that was never released.
+    Tasks without a started run execute as usual.
+
+    With `sessions`, the run works on a fork of the task's session, committed
+    once the run is released and dropped when it is discarded. Without it,
+    the session writes of a discarded run (the paid flag included) are kept.
+    """
+
+    def __init__(
+        self, delegate: AgentExecutor, sessions: Optional[SessionFork] = None
+    ) -> None:
+        """
+        Args:
+            delegate: Executor of the paid agent
+            sessions: Isolates the session writes of runs not released yet
+        """
+        self._delegate = delegate
+        self._sessions = sessions
+        self._runs: Dict[str, _OptimisticRun] = {}
+
+    async def start(self, context: RequestContext) -> None:
+        """Start running the agent for the context's task."""
+        assert context.task_id is not None, "task_id must be set"
+        assert context.current_task is not None, "current_task must be set"
+        # A run started earlier for the task is superseded
+        await self.discard(context)
+
+        paid_context = copy.copy(context)
+        task = context.current_task
+        paid_context.current_task = task.model_copy(
+            update={"metadata": {**(task.metadata or {}), PAYMENT_VERIFIED_KEY: True}}
+        )
+        run = _OptimisticRun(EventBuffer())
+        run.task = asyncio.create_task(self._run(run, paid_context))
+        self._runs[context.task_id] = run
+
+    async def discard(self, context: RequestContext) -> None:
+        """Cancel the context's run if it was not released, dropping its output."""
+        assert context.task_id is not None, "task_id must be set"
+        run = self._runs.pop(context.task_id, None)
+        if run is None:
+            return
+        assert run.task is not None
+        run.task.cancel()
+        await asyncio.gather(run.task, return_exceptions=True)
+        if self._sessions is not None and run.fork is not None:
+            await self._sessions.drop(run.fork)
+        logger.info(
+            f"discarded optimistic run of task {context.task_id}"
+            f" and its {run.buffer.buffered} events"
+        )
+
+    async def _run(self, run: _OptimisticRun, context: RequestContext) -> None:
+        if self._sessions is not None:
+            run.fork = context = await self._sessions.fork(context)
+        await self._delegate.execute(context, run.buffer)
+
+    @override
+    async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
+        run = self._runs.pop(context.task_id, None) if context.task_id else None
+        if run is None:
+            await self._delegate.execute(context, event_queue)
+            return
+
+        assert run.task is not None
+        try:
+            await run.buffer.release(event_queue)
+            await run.task
+        except asyncio.CancelledError:
+            run.task.cancel()
+            await asyncio.gather(run.task, return_exceptions=True)
+            raise
+        finally:
+            if self._sessions is not None and run.fork is not None:
+                # Paid for: the run's session writes are kept even if it failed
+                await self._sessions.commit(run.fork)
+
+    @override
+    async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
+        await self.discard(context)
+        await self._delegate.cancel(context, event_queue)
@@ -0,0 +1,201 @@
+import logging
+import re
+import time
+from typing import Callable, Collection, NamedTuple, Optional
+
+from eth_utils.conversions import to_bytes
+from x402.chains import get_chain_id
+from x402_a2a.types import (
+    EIP3009Authorization,
+    ExactPaymentPayload,
+    PaymentPayload,
+    PaymentRequirements,
+)
+
+from ...signing import SigningBackend, recover_address
+from ...x402.wallets.eip3009 import domain_separator, transfer_with_authorization_digest
+
+logger = logging.getLogger(__name__)
+
+# Seconds of validity an authorization must have left to be settled in time,
+# as required by x402 facilitators
+MIN_VALIDITY = 6
+
+_ADDRESS = re.compile(r"0x[0-9a-fA-F]{40}")
+_NONCE = re.compile(r"(?:0x)?[0-9a-fA-F]{64}")
+_SIGNATURE = re.compile(r"(?:0x)?(?:[0-9a-fA-F]{2})+")
+_UINT = re.compile(r"[0-9]{1,78}")
+
+
+class PaymentCheck(NamedTuple):
+    """Outcome of checking a payment payload without the facilitator."""
+
+    authorization: Optional[EIP3009Authorization]
+    invalid_reason: Optional[str]
+
+
+def check_exact_payment(
+    payload: PaymentPayload,
+    requirements: PaymentRequirements,
+    now: Optional[float] = None,
+) -> PaymentCheck:
+    """
+    Reject malformed, mismatched and expired exact-scheme payments.
+
+    Checks the scheme, network, recipient, amount and time window against the
+    requirements. Only checks what needs no chain state nor signature
+    recovery, so it costs microseconds.
+
+    Returns:
+        The payment's authorization, and the x402 reason it is invalid, if so
+    """
+    if payload.scheme != "exact" or payload.scheme != requirements.scheme:
+        return PaymentCheck(None, "invalid_scheme")
+    if payload.network != requirements.network:
+        return PaymentCheck(None, "invalid_network")
+    if not isinstance(payload.payload, ExactPaymentPayload):
+        return PaymentCheck(None, "invalid_payload")
+
+    authorization = payload.payload.authorization
+    if not (
+        _ADDRESS.fullmatch(authorization.from_)
+        and _ADDRESS.fullmatch(authorization.to)
+        and _NONCE.fullmatch(authorization.nonce)
+        and _SIGNATURE.fullmatch(payload.payload.signature)
+        and _UINT.fullmatch(authorization.value)
+        and _UINT.fullmatch(authorization.valid_after)
+        and _UINT.fullmatch(authorization.valid_before)
+    ):
+        return PaymentCheck(authorization, "invalid_payload")
+
+    if authorization.to.lower() != requirements.pay_to.lower():
+        return PaymentCheck(
+            authorization, "invalid_exact_evm_payload_recipient_mismatch"
+        )
+    if int(authorization.value) < int(requirements.max_amount_required):
+        return PaymentCheck(
+            authorization, "invalid_exact_evm_payload_authorization_value"
+        )
+
+    now = time.time() if now is None else now
+    if int(authorization.valid_before) < now + MIN_VALIDITY:
+        return PaymentCheck(
+            authorization, "invalid_exact_evm_payload_authorization_valid_before"
+        )
+    if int(authorization.valid_after) > now:
+        return PaymentCheck(
+            authorization, "invalid_exact_evm_payload_authorization_valid_after"
+        )
+    return PaymentCheck(authorization, None)
+
+
+# Resolves the owners of a smart account, None if unknown
+OwnersResolver = Callable[[str], Optional[Collection[str]]]
+
+# ERC-1271 signature layout of encode_1271_signature: validator + r || s || v
+_VALIDATOR_LENGTH = 20
+_SIGNATURE_LENGTH = 65
+
+
+class PaymentPreverifier:
+    """
+    Checks exact-scheme payment signatures offline.
+
+    Recomputes the ERC-3009 TransferWithAuthorization digest for the
+    requirements' token (so a payment signed for another asset or chain does
+    not verify) and recovers its signer:
+
+    - 65-byte signatures must recover to `authorization.from`.
+    - 85-byte ERC-1271 signatures (validator address + owner signature, as
+      made by `encode_1271_signature`) must carry a recoverable owner
+      signature, and that owner must be one of the smart account's owners
+      when `smart_account_owners` knows them. Whether the owner may sign
+      for the account is otherwise left to the facilitator.
+
+    Other signatures (e.g. ERC-6492 wrapped ones for undeployed accounts)
+    and tokens without a domain in `extra` are passed on unchecked.
+    """
+
+    def __init__(
+        self,
+        *,
+        smart_account_owners: Optional[OwnersResolver] = None,
+        backend: Optional[SigningBackend] = None,
+    ) -> None:
+        """
+        Initialize the preverifier.
+
+        Args:
+            smart_account_owners: Owners of a smart account by its address
+            backend: Signature recovery backend (default: coincurve when
+                installed)
+        """
+        self._smart_account_owners = smart_account_owners
+        self._backend = backend
+
+    def verify(
+        self, payload: PaymentPayload, requirements: PaymentRequirements
+    ) -> Optional[str]:
+        """
+        Check the signature of a payment passing `check_exact_payment`.
+
+        Returns:
+            The x402 reason the payment is invalid, None if not found invalid
+        """
+        if not isinstance(payload.payload, ExactPaymentPayload):
+            return "invalid_payload"
+        authorization = payload.payload.authorization
+
+        extra = requirements.extra or {}
+        try:
+            separator = domain_separator(
+                extra["name"],
+                extra["version"],
+                int(get_chain_id(requirements.network)),
+                requirements.asset,
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            logger.debug(f'cannot preverify payment, unknown token domain "{e}"')
+            return None
+
+        digest = transfer_with_authorization_digest(
+            domain_separator=separator,
+            from_=authorization.from_,
+            to=authorization.to,
+            value=authorization.value,
+            valid_after=authorization.valid_after,
+            valid_before=authorization.valid_before,
+            nonce=to_bytes(hexstr=authorization.nonce),
+        )
+        signature = to_bytes(hexstr=payload.payload.signature)
+
+        if len(signature) == _SIGNATURE_LENGTH:
+            signer = self._recover(digest, signature)
+            if signer is None or signer.lower() != authorization.from_.lower():
+                return "invalid_exact_evm_payload_signature"
+            return None
+
+        if len(signature) == _VALIDATOR_LENGTH + _SIGNATURE_LENGTH:
+            inner = signature[_VALIDATOR_LENGTH:]
+            if inner[64] in (31, 32):
+                # v raised by 4 when the account is its own validator
+                inner = inner[:64] + bytes([inner[64] - 4])
+            owner = self._recover(digest, inner)
+            if owner is None:
+                return "invalid_exact_evm_payload_signature"
+            owners = (
+                self._smart_account_owners(authorization.from_)
+                if self._smart_account_owners is not None
+                else None
+            )
+            if owners is not None and owner.lower() not in {o.lower() for o in owners}:
+                return "invalid_exact_evm_payload_signature"
+            return None
+
+        return None
+
+    def _recover(self, digest: bytes, signature: bytes) -> Optional[str]:
+        try:
+            return recover_address(digest, signature, self._backend)
+        except ValueError:
+            return None
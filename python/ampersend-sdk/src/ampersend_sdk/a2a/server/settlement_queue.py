@@ -0,0 +1,205 @@
+import sqlite3
+from typing import Any, Dict, List, NamedTuple, Optional, Protocol, Tuple
+
+from x402_a2a.types import PaymentPayload, PaymentRequirements
+
+from ...sqlite import SqliteDatabase
+
+_SELECT = (
+    "SELECT settlement_id, payment, requirements, created_at, attempts,"
+    " next_attempt_at, last_error"
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS settlements (
+    settlement_id TEXT NOT NULL PRIMARY KEY,
+    payment TEXT NOT NULL,
+    requirements TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    attempts INTEGER NOT NULL,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS settlements_next_attempt_at
+    ON settlements (next_attempt_at);
+"""
+
+
+class PendingSettlement(NamedTuple):
+    """A verified payment waiting to be settled."""
+
+    settlement_id: str
+    payment: PaymentPayload
+    requirements: PaymentRequirements
+    created_at: float
+    attempts: int = 0
+    # Unix time of the next attempt, inf once retries are exhausted
+    next_attempt_at: float = 0.0
+    last_error: Optional[str] = None
+
+
+class SettlementQueue(Protocol):
+    """
+    Verified payments not yet settled.
+
+    Lets SettlementScheduler settle payments off the response path without
+    losing them: a payment stays queued until its settlement succeeds.
+    """
+
+    async def add(self, settlement: PendingSettlement) -> bool:
+        """
+        Queue a payment.
+
+        Returns:
+            False if a payment with the same settlement_id is already queued
+        """
+        ...
+
+    async def due(self, now: float, limit: int) -> List[PendingSettlement]:
+        """Oldest `limit` payments whose next attempt is due at `now`."""
+        ...
+
+    async def update(self, settlement: PendingSettlement) -> None:
+        """Record a failed attempt of a queued payment."""
+        ...
+
+    async def remove(self, settlement_id: str) -> None:
+        """Forget a settled payment."""
+        ...
+
+    async def pending(self) -> List[PendingSettlement]:
+        """Every queued payment, oldest first."""
+        ...
+
+
+class InMemorySettlementQueue:
+    """SettlementQueue lost on restart, for development and tests."""
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, PendingSettlement] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def add(self, settlement: PendingSettlement) -> bool:
+        if settlement.settlement_id in self._entries:
+            return False
+        self._entries[settlement.settlement_id] = settlement
+        return True
+
+    async def due(self, now: float, limit: int) -> List[PendingSettlement]:
+        due = [s for s in self._entries.values() if s.next_attempt_at <= now]
+        return sorted(due, key=lambda s: s.created_at)[:limit]
+
+    async def update(self, settlement: PendingSettlement) -> None:
+        if settlement.settlement_id in self._entries:
+            self._entries[settlement.settlement_id] = settlement
+
+    async def remove(self, settlement_id: str) -> None:
+        self._entries.pop(settlement_id, None)
+
+    async def pending(self) -> List[PendingSettlement]:
+        return sorted(self._entries.values(), key=lambda s: s.created_at)
+
+
+class SqliteSettlementQueue:
+    """
+    SettlementQueue persisted in SQLite, surviving process restarts.
+
+    `add` returns once the row is committed, so a payment acknowledged to
+    the buyer is never lost before it settles.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Initialize the queue.
+
+        Args:
+            path: SQLite database file
+        """
+        self._db = SqliteDatabase(path, _SCHEMA)
+
+    async def add(self, settlement: PendingSettlement) -> bool:
+        row = (
+            settlement.settlement_id,
+            settlement.payment.model_dump_json(by_alias=True),
+            settlement.requirements.model_dump_json(by_alias=True),
+            settlement.created_at,
+            settlement.attempts,
+            settlement.next_attempt_at,
+            settlement.last_error,
+        )
+
+        def insert(db: sqlite3.Connection) -> bool:
+            with db:
+                cursor = db.execute(
+                    "INSERT OR IGNORE INTO settlements"
+                    " (settlement_id, payment, requirements, created_at, attempts,"
+                    " next_attempt_at, last_error)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    row,
+                )
+                return cursor.rowcount == 1
+
+        return await self._db.run(insert)
+
+    async def due(self, now: float, limit: int) -> List[PendingSettlement]:
+        rows = await self._db.run(
+            lambda db: db.execute(
+                _SELECT + " FROM settlements WHERE next_attempt_at <= ?"
+                " ORDER BY created_at LIMIT ?",
+                (now, limit),
+            ).fetchall()
+        )
+        return [_settlement(row) for row in rows]
+
+    async def update(self, settlement: PendingSettlement) -> None:
+        def update(db: sqlite3.Connection) -> None:
+            with db:
+                db.execute(
+                    "UPDATE settlements"
+                    " SET attempts = ?, next_attempt_at = ?, last_error = ?"
+                    " WHERE settlement_id = ?",
+                    (
+                        settlement.attempts,
+                        settlement.next_attempt_at,
+                        settlement.last_error,
+                        settlement.settlement_id,
+                    ),
+                )
+
+        await self._db.run(update)
+
+    async def remove(self, settlement_id: str) -> None:
+        def delete(db: sqlite3.Connection) -> None:
+            with db:
+                db.execute(
+                    "DELETE FROM settlements WHERE settlement_id = ?",
+                    (settlement_id,),
+                )
+
+        await self._db.run(delete)
+
+    async def pending(self) -> List[PendingSettlement]:
+        rows = await self._db.run(
+            lambda db: db.execute(
+                _SELECT + " FROM settlements ORDER BY created_at"
+            ).fetchall()
+        )
+        return [_settlement(row) for row in rows]
+
+    async def close(self) -> None:
+        """Close the database."""
+        await self._db.close()
+
+
+def _settlement(row: Tuple[Any, ...]) -> PendingSettlement:
+    return PendingSettlement(
+        settlement_id=row[0],
+        payment=PaymentPayload.model_validate_json(row[1]),
+        requirements=PaymentRequirements.model_validate_json(row[2]),
+        created_at=row[3],
+        attempts=row[4],
+        next_attempt_at=row[5],
+        last_error=row[6],
+    )
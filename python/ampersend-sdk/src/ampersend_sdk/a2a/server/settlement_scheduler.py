@@ -0,0 +1,331 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, List, Literal, Optional
+
+from pydantic import BaseModel
+from x402_a2a.types import (
+    ExactPaymentPayload,
+    PaymentPayload,
+    PaymentRequirements,
+    SettleResponse,
+)
+
+from .settlement_queue import (
+    InMemorySettlementQueue,
+    PendingSettlement,
+    SettlementQueue,
+)
+
+logger = logging.getLogger(__name__)
+
+# When payments are settled:
+# - inline: before the task's result is sent, as without a scheduler
+# - deferred: in the background, as soon as the result is sent
+# - batch: in the background, every `batch_size` payments or
+#   `batch_interval` seconds, whichever comes first
+SettlementMode = Literal["inline", "deferred", "batch"]
+
+SettleFunction = Callable[
+    [PaymentPayload, PaymentRequirements], Awaitable[SettleResponse]
+]
+
+
+class SettlementStats(BaseModel):
+    """Counters for a SettlementScheduler."""
+
+    queued: int = 0
+    settled: int = 0
+    failed_attempts: int = 0
+    exhausted: int = 0
+
+
+class UnsettledPayment(BaseModel):
+    """A queued payment, as listed in a SettlementReport."""
+
+    settlement_id: str
+    payer: Optional[str]
+    value: int
+    network: str
+    asset: str
+    pay_to: str
+    created_at: float
+    attempts: int
+    # None once retries are exhausted
+    next_attempt_at: Optional[float]
+    last_error: Optional[str]
+
+
+class SettlementReport(BaseModel):
+    """Payments accepted from buyers but not settled yet."""
+
+    unsettled: List[UnsettledPayment]
+    # Total unsettled value per "network:asset", in atomic units
+    totals: Dict[str, int]
+    # Payments no longer retried, needing attention
+    exhausted: int
+
+
+def settlement_id(payment: PaymentPayload) -> str:
+    """Identifies a payment's settlement: its payer and ERC-3009 nonce."""
+    if not isinstance(payment.payload, ExactPaymentPayload):
+        return uuid.uuid4().hex
+    authorization = payment.payload.authorization
+    return (
+        f"{authorization.from_.lower()}:"
+        f"{authorization.nonce.lower().removeprefix('0x')}"
+    )
+
+
+class SettlementScheduler:
+    """
+    Settles verified payments off the response path.
+
+    In deferred and batch modes, `settle` records the payment in a durable
+    queue and returns at once, so the buyer gets its result without waiting
+    for on-chain settlement. A background worker then settles the queued
+    payments through the facilitator, `batch_size` at a time. Failed
+    settlements are retried with exponential backoff until `max_attempts`,
+    or until the authorization expires; payments left unsettled are listed
+    by `report`. Payments queued before a restart are settled once `start`
+    is called, or with the next payment.
+    """
+
+    def __init__(
+        self,
+        *,
+        mode: SettlementMode = "deferred",
+        queue: Optional[SettlementQueue] = None,
+        batch_size: int = 20,
+        batch_interval: float = 10.0,
+        max_attempts: int = 8,
+        retry_backoff: float = 2.0,
+        max_retry_backoff: float = 600.0,
+    ) -> None:
+        """
+        Initialize the scheduler.
+
+        Args:
+            mode: When payments are settled
+            queue: Payments not yet settled (default: in memory, lost on
+                restart)
+            batch_size: Payments settled concurrently, and queued payments
+                triggering a batch in batch mode
+            batch_interval: Seconds between batches in batch mode, and
+                between checks for retries in every mode
+            max_attempts: Settlement attempts before a payment is left for
+                reconciliation
+            retry_backoff: Seconds before the first retry, doubled on each
+                later one
+            max_retry_backoff: Maximum seconds between retries
+        """
+        self._mode = mode
+        self._queue: SettlementQueue = queue or InMemorySettlementQueue()
+        self._batch_size = batch_size
+        self._batch_interval = batch_interval
+        self._max_attempts = max_attempts
+        self._retry_backoff = retry_backoff
+        self._max_retry_backoff = max_retry_backoff
+        self._settle: Optional[SettleFunction] = None
+        self._queued_since_batch = 0
+        self._wake = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._worker: Optional[asyncio.Task[None]] = None
+        self._closed = False
+        self.stats = SettlementStats()
+
+    def attach(self, settle: SettleFunction) -> None:
+        """Set the function settling payments, e.g. a facilitator's."""
+        self._settle = settle
+
+    def start(self) -> None:
+        """Start settling queued payments in the background."""
+        if self._worker is None and not self._closed and self._mode != "inline":
+            self._worker = asyncio.create_task(self._work())
+
+    async def settle(
+        self, payment: PaymentPayload, requirements: PaymentRequirements
+    ) -> SettleResponse:
+        """
+        Settle a verified payment according to the mode.
+
+        Returns:
+            The facilitator's response in inline mode; otherwise a successful
+            response without transaction once the payment is queued, or a
+            failed one if the same payment is already queued (a replay)
+        """
+        settle = self._settle_function()
+        if self._mode == "inline":
+            return await settle(payment, requirements)
+
+        settlement = PendingSettlement(
+            settlement_id=settlement_id(payment),
+            payment=payment,
+            requirements=requirements,
+            created_at=time.time(),
+        )
+        if not await self._queue.add(settlement):
+            # Same payer and nonce: a replay of a payment not settled yet
+            logger.warning(f"payment {settlement.settlement_id} already queued")
+            return SettleResponse.model_validate(
+                {
+                    "success": False,
+                    "errorReason": "payment already submitted",
+                    "network": requirements.network,
+                    "payer": _payer(payment),
+                }
+            )
+        self.stats.queued += 1
+        self._queued_since_batch += 1
+
+        self.start()
+        if self._mode == "deferred" or self._queued_since_batch >= self._batch_size:
+            self._wake.set()
+
+        return SettleResponse(
+            success=True,
+            network=requirements.network,
+            payer=_payer(payment),
+        )
+
+    async def flush(self) -> None:
+        """Attempt every queued payment now due."""
+        settle = self._settle_function()
+        async with self._lock:
+            self._queued_since_batch = 0
+            while True:
+                due = await self._queue.due(time.time(), self._batch_size)
+                await asyncio.gather(*(self._attempt(settle, s) for s in due))
+                if len(due) < self._batch_size:
+                    return
+
+    async def report(self) -> SettlementReport:
+        """List the payments not settled yet, for reconciliation."""
+        unsettled: List[UnsettledPayment] = []
+        totals: Dict[str, int] = {}
+        for s in await self._queue.pending():
+            value = _value(s.payment)
+            unsettled.append(
+                UnsettledPayment(
+                    settlement_id=s.settlement_id,
+                    payer=_payer(s.payment),
+                    value=value,
+                    network=s.requirements.network,
+                    asset=s.requirements.asset,
+                    pay_to=s.requirements.pay_to,
+                    created_at=s.created_at,
+                    attempts=s.attempts,
+                    next_attempt_at=(
+                        s.next_attempt_at if s.next_attempt_at != float("inf") else None
+                    ),
+                    last_error=s.last_error,
+                )
+            )
+            key = f"{s.requirements.network}:{s.requirements.asset}"
+            totals[key] = totals.get(key, 0) + value
+        return SettlementReport(
+            unsettled=unsettled,
+            totals=totals,
+            exhausted=sum(1 for u in unsettled if u.next_attempt_at is None),
+        )
+
+    async def close(self, timeout: float | None = 5.0) -> None:
+        """
+        Stop the worker, first settling the payments due.
+
+        Payments still queued are kept for the next start when the queue is
+        durable.
+
+        Args:
+            timeout: Seconds to wait for the due payments to settle, wait
+                indefinitely if None
+        """
+        self._closed = True
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        await asyncio.gather(self._worker, return_exceptions=True)
+        self._worker = None
+        try:
+            await asyncio.wait_for(self.flush(), timeout)
+        except TimeoutError:
+            logger.warning("payments left unsettled on close")
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self._batch_interval)
+            except TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f'settling payments failed with "{e}"')
+
+    async def _attempt(self, settle: SettleFunction, s: PendingSettlement) -> None:
+        error: Optional[str]
+        if _expires_at(s.payment) <= time.time():
+            error = "authorization expired"
+            attempts = self._max_attempts
+        else:
+            try:
+                response = await settle(s.payment, s.requirements)
+            except Exception as e:
+                error = str(e)
+            else:
+                if response.success:
+                    await self._queue.remove(s.settlement_id)
+                    self.stats.settled += 1
+                    logger.info(
+                        f"settled payment {s.settlement_id} in {response.transaction}"
+                    )
+                    return
+                error = response.error_reason or "settlement failed"
+            attempts = s.attempts + 1
+
+        self.stats.failed_attempts += 1
+        if attempts >= self._max_attempts:
+            next_attempt_at = float("inf")
+            self.stats.exhausted += 1
+            logger.error(
+                f'giving up settling payment {s.settlement_id} after "{error}"'
+            )
+        else:
+            next_attempt_at = time.time() + min(
+                self._retry_backoff * 2 ** (attempts - 1), self._max_retry_backoff
+            )
+            logger.warning(
+                f'settling payment {s.settlement_id} failed with "{error}",'
+                f" retrying in {next_attempt_at - time.time():.0f}s"
+            )
+        await self._queue.update(
+            s._replace(
+                attempts=attempts, next_attempt_at=next_attempt_at, last_error=error
+            )
+        )
+
+    def _settle_function(self) -> SettleFunction:
+        if self._settle is None:
+            raise RuntimeError("SettlementScheduler is not attached to a facilitator")
+        return self._settle
+
+
+def _payer(payment: PaymentPayload) -> Optional[str]:
+    if isinstance(payment.payload, ExactPaymentPayload):
+        payer: str = payment.payload.authorization.from_
+        return payer
+    return None
+
+
+def _value(payment: PaymentPayload) -> int:
+    if isinstance(payment.payload, ExactPaymentPayload):
+        return int(payment.payload.authorization.value)
+    return 0
+
+
+def _expires_at(payment: PaymentPayload) -> float:
+    if isinstance(payment.payload, ExactPaymentPayload):
+        return float(payment.payload.authorization.valid_before)
+    return float("inf")
@@ -1,10 +1,14 @@
 import logging
-from typing import Optional, Union
+from typing import Any, Dict, Optional, Union
 
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
 from a2a.server.tasks import InMemoryTaskStore
 from a2a.types import AgentCard
+from a2a.utils.constants import (
+    AGENT_CARD_WELL_KNOWN_PATH,
+    PREV_AGENT_CARD_WELL_KNOWN_PATH,
+)
 from google.adk.a2a.utils.agent_card_builder import AgentCardBuilder
 from google.adk.a2a.utils.agent_to_a2a import _load_agent_card
 from google.adk.agents import BaseAgent
@@ -17,9 +21,11 @@ from google.adk.memory import InMemoryMemoryService
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from starlette.applications import Starlette
+from starlette.routing import Route
 from x402_a2a import get_extension_declaration
 
 from . import X402A2aAgentExecutor
+from .agent_card_endpoint import agent_card_endpoint
 
 
 def to_a2a(
@@ -29,6 +35,8 @@ def to_a2a(
     port: int = 8001,
     protocol: str = "http",
     agent_card: Optional[Union[AgentCard, str]] = None,
+    agent_card_max_age: int = 300,
+    x402_executor_kwargs: Optional[Dict[str, Any]] = None,
 ) -> Starlette:
     """Convert an ADK agent to a A2A Starlette application.
 
@@ -40,6 +48,10 @@ def to_a2a(
         agent_card: Optional pre-built AgentCard object or path to agent card
                     JSON. If not provided, will be built automatically from the
                     agent.
+        agent_card_max_age: Seconds clients may cache the agent card before
+                    revalidating it with its ETag (default: 300)
+        x402_executor_kwargs: Extra arguments for the x402 executor, e.g. a
+                    shared `nonce_index`
 
     Returns:
         A Starlette application that can be run with uvicorn
@@ -72,6 +84,7 @@ def to_a2a(
 
     agent_executor = X402A2aAgentExecutor(
         runner=create_runner,
+        x402_executor_kwargs=x402_executor_kwargs,
     )
 
     request_handler = DefaultRequestHandler(
@@ -109,6 +122,15 @@ def to_a2a(
             http_handler=request_handler,
         )
 
+        # Serve the card with cache validators, ahead of the A2A card routes
+        card_endpoint = agent_card_endpoint(
+            final_agent_card, max_age=agent_card_max_age
+        )
+        app.routes.extend(
+            Route(path, card_endpoint, methods=["GET"])
+            for path in (AGENT_CARD_WELL_KNOWN_PATH, PREV_AGENT_CARD_WELL_KNOWN_PATH)
+        )
+
         # Add A2A routes to the main app
         a2a_app.add_routes_to_app(
             app,
@@ -1,19 +1,93 @@
-from typing import override
+from typing import Any, Optional, override
 
 from a2a.server.tasks import TaskUpdater
 from a2a.types import Part, TextPart
 from x402_a2a import (
     X402_EXTENSION_URI,
+    x402ExtensionConfig,
     x402PaymentRequiredException,
 )
+from x402_a2a.core.utils import x402Utils
 from x402_a2a.executors import x402ServerExecutor
 from x402_a2a.types import (
+    AgentExecutor,
     EventQueue,
+    PaymentPayload,
+    PaymentRequirements,
+    PaymentStatus,
     RequestContext,
 )
 
+from .optimistic_execution import OptimisticDelegate, SessionFork
+from .payment_checks import PaymentCheck, PaymentPreverifier, check_exact_payment
+
 
 class X402ServerExecutor(x402ServerExecutor):
+    def __init__(
+        self,
+        *,
+        delegate: AgentExecutor,
+        config: x402ExtensionConfig,
+        preverifier: Optional[PaymentPreverifier] = None,
+        optimistic: bool = False,
+        session_fork: Optional[SessionFork] = None,
+        **kwargs: Any,
+    ):
+        """
+        Args:
+            delegate: Executor of the paid agent
+            config: x402 extension configuration
+            preverifier: Checks payment signatures offline before
+                `verify_payment` asks the facilitator (default: disabled)
+            optimistic: Run the agent while its payment is being verified,
+                releasing its output only once verification passes; a
+                payment found invalid cancels the run and discards its
+                output (default: run the agent after verification)
+            session_fork: Isolates the session writes of optimistic runs
+                until their payment is verified
+        """
+        self._optimistic: Optional[OptimisticDelegate] = (
+            OptimisticDelegate(delegate, session_fork) if optimistic else None
+        )
+        super().__init__(delegate=self._optimistic or delegate, config=config, **kwargs)
+        self._preverifier = preverifier
+        self._x402_utils = x402Utils()
+
+    def preverify_payment(
+        self, payload: PaymentPayload, requirements: PaymentRequirements
+    ) -> PaymentCheck:
+        """
+        Check a payment without the facilitator.
+
+        Always checks the payload's shape, recipient, amount and time window;
+        the signature too when a preverifier is set.
+        """
+        check = check_exact_payment(payload, requirements)
+        if check.invalid_reason is None and self._preverifier is not None:
+            invalid_reason = self._preverifier.verify(payload, requirements)
+            if invalid_reason is not None:
+                return check._replace(invalid_reason=invalid_reason)
+        return check
+
+    @override
+    async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
+        if (
+            self._optimistic is None
+            or context.message is None
+            or context.current_task is None
+            or self._x402_utils.get_payment_status_from_message(context.message)
+            != PaymentStatus.PAYMENT_SUBMITTED
+        ):
+            await super().execute(context, event_queue)
+            return
+
+        await self._optimistic.start(context)
+        try:
+            await super().execute(context, event_queue)
+        finally:
+            # Still pending when verification failed
+            await self._optimistic.discard(context)
+
     @override
     async def _handle_payment_required_exception(
         self,
@@ -3,7 +3,10 @@ from x402.types import (
     PaymentRequirements,
 )
 
+from .authorization_cache import AuthorizationCache
 from .client import ApiClient
+from .events import PaymentEventQueue, PaymentEventQueueStats, PaymentEventSink
+from .outbox import PaymentEventOutbox
 from .treasurer import (
     AmpersendTreasurer,
 )
@@ -41,6 +44,12 @@ __all__ = [
     "ApiResponseNonce",
     "ApiRequestLogin",
     "ApiResponseLogin",
+    # Event reporting
+    "PaymentEventSink",
+    "PaymentEventQueue",
+    "PaymentEventQueueStats",
+    "PaymentEventOutbox",
     # Treasurer
     "AmpersendTreasurer",
+    "AuthorizationCache",
 ]
@@ -0,0 +1,138 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from x402.types import PaymentRequirements
+
+from .types import ApiResponseAgentPaymentAuthorization
+
+AuthorizationCacheKey = Tuple[str, str, str, int]
+
+
+def _limit(limits: Dict[str, str], *names: str) -> Optional[int]:
+    for name in names:
+        if name in limits:
+            return int(limits[name])
+    return None
+
+
+class AuthorizationCache:
+    """
+    Local mirror of the API's authorization decisions and spend limits.
+
+    Payments the API has recently authorized are remembered in a TTL'd
+    allow-list keyed on (pay_to, asset, network, amount bucket), where the
+    bucket is the bit length of the amount. A payment matching the allow-list
+    is pre-approved locally as long as it fits in the mirrored daily and
+    monthly remaining limits, which are decremented on every local approval.
+
+    Reconciliation is conservative: server-reported limits replace the mirror
+    once it is older than `limits_ttl`, otherwise the lower value wins. A denial evicts
+    the entry and invalidates the mirror, so the next payment goes to the API.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = 60.0,
+        limits_ttl: float = 60.0,
+        max_entries: int = 1024,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds an authorized (pay_to, asset, network, bucket) stays allowed
+            limits_ttl: Seconds the mirrored limits are trusted without a fresh
+                response from the API
+            max_entries: Maximum number of allow-list entries
+        """
+        self._ttl = ttl
+        self._limits_ttl = limits_ttl
+        self._max_entries = max_entries
+        self._allowed: OrderedDict[AuthorizationCacheKey, float] = OrderedDict()
+        self._daily_remaining: Optional[int] = None
+        self._monthly_remaining: Optional[int] = None
+        self._limits_expire_at = 0.0
+
+    @staticmethod
+    def key(requirements: PaymentRequirements) -> AuthorizationCacheKey:
+        return (
+            requirements.pay_to.lower(),
+            requirements.asset.lower(),
+            requirements.network,
+            int(requirements.max_amount_required).bit_length(),
+        )
+
+    def try_reserve(self, requirements: PaymentRequirements) -> bool:
+        """Pre-approve a payment locally, deducting it from the mirrored limits."""
+        now = time.monotonic()
+        key = self.key(requirements)
+        expires_at = self._allowed.get(key)
+        if expires_at is None or expires_at <= now:
+            self._allowed.pop(key, None)
+            return False
+
+        if self._limits_expire_at <= now:
+            return False
+        if self._daily_remaining is None and self._monthly_remaining is None:
+            # No known budget to fit the payment into
+            return False
+
+        amount = int(requirements.max_amount_required)
+        if self._daily_remaining is not None and amount > self._daily_remaining:
+            return False
+        if self._monthly_remaining is not None and amount > self._monthly_remaining:
+            return False
+
+        if self._daily_remaining is not None:
+            self._daily_remaining -= amount
+        if self._monthly_remaining is not None:
+            self._monthly_remaining -= amount
+        return True
+
+    def record(
+        self,
+        requirements: PaymentRequirements,
+        response: ApiResponseAgentPaymentAuthorization,
+    ) -> None:
+        """Update the cache from an authorization response."""
+        key = self.key(requirements)
+        if not response.authorized:
+            self._allowed.pop(key, None)
+            self._limits_expire_at = 0.0
+            return
+
+        now = time.monotonic()
+        self._allowed[key] = now + self._ttl
+        self._allowed.move_to_end(key)
+        while len(self._allowed) > self._max_entries:
+            self._allowed.popitem(last=False)
+
+        if response.limits is None:
+            return
+
+        daily = _limit(response.limits, "dailyRemaining", "daily_remaining")
+        monthly = _limit(response.limits, "monthlyRemaining", "monthly_remaining")
+        if self._limits_expire_at <= now:
+            self._daily_remaining = daily
+            self._monthly_remaining = monthly
+            self._limits_expire_at = now + self._limits_ttl
+        else:
+            self._daily_remaining = _min(self._daily_remaining, daily)
+            self._monthly_remaining = _min(self._monthly_remaining, monthly)
+
+    def clear(self) -> None:
+        """Forget all cached decisions and limits."""
+        self._allowed.clear()
+        self._daily_remaining = None
+        self._monthly_remaining = None
+        self._limits_expire_at = 0.0
+
+
+def _min(a: Optional[int], b: Optional[int]) -> Optional[int]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a, b)
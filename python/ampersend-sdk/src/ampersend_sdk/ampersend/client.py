@@ -1,7 +1,9 @@
 import asyncio
-from datetime import datetime
+import json
+import logging
+from datetime import datetime, timedelta
 from types import TracebackType
-from typing import Any, Dict, List, Optional, Self
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Self
 from urllib.parse import urlparse
 
 import httpx
@@ -17,6 +19,7 @@ from x402.types import (
     PaymentRequirements,
 )
 
+from ..connections import ConnectionManager
 from .types import (
     ApiClientOptions,
     ApiError,
@@ -31,6 +34,8 @@ from .types import (
     PaymentEvent,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class ApiClient:
     """Python SDK for the x402 payment API.
@@ -39,17 +44,38 @@ class ApiClient:
     including SIWE authentication and payment lifecycle management.
     """
 
-    def __init__(self, options: ApiClientOptions):
+    def __init__(
+        self,
+        options: ApiClientOptions,
+        connection_manager: Optional[ConnectionManager] = None,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            options: Client configuration
+            connection_manager: Shares its connections with the client instead
+                of the client opening its own; the manager is left open on
+                `close`
+        """
         self.base_url = options.base_url.rstrip("/")  # Remove trailing slash
         self.session_key_private_key = options.session_key_private_key
         self.timeout = options.timeout / 1000.0  # Convert to seconds for httpx
+        self.auth_refresh_margin = timedelta(milliseconds=options.auth_refresh_margin)
+        self.coalesce_authorizations = options.coalesce_authorizations
         self._auth_lock = asyncio.Lock()
         self._auth = AuthenticationState()
+        self._refresh_task: Optional[asyncio.Task[None]] = None
+        self._close_hooks: List[Callable[[], Awaitable[None]]] = []
+        self._inflight_authorizations: Dict[
+            str, asyncio.Task[ApiResponseAgentPaymentAuthorization]
+        ] = {}
+        self._connection_manager = connection_manager
         self._http_client: Optional[httpx.AsyncClient] = None
 
     async def __aenter__(self) -> Self:
         """Async context manager entry."""
-        self._http_client = httpx.AsyncClient(timeout=self.timeout)
+        self._http_client = self._new_http_client()
         return self
 
     async def __aexit__(
@@ -59,16 +85,20 @@ class ApiClient:
         exc_tb: TracebackType | None,
     ) -> None:
         """Async context manager exit."""
-        if self._http_client:
-            await self._http_client.aclose()
+        await self.close()
 
     @property
     def http_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client."""
         if self._http_client is None:
-            self._http_client = httpx.AsyncClient(timeout=self.timeout)
+            self._http_client = self._new_http_client()
         return self._http_client
 
+    def _new_http_client(self) -> httpx.AsyncClient:
+        if self._connection_manager is not None:
+            return self._connection_manager.client
+        return httpx.AsyncClient(timeout=self.timeout)
+
     async def _perform_authentication(self) -> None:
         """Internal method to perform authentication without mutex."""
         if not self.session_key_private_key:
@@ -136,23 +166,55 @@ class ApiClient:
         requirements: List[PaymentRequirements],
         context: Optional[Dict[str, Any]] = None,
     ) -> ApiResponseAgentPaymentAuthorization:
-        """Request authorization for a payment."""
-        await self._ensure_authenticated()
-
+        """Request authorization for a payment.
+
+        Each call is authorized by the server on its own. With
+        `coalesce_authorizations` enabled, concurrent calls with the same
+        requirements and context share a single in-flight request, so they
+        are checked against policies and spend limits once; each caller
+        receives its own copy of the response.
+        """
         request = ApiRequestAgentPaymentAuthorization(
             requirements=requirements,
             context=context,
         )
 
         exclude_fields = {"context": True} if request.context is None else {}
+        json_data = request.model_dump(
+            mode="json", by_alias=True, exclude=exclude_fields
+        )
+
+        if not self.coalesce_authorizations:
+            return await self._authorize_payment(json_data)
+
+        key = json.dumps(json_data, sort_keys=True, separators=(",", ":"))
+        task = self._inflight_authorizations.get(key)
+        if task is None:
+            task = asyncio.create_task(self._authorize_payment(json_data))
+            self._inflight_authorizations[key] = task
+
+            def forget(
+                done: asyncio.Task[ApiResponseAgentPaymentAuthorization],
+            ) -> None:
+                if self._inflight_authorizations.get(key) is done:
+                    del self._inflight_authorizations[key]
+
+            task.add_done_callback(forget)
+
+        # Shielded so one caller being cancelled does not cancel the others
+        response = await asyncio.shield(task)
+        return response.model_copy(deep=True)
+
+    async def _authorize_payment(
+        self, json_data: Dict[str, Any]
+    ) -> ApiResponseAgentPaymentAuthorization:
+        auth = await self._ensure_authenticated()
 
         response = await self._fetch(
-            f"/api/v1/agents/{self._auth.agent_address}/payment/authorize",
+            f"/api/v1/agents/{auth.agent_address}/payment/authorize",
             method="POST",
-            json_data=request.model_dump(
-                mode="json", by_alias=True, exclude=exclude_fields
-            ),
-            headers={"Authorization": f"Bearer {self._auth.token}"},
+            json_data=json_data,
+            headers={"Authorization": f"Bearer {auth.token}"},
         )
 
         return ApiResponseAgentPaymentAuthorization(**response)
@@ -164,7 +226,7 @@ class ApiClient:
         event: PaymentEvent,
     ) -> ApiResponseAgentPaymentEvent:
         """Report a payment lifecycle event."""
-        await self._ensure_authenticated()
+        auth = await self._ensure_authenticated()
 
         report = ApiRequestAgentPaymentEvent(
             id_=event_id,
@@ -173,10 +235,10 @@ class ApiClient:
         )
 
         response = await self._fetch(
-            f"/api/v1/agents/{self._auth.agent_address}/payment/events",
+            f"/api/v1/agents/{auth.agent_address}/payment/events",
             method="POST",
             json_data=report.model_dump(mode="json", by_alias=True),
-            headers={"Authorization": f"Bearer {self._auth.token}"},
+            headers={"Authorization": f"Bearer {auth.token}"},
         )
 
         return ApiResponseAgentPaymentEvent(**response)
@@ -191,17 +253,49 @@ class ApiClient:
 
     def is_authenticated(self) -> bool:
         """Check if currently authenticated and token is valid."""
+        return self._is_valid(self._auth)
+
+    @staticmethod
+    def _is_valid(auth: AuthenticationState, margin: timedelta = timedelta()) -> bool:
+        """Check if the token is valid for at least `margin` longer."""
         return bool(
-            self._auth.token
-            and self._auth.expires_at
-            and self._auth.expires_at > datetime.now(self._auth.expires_at.tzinfo)
+            auth.token
+            and auth.expires_at
+            and auth.expires_at - margin > datetime.now(auth.expires_at.tzinfo)
         )
 
-    async def _ensure_authenticated(self) -> None:
-        """Ensure the client is authenticated, performing authentication if needed."""
+    async def _ensure_authenticated(self) -> AuthenticationState:
+        """Ensure the client is authenticated, performing authentication if needed.
+
+        While the current token is valid this never touches the lock. Once the
+        token is within `auth_refresh_margin` of expiring, a single background
+        refresh is started and callers keep using the current token meanwhile.
+        """
+        auth = self._auth
+        if self._is_valid(auth):
+            if not self._is_valid(auth, self.auth_refresh_margin):
+                self._start_background_refresh()
+            return auth
+
         async with self._auth_lock:
             if not self.is_authenticated():
                 await self._perform_authentication()
+            return self._auth
+
+    def _start_background_refresh(self) -> None:
+        """Start a token refresh unless one is already in flight."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._background_refresh())
+
+    async def _background_refresh(self) -> None:
+        """Refresh the token ahead of expiry without blocking callers."""
+        try:
+            async with self._auth_lock:
+                if not self._is_valid(self._auth, self.auth_refresh_margin):
+                    await self._perform_authentication()
+        except ApiError as error:
+            # The current token is still usable; the next call retries.
+            logger.warning(f'background token refresh failed with "{error}"')
 
     async def _fetch(
         self,
@@ -222,6 +316,7 @@ class ApiClient:
                 url=url,
                 json=json_data,
                 headers=request_headers,
+                timeout=self.timeout,
             )
 
             if not response.is_success:
@@ -244,8 +339,24 @@ class ApiClient:
         except Exception as error:
             raise ApiError(f"Request failed: {error}")
 
+    def add_close_hook(self, hook: Callable[[], Awaitable[None]]) -> None:
+        """Register a coroutine to run on close, before the HTTP client is closed.
+
+        Used by event sinks to flush pending events.
+        """
+        self._close_hooks.append(hook)
+
     async def close(self) -> None:
-        """Close the HTTP client."""
+        """Run close hooks and close the HTTP client."""
+        for hook in self._close_hooks:
+            try:
+                await hook()
+            except Exception as error:
+                logger.error(f'close hook failed with "{error}"')
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
         if self._http_client:
-            await self._http_client.aclose()
+            if self._connection_manager is None:
+                await self._http_client.aclose()
             self._http_client = None
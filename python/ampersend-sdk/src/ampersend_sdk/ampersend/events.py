@@ -0,0 +1,163 @@
+import asyncio
+import logging
+from typing import Dict, List, NamedTuple, Optional, Protocol
+
+from pydantic import BaseModel
+from x402.types import PaymentPayload
+
+from .client import ApiClient
+from .types import PaymentEvent
+
+logger = logging.getLogger(__name__)
+
+
+class PaymentEventSink(Protocol):
+    """Destination for payment lifecycle events reported off the request path."""
+
+    async def submit(
+        self,
+        event_id: str,
+        payment: PaymentPayload,
+        event: PaymentEvent,
+    ) -> None: ...
+
+    async def flush(self) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class PaymentEventQueueStats(BaseModel):
+    """Delivery counters for a PaymentEventQueue."""
+
+    enqueued: int = 0
+    delivered: int = 0
+    failed: int = 0
+    batches: int = 0
+
+
+class _QueuedEvent(NamedTuple):
+    event_id: str
+    payment: PaymentPayload
+    event: PaymentEvent
+
+
+class PaymentEventQueue:
+    """
+    Bounded, batched sink for payment events.
+
+    `submit` only enqueues; a background worker drains the queue in batches of
+    up to `batch_size` events, or whatever arrived within `flush_interval`
+    seconds of the first one. The API has no batch endpoint, so a batch is sent
+    as concurrent requests over the client's shared connection pool, one
+    payment's events in the order they were submitted.
+
+    When the queue is full `submit` waits for room (backpressure). The queue is
+    flushed when the owning ApiClient is closed.
+    """
+
+    def __init__(
+        self,
+        api_client: ApiClient,
+        *,
+        max_size: int = 1000,
+        batch_size: int = 50,
+        flush_interval: float = 0.1,
+    ):
+        """
+        Initialize the event queue.
+
+        Args:
+            api_client: ApiClient used to deliver events
+            max_size: Maximum number of undelivered events before submit blocks
+            batch_size: Maximum number of events delivered per batch
+            flush_interval: Seconds to wait for a batch to fill up
+        """
+        self._api_client = api_client
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue: asyncio.Queue[_QueuedEvent] = asyncio.Queue(maxsize=max_size)
+        self._batch_ready = asyncio.Event()
+        self._flushing = 0
+        self._worker: Optional[asyncio.Task[None]] = None
+        self.stats = PaymentEventQueueStats()
+
+        api_client.add_close_hook(self.close)
+
+    async def submit(
+        self,
+        event_id: str,
+        payment: PaymentPayload,
+        event: PaymentEvent,
+    ) -> None:
+        """Enqueue an event for delivery, waiting if the queue is full."""
+        self._ensure_worker()
+        await self._queue.put(_QueuedEvent(event_id, payment, event))
+        self.stats.enqueued += 1
+        if self._queue.qsize() >= self._batch_size - 1:
+            self._batch_ready.set()
+
+    async def flush(self) -> None:
+        """Wait until every enqueued event has been delivered or has failed."""
+        if self._worker is not None:
+            self._flushing += 1
+            self._batch_ready.set()
+            try:
+                await self._queue.join()
+            finally:
+                self._flushing -= 1
+
+    async def close(self) -> None:
+        """Flush pending events and stop the background worker."""
+        await self.flush()
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            if not self._flushing and self._queue.qsize() < self._batch_size - 1:
+                try:
+                    await asyncio.wait_for(
+                        self._batch_ready.wait(), self._flush_interval
+                    )
+                except TimeoutError:
+                    pass
+            self._batch_ready.clear()
+            while len(batch) < self._batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            try:
+                await self._deliver(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _deliver(self, batch: List[_QueuedEvent]) -> None:
+        # Events of one payment are sent in order, different payments
+        # concurrently
+        by_event_id: Dict[str, List[_QueuedEvent]] = {}
+        for item in batch:
+            by_event_id.setdefault(item.event_id, []).append(item)
+        await asyncio.gather(*(self._deliver_in_order(i) for i in by_event_id.values()))
+        self.stats.batches += 1
+
+    async def _deliver_in_order(self, items: List[_QueuedEvent]) -> None:
+        for item in items:
+            try:
+                await self._api_client.report_payment_event(
+                    event_id=item.event_id,
+                    payment=item.payment,
+                    event=item.event,
+                )
+            except Exception as e:
+                self.stats.failed += 1
+                logger.error(
+                    f'report_payment_event failed for {item.event_id} with "{e}"'
+                )
+            else:
+                self.stats.delivered += 1
@@ -0,0 +1,254 @@
+import asyncio
+import logging
+import sqlite3
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from x402.types import PaymentPayload
+
+from ..sqlite import SqliteDatabase
+from .client import ApiClient
+from .events import PaymentEventQueueStats
+from .types import PaymentEvent
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS payment_events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL UNIQUE,
+    event_id TEXT NOT NULL,
+    payment TEXT NOT NULL,
+    event TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS payment_events_event_id
+    ON payment_events (event_id, seq);
+"""
+
+
+class _OutboxRow(NamedTuple):
+    seq: int
+    event_id: str
+    payment: str
+    event: str
+    attempts: int
+
+
+class PaymentEventOutbox:
+    """
+    Durable, append-only outbox for payment events backed by SQLite (WAL).
+
+    `submit` returns once the event is committed locally. Appends that arrive
+    while a commit is in progress are grouped into the next transaction, so
+    concurrent reporters share one fsync. A background drainer replays
+    committed events to the API and deletes them once delivered; failures are
+    retried with exponential backoff, including events left over from a
+    previous process (call `start` to drain those without submitting).
+    A payment's events are delivered in the order they were submitted: one
+    waiting for a retry holds back the later events of the same payment.
+
+    Each row is keyed by (event_id, event type, event timestamp): a replayed
+    append of the same event is a no-op, while a later event of the same type
+    for the payment, e.g. SENDING again after a retry, is kept. Redelivery
+    reuses the same event id.
+    """
+
+    def __init__(
+        self,
+        api_client: ApiClient,
+        path: str,
+        *,
+        batch_size: int = 100,
+        drain_interval: float = 1.0,
+        max_backoff: float = 300.0,
+    ):
+        """
+        Initialize the outbox.
+
+        Args:
+            api_client: ApiClient used to deliver events
+            path: SQLite database file
+            batch_size: Maximum number of events delivered per drain pass
+            drain_interval: Seconds between drain passes when idle
+            max_backoff: Upper bound in seconds for the retry delay
+        """
+        self._api_client = api_client
+        self._batch_size = batch_size
+        self._drain_interval = drain_interval
+        self._max_backoff = max_backoff
+
+        self._db = SqliteDatabase(path, _SCHEMA)
+
+        self._pending: List[tuple[str, str, str, str]] = []
+        self._pending_commit: Optional[asyncio.Future[None]] = None
+        self._commit_task: Optional[asyncio.Task[None]] = None
+        self._wakeup = asyncio.Event()
+        self._drainer: Optional[asyncio.Task[None]] = None
+        self._drain_lock = asyncio.Lock()
+        self.stats = PaymentEventQueueStats()
+
+        api_client.add_close_hook(self.close)
+
+    def start(self) -> None:
+        """Start the background drainer, e.g. to replay events after a restart."""
+        if self._drainer is None or self._drainer.done():
+            self._drainer = asyncio.create_task(self._drain_forever())
+
+    async def submit(
+        self,
+        event_id: str,
+        payment: PaymentPayload,
+        event: PaymentEvent,
+    ) -> None:
+        """Append an event to the outbox and wait until it is committed."""
+        self.start()
+        key = f"{event_id}:{event.event_type.value}:{event.timestamp.isoformat()}"
+        self._pending.append(
+            (
+                key,
+                event_id,
+                payment.model_dump_json(by_alias=True),
+                event.model_dump_json(),
+            )
+        )
+        if self._pending_commit is None:
+            self._pending_commit = asyncio.get_running_loop().create_future()
+        commit = self._pending_commit
+        if self._commit_task is None or self._commit_task.done():
+            self._commit_task = asyncio.create_task(self._commit_pending())
+        await asyncio.shield(commit)
+        self.stats.enqueued += 1
+
+    async def pending(self) -> int:
+        """Number of committed events not yet delivered."""
+        rows = await self._db.run(
+            lambda db: db.execute("SELECT COUNT(*) FROM payment_events").fetchone()
+        )
+        return int(rows[0])
+
+    async def flush(self) -> None:
+        """Commit pending appends and deliver every event currently due."""
+        while self._commit_task is not None and not self._commit_task.done():
+            await self._commit_task
+        while await self._drain_once() == self._batch_size:
+            pass
+
+    async def close(self) -> None:
+        """Flush, stop the drainer and close the database."""
+        try:
+            await self.flush()
+        finally:
+            if self._drainer is not None:
+                self._drainer.cancel()
+                self._drainer = None
+            await self._db.close()
+
+    async def _commit_pending(self) -> None:
+        # Group commit: everything appended while the previous transaction was
+        # being written goes into the next one.
+        while self._pending:
+            rows, self._pending = self._pending, []
+            commit, self._pending_commit = self._pending_commit, None
+            assert commit is not None
+
+            def insert(db: sqlite3.Connection) -> None:
+                with db:
+                    db.executemany(
+                        "INSERT OR IGNORE INTO payment_events"
+                        " (key, event_id, payment, event) VALUES (?, ?, ?, ?)",
+                        rows,
+                    )
+
+            try:
+                await self._db.run(insert)
+            except Exception as error:
+                commit.set_exception(error)
+            else:
+                commit.set_result(None)
+                self._wakeup.set()
+
+    async def _drain_forever(self) -> None:
+        while True:
+            try:
+                delivered = await self._drain_once()
+            except Exception as error:
+                logger.error(f'payment event outbox drain failed with "{error}"')
+                delivered = 0
+            if delivered == self._batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._drain_interval)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _drain_once(self) -> int:
+        """Deliver one batch of due events. Returns the number of rows handled."""
+        async with self._drain_lock:
+            now = time.time()
+            rows = await self._db.run(
+                lambda db: [
+                    _OutboxRow(*row)
+                    for row in db.execute(
+                        "SELECT seq, event_id, payment, event, attempts"
+                        " FROM payment_events AS e WHERE next_attempt_at <= ?"
+                        # Held behind an earlier event of the same payment
+                        # waiting for a retry
+                        " AND NOT EXISTS (SELECT 1 FROM payment_events AS p"
+                        " WHERE p.event_id = e.event_id AND p.seq < e.seq"
+                        " AND p.next_attempt_at > ?)"
+                        " ORDER BY seq LIMIT ?",
+                        (now, now, self._batch_size),
+                    )
+                ]
+            )
+            if not rows:
+                return 0
+
+            delivered: List[tuple[Any, ...]] = []
+            failed: List[tuple[Any, ...]] = []
+
+            async def deliver_in_order(event_rows: List[_OutboxRow]) -> None:
+                for row in event_rows:
+                    try:
+                        await self._api_client.report_payment_event(
+                            event_id=row.event_id,
+                            payment=PaymentPayload.model_validate_json(row.payment),
+                            event=PaymentEvent.model_validate_json(row.event),
+                        )
+                    except Exception as error:
+                        logger.warning(
+                            f"report_payment_event failed for {row.event_id}"
+                            f' with "{error}"'
+                        )
+                        backoff = min(2.0**row.attempts, self._max_backoff)
+                        failed.append((now + backoff, row.seq))
+                        # Later events of the payment wait behind this one
+                        return
+                    delivered.append((row.seq,))
+
+            # Events of one payment are sent in order, different payments
+            # concurrently
+            by_event_id: Dict[str, List[_OutboxRow]] = {}
+            for row in rows:
+                by_event_id.setdefault(row.event_id, []).append(row)
+            await asyncio.gather(*(deliver_in_order(r) for r in by_event_id.values()))
+            self.stats.batches += 1
+
+            def update(db: sqlite3.Connection) -> None:
+                with db:
+                    db.executemany(
+                        "DELETE FROM payment_events WHERE seq = ?", delivered
+                    )
+                    db.executemany(
+                        "UPDATE payment_events SET attempts = attempts + 1,"
+                        " next_attempt_at = ? WHERE seq = ?",
+                        failed,
+                    )
+
+            await self._db.run(update)
+            self.stats.delivered += len(delivered)
+            self.stats.failed += len(failed)
+            return len(rows)
@@ -1,56 +1,127 @@
+import asyncio
 import datetime
+import logging
 import uuid
-from typing import Any, Dict
+from typing import Any, Dict, List, Set, cast
 
 from x402_a2a.types import (
+    PaymentPayload,
+    PaymentRequirements,
     PaymentStatus,
     x402PaymentRequiredResponse,
 )
 
-from ampersend_sdk.x402 import X402Authorization, X402Treasurer, X402Wallet
+from ampersend_sdk.x402 import (
+    AsyncX402Wallet,
+    X402Authorization,
+    X402Treasurer,
+    X402Wallet,
+)
+from ampersend_sdk.x402.selector import RequirementSelector
+from ampersend_sdk.x402.wallet import create_payment, is_async_wallet
 
+from .authorization_cache import AuthorizationCache
 from .client import ApiClient
+from .events import PaymentEventSink
 from .types import PaymentEvent, PaymentEventType
 
+logger = logging.getLogger(__name__)
+
 
 class AmpersendTreasurer(X402Treasurer):
     """
     Ampersend API treasurer with authorization checks and event reporting.
 
     Works with both EOA and smart account payment methods via the
-    X402Wallet protocol.
+    X402Wallet or AsyncX402Wallet protocols.
     """
 
-    def __init__(self, api_client: ApiClient, wallet: X402Wallet):
+    def __init__(
+        self,
+        api_client: ApiClient,
+        wallet: X402Wallet | AsyncX402Wallet,
+        event_sink: PaymentEventSink | None = None,
+        authorization_cache: AuthorizationCache | None = None,
+        speculative_signing: bool = False,
+        selector: RequirementSelector | None = None,
+    ):
         """
         Initialize Ampersend treasurer.
 
         Args:
             api_client: ApiClient instance for authorization checks
-            wallet: X402Wallet for creating payment payloads
+            wallet: X402Wallet or AsyncX402Wallet for creating payment payloads
+            event_sink: Optional sink (e.g. PaymentEventQueue) for reporting
+                payment events off the request path. Events are reported
+                inline when not provided.
+            authorization_cache: Optional AuthorizationCache used to pre-approve
+                repeat payments locally. Locally approved payments are
+                reconciled with the API in the background.
+            speculative_signing: Start signing the payment (in a worker
+                thread for sync wallets) while the authorization request is
+                in flight, discarding the signature
+                if the payment is denied. Unsubmitted ERC-3009 authorizations
+                use random nonces and cost nothing, so this is safe.
+            selector: Picks which offered requirements to pay (default: a
+                RequirementSelector for the exact scheme). The API is asked
+                to authorize the signable requirements, best first.
         """
         self._api_client = api_client
         self._wallet = wallet
+        self._event_sink = event_sink
+        self._authorization_cache = authorization_cache
+        self._speculative_signing = speculative_signing
+        self._selector = selector or RequirementSelector()
+        self._background_tasks: Set[asyncio.Task[None]] = set()
 
     async def onPaymentRequired(
         self,
         payment_required: x402PaymentRequiredResponse,
         context: Dict[str, Any] | None = None,
     ) -> X402Authorization | None:
-        result = await self._api_client.authorize_payment(
-            payment_required.accepts, context
-        )
-
-        if not result.authorized:
+        accepts = self._selector.rank(payment_required.accepts)
+        if not accepts:
+            logger.warning("no offered payment requirements can be paid")
             return None
+        requirements = accepts[0]
 
-        # TODO: actually pick based on result.selectedRequirement
-        payment = self._wallet.create_payment(
-            requirements=payment_required.accepts[0],
-        )
+        signing: asyncio.Task[PaymentPayload] | None = None
+        cache = self._authorization_cache
+        if cache is not None and cache.try_reserve(requirements):
+            task = asyncio.create_task(self._reconcile(accepts, context))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+        else:
+            if self._speculative_signing:
+                signing = asyncio.create_task(self._sign_speculatively(requirements))
+                # Keep a discarded signature's exception from being reported
+                signing.add_done_callback(
+                    lambda t: None if t.cancelled() else t.exception()
+                )
+
+            try:
+                result = await self._api_client.authorize_payment(accepts, context)
+            except BaseException:
+                if signing is not None:
+                    signing.cancel()
+                raise
+
+            if cache is not None:
+                cache.record(requirements, result)
+
+            if not result.authorized:
+                if signing is not None:
+                    signing.cancel()
+                return None
+
+        if signing is not None:
+            payment = await signing
+        else:
+            payment = await create_payment(self._wallet, requirements=requirements)
         authorization_id = uuid.uuid4().hex
+        self._selector.track(authorization_id, requirements)
 
-        await self._api_client.report_payment_event(
+        await self._report_event(
             event_id=authorization_id,
             payment=payment,
             event=PaymentEvent(
@@ -68,6 +139,8 @@ class AmpersendTreasurer(X402Treasurer):
         authorization: X402Authorization,
         context: Dict[str, Any] | None = None,
     ) -> None:
+        self._selector.observe(status, authorization.authorization_id)
+
         statusToEventType = {
             PaymentStatus.PAYMENT_SUBMITTED: PaymentEventType.SENDING,
             PaymentStatus.PAYMENT_FAILED: PaymentEventType.ERROR,
@@ -79,7 +152,7 @@ class AmpersendTreasurer(X402Treasurer):
         if status not in statusToEventType:
             return
 
-        await self._api_client.report_payment_event(
+        await self._report_event(
             event_id=authorization.authorization_id,
             payment=authorization.payment,
             event=PaymentEvent(
@@ -88,3 +161,45 @@ class AmpersendTreasurer(X402Treasurer):
                 details=context,
             ),
         )
+
+    async def _sign_speculatively(
+        self, requirements: PaymentRequirements
+    ) -> PaymentPayload:
+        if is_async_wallet(self._wallet):
+            return await create_payment(self._wallet, requirements=requirements)
+        wallet = cast(X402Wallet, self._wallet)
+        return await asyncio.to_thread(wallet.create_payment, requirements)
+
+    async def _reconcile(
+        self,
+        accepts: List[PaymentRequirements],
+        context: Dict[str, Any] | None,
+    ) -> None:
+        """Check a locally approved payment with the API and refresh the cache."""
+        assert self._authorization_cache is not None
+        try:
+            result = await self._api_client.authorize_payment(accepts, context)
+        except Exception as e:
+            logger.error(f'authorization reconciliation failed with "{e}"')
+            return
+        self._authorization_cache.record(accepts[0], result)
+        if not result.authorized:
+            logger.warning(
+                f"locally approved payment was denied by the API: {result.reason}"
+            )
+
+    async def _report_event(
+        self,
+        event_id: str,
+        payment: PaymentPayload,
+        event: PaymentEvent,
+    ) -> None:
+        if self._event_sink is not None:
+            await self._event_sink.submit(
+                event_id=event_id, payment=payment, event=event
+            )
+            return
+
+        await self._api_client.report_payment_event(
+            event_id=event_id, payment=payment, event=event
+        )
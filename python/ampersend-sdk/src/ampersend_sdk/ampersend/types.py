@@ -24,6 +24,17 @@ class ApiClientOptions(BaseModel):
     base_url: str
     session_key_private_key: Optional[str] = None
     timeout: int = 30000
+    auth_refresh_margin: int = Field(
+        default=60000,
+        description="Refresh the token in the background this many ms before it expires",
+    )
+    coalesce_authorizations: bool = Field(
+        default=False,
+        description=(
+            "Share one in-flight authorize request between identical calls;"
+            " the calls then pass a single policy and spend limit check"
+        ),
+    )
 
 
 class AuthenticationState(BaseModel):
@@ -0,0 +1,13 @@
+from .manager import (
+    ConnectionManager,
+    ConnectionManagerStats,
+    default_connection_manager,
+    http2_available,
+)
+
+__all__ = [
+    "ConnectionManager",
+    "ConnectionManagerStats",
+    "default_connection_manager",
+    "http2_available",
+]
@@ -0,0 +1,230 @@
+import functools
+import importlib.util
+import logging
+import time
+from typing import AsyncIterator, Callable, Dict, Optional, Tuple
+
+import httpx
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# (scheme, host, port) a pool of connections is kept for
+Origin = Tuple[str, str, int]
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def http2_available() -> bool:
+    """Whether the optional `h2` package needed for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class ConnectionManagerStats(BaseModel):
+    """Counters for a ConnectionManager."""
+
+    requests: int = 0
+    opened: int = 0
+    evicted: int = 0
+
+
+class _HostPool:
+    """Connection pool for one origin and its in-flight request count."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self.transport = transport
+        self.in_flight = 0
+        self.last_used = time.monotonic()
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self.last_used = time.monotonic()
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that releases its pool once read or closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release: Optional[Callable[[], None]] = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release is not None:
+                self._release()
+                self._release = None
+
+
+class ConnectionManager(httpx.AsyncBaseTransport):
+    """
+    HTTP connections shared by every client talking to remote agents.
+
+    Exposes a single `httpx.AsyncClient` whose requests are routed to one
+    connection pool per origin, each with its own connection limits, so a
+    buyer talking to many sellers reuses one warm connection per seller
+    instead of opening new TLS connections per agent instance. HTTP/2 is
+    used when `h2` is installed, multiplexing concurrent requests to the same
+    seller over one connection.
+
+    Pools of origins that have had no request in flight for `idle_timeout`
+    seconds are closed, checked at most every `idle_timeout / 4` seconds when
+    a request is made, or on `evict_idle`.
+
+    The shared client must not be closed by the components using it; close
+    the manager instead.
+    """
+
+    def __init__(
+        self,
+        *,
+        http2: Optional[bool] = None,
+        max_connections_per_host: int = 10,
+        max_keepalive_connections_per_host: int = 5,
+        keepalive_expiry: float = 90.0,
+        idle_timeout: float = 300.0,
+        timeout: float = 30.0,
+    ) -> None:
+        """
+        Initialize the manager.
+
+        Args:
+            http2: Negotiate HTTP/2, default: when `h2` is installed
+            max_connections_per_host: Maximum open connections per origin
+            max_keepalive_connections_per_host: Maximum idle connections kept
+                open per origin
+            keepalive_expiry: Seconds an idle connection is kept open
+            idle_timeout: Seconds without requests after which an origin's
+                pool is closed
+            timeout: Default request timeout (seconds) of the shared client
+        """
+        if http2 is None:
+            http2 = http2_available()
+        elif http2 and not http2_available():
+            raise ImportError(
+                "HTTP/2 requires the h2 package: pip install httpx[http2]"
+            )
+        self._http2 = http2
+        self._limits = httpx.Limits(
+            max_connections=max_connections_per_host,
+            max_keepalive_connections=max_keepalive_connections_per_host,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._idle_timeout = idle_timeout
+        self._timeout = timeout
+        self._pools: Dict[Origin, _HostPool] = {}
+        self._last_sweep = time.monotonic()
+        self._client: Optional[httpx.AsyncClient] = None
+        # Clients with another timeout than the default, by timeout
+        self._timeout_clients: Dict[float, httpx.AsyncClient] = {}
+        self.stats = ConnectionManagerStats()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Client sharing the managed connections."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(transport=self, timeout=self._timeout)
+        return self._client
+
+    def client_with_timeout(self, timeout: float) -> httpx.AsyncClient:
+        """
+        Client sharing the managed connections, with its own request timeout.
+
+        Like `client`, the returned client must not be closed.
+
+        Args:
+            timeout: Request timeout (seconds)
+        """
+        if timeout == self._timeout:
+            return self.client
+        client = self._timeout_clients.get(timeout)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(transport=self, timeout=timeout)
+            self._timeout_clients[timeout] = client
+        return client
+
+    @property
+    def hosts(self) -> int:
+        """Number of origins with an open pool."""
+        return len(self._pools)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if time.monotonic() - self._last_sweep >= self._idle_timeout / 4:
+            await self.evict_idle()
+
+        pool = self._pool(_origin(request.url))
+        pool.in_flight += 1
+        self.stats.requests += 1
+        try:
+            response = await pool.transport.handle_async_request(request)
+        except BaseException:
+            pool.release()
+            raise
+
+        assert isinstance(response.stream, httpx.AsyncByteStream)
+        response.stream = _ReleasingStream(response.stream, pool.release)
+        return response
+
+    async def evict_idle(self) -> None:
+        """Close the pools of origins idle for longer than `idle_timeout`."""
+        now = time.monotonic()
+        self._last_sweep = now
+        idle = [
+            origin
+            for origin, pool in self._pools.items()
+            if pool.in_flight == 0 and now - pool.last_used >= self._idle_timeout
+        ]
+        for origin in idle:
+            pool = self._pools.pop(origin)
+            self.stats.evicted += 1
+            await _close(pool.transport)
+
+    async def aclose(self) -> None:
+        """Close every pool and the shared clients."""
+        pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            await _close(pool.transport)
+        clients = [self._client, *self._timeout_clients.values()]
+        self._client = None
+        self._timeout_clients = {}
+        for client in clients:
+            if client is not None and not client.is_closed:
+                # Closes this transport again, with no pools left
+                await client.aclose()
+
+    def _pool(self, origin: Origin) -> _HostPool:
+        pool = self._pools.get(origin)
+        if pool is None:
+            pool = self._pools[origin] = _HostPool(self._open(origin))
+            self.stats.opened += 1
+        return pool
+
+    def _open(self, origin: Origin) -> httpx.AsyncBaseTransport:
+        return httpx.AsyncHTTPTransport(http2=self._http2, limits=self._limits)
+
+
+def _origin(url: httpx.URL) -> Origin:
+    return (url.scheme, url.host, url.port or _DEFAULT_PORTS.get(url.scheme, 0))
+
+
+async def _close(transport: httpx.AsyncBaseTransport) -> None:
+    try:
+        await transport.aclose()
+    except Exception as e:
+        logger.warning(f'closing connection pool failed with "{e}"')
+
+
+@functools.cache
+def default_connection_manager() -> ConnectionManager:
+    """
+    Process-wide ConnectionManager.
+
+    httpx connections belong to the event loop that opened them, so share it
+    only between components running on the same loop.
+    """
+    return ConnectionManager()
@@ -0,0 +1,19 @@
+from .backend import (
+    CoincurveDigestSigner,
+    DigestSigner,
+    EthAccountDigestSigner,
+    SigningBackend,
+    default_backend,
+    digest_signer,
+    recover_address,
+)
+
+__all__ = [
+    "CoincurveDigestSigner",
+    "DigestSigner",
+    "EthAccountDigestSigner",
+    "SigningBackend",
+    "default_backend",
+    "digest_signer",
+    "recover_address",
+]
@@ -0,0 +1,158 @@
+"""
+secp256k1 signing backends for precomputed digests.
+
+`digest_signer` picks coincurve (libsecp256k1) when it is installed and falls
+back to eth_account otherwise. Both produce the same 65-byte r || s || v
+signature (RFC 6979 nonce, low s, v in {27, 28}), so the backend only changes
+how fast a signature is made, never its bytes. `recover_address` reverses
+them, with the same backend preference.
+"""
+
+from typing import Literal, Optional, Protocol
+
+from eth_account import Account
+from eth_keys.datatypes import Signature
+from eth_utils.address import to_checksum_address
+from eth_utils.conversions import to_bytes
+from eth_utils.crypto import keccak
+
+try:
+    import coincurve  # type: ignore[import-not-found, unused-ignore]
+except ImportError:  # pragma: no cover - optional dependency
+    coincurve = None  # type: ignore[assignment, unused-ignore]
+
+SigningBackend = Literal["coincurve", "eth_account"]
+
+
+class DigestSigner(Protocol):
+    """Signs 32-byte digests with a single private key."""
+
+    @property
+    def address(self) -> str: ...
+
+    def sign_hash(self, digest: bytes) -> bytes:
+        """Sign a 32-byte digest, returning r || s || v (65 bytes)."""
+        ...
+
+
+def _key_bytes(private_key: str | bytes) -> bytes:
+    if isinstance(private_key, str):
+        return to_bytes(hexstr=private_key)
+    return bytes(private_key)
+
+
+class EthAccountDigestSigner:
+    """DigestSigner backed by eth_account."""
+
+    def __init__(self, private_key: str | bytes) -> None:
+        self._account = Account.from_key(_key_bytes(private_key))
+
+    @property
+    def address(self) -> str:
+        return str(self._account.address)
+
+    def sign_hash(self, digest: bytes) -> bytes:
+        return bytes(self._account.unsafe_sign_hash(digest).signature)
+
+
+def _require_coincurve() -> None:
+    if coincurve is None:
+        raise ImportError(
+            "coincurve is required for the coincurve backend: pip install coincurve"
+        )
+
+
+class CoincurveDigestSigner:
+    """DigestSigner backed by coincurve (libsecp256k1)."""
+
+    def __init__(self, private_key: str | bytes) -> None:
+        _require_coincurve()
+        self._key = coincurve.PrivateKey(_key_bytes(private_key))
+        public_key = self._key.public_key.format(compressed=False)[1:]
+        self._address = to_checksum_address(keccak(public_key)[-20:])
+
+    @property
+    def address(self) -> str:
+        return self._address
+
+    def sign_hash(self, digest: bytes) -> bytes:
+        if len(digest) != 32:
+            raise ValueError(f"digest must be 32 bytes, got {len(digest)}")
+        signature = self._key.sign_recoverable(digest, hasher=None)
+        return signature[:64] + bytes([signature[64] + 27])
+
+
+def default_backend() -> SigningBackend:
+    """The fastest backend available in this environment."""
+    return "coincurve" if coincurve is not None else "eth_account"
+
+
+def digest_signer(
+    private_key: str | bytes, backend: Optional[SigningBackend] = None
+) -> DigestSigner:
+    """
+    Create a DigestSigner for a private key.
+
+    Args:
+        private_key: Private key as 0x-prefixed hex or raw bytes
+        backend: Backend to use (default: coincurve when installed)
+
+    Returns:
+        DigestSigner for the key
+    """
+    backend = backend or default_backend()
+    if backend == "coincurve":
+        return CoincurveDigestSigner(private_key)
+    if backend == "eth_account":
+        return EthAccountDigestSigner(private_key)
+    raise ValueError(f"Unknown signing backend: {backend}")
+
+
+def recover_address(
+    digest: bytes, signature: bytes, backend: Optional[SigningBackend] = None
+) -> str:
+    """
+    Address whose key made a 65-byte r || s || v signature of a digest.
+
+    Args:
+        digest: 32-byte digest that was signed
+        signature: Signature with v in {0, 1} or {27, 28}
+        backend: Backend to use (default: coincurve when installed)
+
+    Returns:
+        Checksummed address
+
+    Raises:
+        ImportError: If the coincurve backend is requested without coincurve
+        ValueError: If the signature is malformed or recovers no key
+    """
+    if len(digest) != 32:
+        raise ValueError(f"digest must be 32 bytes, got {len(digest)}")
+    if len(signature) != 65:
+        raise ValueError(f"signature must be 65 bytes, got {len(signature)}")
+    v = signature[64] - 27 if signature[64] >= 27 else signature[64]
+    if v not in (0, 1):
+        raise ValueError(f"invalid signature v: {signature[64]}")
+    recoverable = signature[:64] + bytes([v])
+
+    backend = backend or default_backend()
+    if backend == "coincurve":
+        _require_coincurve()
+        try:
+            public_key = coincurve.PublicKey.from_signature_and_message(
+                recoverable, digest, hasher=None
+            )
+        except Exception as e:
+            raise ValueError(f"invalid signature: {e}") from e
+        return to_checksum_address(
+            keccak(public_key.format(compressed=False)[1:])[-20:]
+        )
+    if backend == "eth_account":
+        try:
+            recovered = Signature(
+                signature_bytes=recoverable
+            ).recover_public_key_from_msg_hash(digest)
+        except Exception as e:
+            raise ValueError(f"invalid signature: {e}") from e
+        return str(recovered.to_checksum_address())
+    raise ValueError(f"Unknown signing backend: {backend}")
@@ -1,3 +1,13 @@
-from .sign import SmartAccountConfig, smart_account_sign_typed_data
+from .sign import (
+    SmartAccountConfig,
+    SmartAccountSigner,
+    smart_account_sign_typed_data,
+    smart_account_signer,
+)
 
-__all__ = ["SmartAccountConfig", "smart_account_sign_typed_data"]
+__all__ = [
+    "SmartAccountConfig",
+    "SmartAccountSigner",
+    "smart_account_sign_typed_data",
+    "smart_account_signer",
+]
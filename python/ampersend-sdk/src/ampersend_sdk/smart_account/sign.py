@@ -1,8 +1,11 @@
-from typing import Any, Dict, NamedTuple
+import functools
+from typing import Any, Dict, NamedTuple, Optional
 
-from eth_account import Account
 from eth_account.messages import encode_typed_data
 from eth_utils.conversions import to_bytes, to_hex
+from eth_utils.crypto import keccak
+
+from ..signing import SigningBackend, digest_signer
 
 
 class SmartAccountConfig(NamedTuple):
@@ -32,10 +35,20 @@ def encode_1271_signature(
     Returns:
         Hex string of packed signature (validator_address + signature)
     """
+    return _pack_1271_signature(
+        validator_bytes=to_bytes(hexstr=validator_address),
+        adjust_v=smart_account_address.lower() == validator_address.lower(),
+        signature=signature,
+    )
+
+
+def _pack_1271_signature(
+    validator_bytes: bytes, adjust_v: bool, signature: bytes
+) -> str:
     formatted_signature = signature
 
     # If account == validator: adjust v value
-    if smart_account_address.lower() == validator_address.lower():
+    if adjust_v:
         # Extract v (last byte)
         v = signature[64]
         if v < 30:
@@ -44,10 +57,76 @@ def encode_1271_signature(
 
     # Pack: validator address (20 bytes) + signature
     # Using manual concatenation to avoid ABI encoding length prefixes
-    validator_bytes = to_bytes(hexstr=validator_address)
-    packed = validator_bytes + formatted_signature
+    return to_hex(validator_bytes + formatted_signature)
+
+
+class SmartAccountSigner:
+    """
+    Smart account signer compiled once from a SmartAccountConfig.
+
+    Keeps the session key signer, the validator address bytes and whether
+    the v adjustment applies, so each signature only pays for the signing
+    itself. Use `smart_account_signer` to share one signer per config.
+
+    Signing uses coincurve when it is installed (see `ampersend_sdk.signing`);
+    pass `backend` to force one.
+    """
 
-    return to_hex(packed)
+    def __init__(
+        self, config: SmartAccountConfig, backend: Optional[SigningBackend] = None
+    ) -> None:
+        self.config = config
+        self._signer = digest_signer(config.session_key, backend)
+        self._validator_bytes = to_bytes(hexstr=config.validator_address)
+        self._adjust_v = (
+            config.smart_account_address.lower() == config.validator_address.lower()
+        )
+
+    def sign_hash(self, digest: bytes) -> str:
+        """
+        Sign a precomputed EIP-712 digest.
+
+        Returns:
+            ERC-1271 encoded signature (hex string)
+        """
+        signature = self._signer.sign_hash(digest)
+        return _pack_1271_signature(self._validator_bytes, self._adjust_v, signature)
+
+    def sign_typed_data(
+        self,
+        domain: Dict[str, Any],
+        types: Dict[str, Any],
+        message: Dict[str, Any],
+        primary_type: str,
+    ) -> str:
+        """
+        Sign typed data.
+
+        Returns:
+            ERC-1271 encoded signature (hex string)
+        """
+        typed_data = {
+            "types": types,
+            "primaryType": primary_type,
+            "domain": domain,
+            "message": message,
+        }
+        signable_message = encode_typed_data(full_message=typed_data)
+        digest = keccak(
+            b"\x19"
+            + signable_message.version
+            + signable_message.header
+            + signable_message.body
+        )
+        return self.sign_hash(digest)
+
+
+@functools.lru_cache(maxsize=32)
+def smart_account_signer(
+    config: SmartAccountConfig, backend: Optional[SigningBackend] = None
+) -> SmartAccountSigner:
+    """Get the shared SmartAccountSigner for a config."""
+    return SmartAccountSigner(config, backend)
 
 
 def smart_account_sign_typed_data(
@@ -76,27 +155,11 @@ def smart_account_sign_typed_data(
     Returns:
         ERC-1271 encoded signature (hex string)
     """
-    # 1. Create account from private key
-    account = Account.from_key(config.session_key)
-
-    # 2. Create typed data structure
-    typed_data = {
-        "types": types,
-        "primaryType": primary_type,
-        "domain": domain,
-        "message": message,
-    }
-
-    # 3. Sign with EOA
-    signable_message = encode_typed_data(full_message=typed_data)
-    signed_message = account.sign_message(signable_message)
-
-    # 4. Get raw signature bytes (r+s+v format, 65 bytes)
-    signature_bytes = signed_message.signature
-
-    # 5. Encode for ERC-1271 (OwnableValidator threshold=1, so no concatenation)
-    return encode_1271_signature(
-        smart_account_address=config.smart_account_address,
-        validator_address=config.validator_address,
-        signature=signature_bytes,
+    # OwnableValidator threshold=1, so the single owner signature is encoded
+    # for ERC-1271 without concatenation
+    return smart_account_signer(config).sign_typed_data(
+        domain=domain,
+        types=types,
+        message=message,
+        primary_type=primary_type,
     )
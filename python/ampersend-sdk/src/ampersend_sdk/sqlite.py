@@ -0,0 +1,65 @@
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Literal, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class SqliteDatabase:
+    """
+    SQLite database used from asyncio.
+
+    The connection is opened in WAL mode on first use, creating the schema,
+    and all database access happens on a single worker thread, so callers
+    never block the event loop and never share the connection across threads.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        schema: str,
+        *,
+        synchronous: Literal["NORMAL", "FULL"] = "FULL",
+        timeout: float = 5.0,
+    ) -> None:
+        """
+        Initialize the database.
+
+        Args:
+            path: SQLite database file
+            schema: Statements creating the tables, run when opening
+            synchronous: SQLite synchronous mode, FULL for commits surviving
+                a power loss
+            timeout: Seconds to wait for a lock held by another connection
+        """
+        self._path = path
+        self._schema = schema
+        self._synchronous = synchronous
+        self._timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._db: Optional[sqlite3.Connection] = None
+
+    async def run(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Call `fn` with the connection on the database thread."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, lambda: fn(self._connection())
+        )
+
+    async def close(self) -> None:
+        """Close the connection and stop the database thread."""
+        if self._db is not None:
+            await self.run(lambda db: db.close())
+            self._db = None
+        self._executor.shutdown(wait=False)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(
+                self._path, timeout=self._timeout, check_same_thread=False
+            )
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(f"PRAGMA synchronous={self._synchronous}")
+            self._db.executescript(self._schema)
+            self._db.commit()
+        return self._db
@@ -1,8 +1,11 @@
+from .selector import RequirementSelector
 from .treasurer import X402Authorization, X402Treasurer
-from .wallet import X402Wallet
+from .wallet import AsyncX402Wallet, X402Wallet
 
 __all__ = [
     "X402Treasurer",
     "X402Authorization",
     "X402Wallet",
+    "AsyncX402Wallet",
+    "RequirementSelector",
 ]
@@ -0,0 +1,196 @@
+import bisect
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from x402_a2a.types import PaymentRequirements, PaymentStatus
+
+# Upper bounds (ms) of the latency histogram buckets; the last one is open
+LATENCY_BUCKETS_MS: Sequence[float] = (
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+    30000,
+    float("inf"),
+)
+
+
+class RequirementKey(NamedTuple):
+    network: str
+    scheme: str
+    asset: str
+
+
+def requirement_key(requirements: PaymentRequirements) -> RequirementKey:
+    return RequirementKey(
+        network=requirements.network,
+        scheme=requirements.scheme,
+        asset=str(requirements.asset).lower(),
+    )
+
+
+class LatencyHistogram:
+    """Bucketed histogram over the last `window` latency samples."""
+
+    def __init__(self, window: int = 64) -> None:
+        self._samples: Deque[int] = deque(maxlen=window)
+        self._counts = [0] * len(LATENCY_BUCKETS_MS)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, latency_ms: float) -> None:
+        if len(self._samples) == self._samples.maxlen:
+            self._counts[self._samples[0]] -= 1
+        bucket = bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)
+        self._samples.append(bucket)
+        self._counts[bucket] += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound (ms) of the bucket holding the q-quantile, None if empty."""
+        if not self._samples:
+            return None
+        rank = q * len(self._samples)
+        seen = 0
+        for bucket, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank and count:
+                return LATENCY_BUCKETS_MS[bucket]
+        return LATENCY_BUCKETS_MS[-1]
+
+
+class _Tracked(NamedTuple):
+    key: RequirementKey
+    started_at: float
+
+
+class RequirementSelector:
+    """
+    Picks which of the offered payment requirements to pay.
+
+    Offered requirements are indexed by (network, scheme, asset) and filtered
+    to what the wallet can sign: supported schemes, and networks when a
+    network allow-list is given. The rest are ranked by the median observed
+    time from submitting a payment to its final status on that
+    (network, scheme, asset), then by amount, then by the seller's order.
+
+    Latency is learned from payment status updates: treasurers call `track`
+    when they create a payment and `observe` from `onStatus`. Failed and
+    rejected payments count as the slowest bucket. Options without samples
+    rank first so that every option offered gets measured.
+    """
+
+    def __init__(
+        self,
+        *,
+        schemes: Iterable[str] = ("exact",),
+        networks: Optional[Iterable[str]] = None,
+        window: int = 64,
+        max_tracked: int = 1024,
+    ) -> None:
+        """
+        Initialize the selector.
+
+        Args:
+            schemes: Payment schemes the wallet can sign
+            networks: Networks the wallet can pay on, any network if None
+            window: Number of latency samples kept per (network, scheme, asset)
+            max_tracked: Maximum number of payments awaiting a final status
+        """
+        self._schemes = frozenset(schemes)
+        self._networks = frozenset(networks) if networks is not None else None
+        self._window = window
+        self._max_tracked = max_tracked
+        self._histograms: Dict[RequirementKey, LatencyHistogram] = {}
+        self._tracked: OrderedDict[str, _Tracked] = OrderedDict()
+
+    def index(
+        self, accepts: Iterable[PaymentRequirements]
+    ) -> Dict[RequirementKey, List[PaymentRequirements]]:
+        """Group the signable requirements by (network, scheme, asset)."""
+        index: Dict[RequirementKey, List[PaymentRequirements]] = {}
+        for requirements in accepts:
+            if requirements.scheme not in self._schemes:
+                continue
+            if (
+                self._networks is not None
+                and requirements.network not in self._networks
+            ):
+                continue
+            index.setdefault(requirement_key(requirements), []).append(requirements)
+        return index
+
+    def rank(self, accepts: Sequence[PaymentRequirements]) -> List[PaymentRequirements]:
+        """Signable requirements, best first."""
+        order = {id(requirements): i for i, requirements in enumerate(accepts)}
+        candidates = [
+            requirements
+            for group in self.index(accepts).values()
+            for requirements in group
+        ]
+        if len(candidates) <= 1:
+            return candidates
+
+        def sort_key(requirements: PaymentRequirements) -> tuple[float, int, int]:
+            return (
+                self.latency(requirement_key(requirements)) or 0.0,
+                _amount(requirements),
+                order[id(requirements)],
+            )
+
+        return sorted(candidates, key=sort_key)
+
+    def select(
+        self, accepts: Sequence[PaymentRequirements]
+    ) -> Optional[PaymentRequirements]:
+        """Best signable requirements, None if the wallet can sign none."""
+        ranked = self.rank(accepts)
+        return ranked[0] if ranked else None
+
+    def latency(self, key: RequirementKey, q: float = 0.5) -> Optional[float]:
+        """Observed latency quantile (ms) for a key, None without samples."""
+        histogram = self._histograms.get(key)
+        return histogram.quantile(q) if histogram is not None else None
+
+    def track(self, authorization_id: str, requirements: PaymentRequirements) -> None:
+        """Start timing a payment created for these requirements."""
+        self._tracked[authorization_id] = _Tracked(
+            requirement_key(requirements), time.monotonic()
+        )
+        while len(self._tracked) > self._max_tracked:
+            self._tracked.popitem(last=False)
+
+    def observe(self, status: PaymentStatus, authorization_id: str) -> None:
+        """Feed a payment status update."""
+        tracked = self._tracked.get(authorization_id)
+        if tracked is None:
+            return
+
+        if status == PaymentStatus.PAYMENT_SUBMITTED:
+            self._tracked[authorization_id] = tracked._replace(
+                started_at=time.monotonic()
+            )
+        elif status == PaymentStatus.PAYMENT_COMPLETED:
+            del self._tracked[authorization_id]
+            self._record(tracked.key, (time.monotonic() - tracked.started_at) * 1000)
+        elif status in (PaymentStatus.PAYMENT_FAILED, PaymentStatus.PAYMENT_REJECTED):
+            del self._tracked[authorization_id]
+            self._record(tracked.key, LATENCY_BUCKETS_MS[-1])
+
+    def _record(self, key: RequirementKey, latency_ms: float) -> None:
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = LatencyHistogram(self._window)
+        histogram.record(latency_ms)
+
+
+def _amount(requirements: PaymentRequirements) -> int:
+    try:
+        return int(requirements.max_amount_required)
+    except (TypeError, ValueError):
+        return 0
@@ -1,3 +1,4 @@
+from .budget import BudgetTreasurer
 from .naive import NaiveTreasurer
 
-__all__ = ["NaiveTreasurer"]
+__all__ = ["BudgetTreasurer", "NaiveTreasurer"]
@@ -0,0 +1,135 @@
+import logging
+from typing import Any, Dict, Optional
+
+from x402_a2a.types import (
+    PaymentRequirements,
+    PaymentStatus,
+    x402PaymentRequiredResponse,
+)
+
+from ..treasurer import X402Authorization, X402Treasurer
+
+logger = logging.getLogger(__name__)
+
+
+class BudgetTreasurer(X402Treasurer):
+    """
+    Caps the total paid through another treasurer.
+
+    Amounts are counted in the atomic units of the payment asset, so the
+    sellers sharing a budget are expected to be paid in the same asset. A
+    payment is reserved against the budget when authorized, released when
+    it fails or is rejected, and spent once completed. Authorizations that
+    would exceed the remaining budget are discarded before being submitted
+    and reported to the wrapped treasurer as rejected.
+
+    Concurrent payments are accounted for without locking: the cheapest
+    offered amount is held while the wrapped treasurer authorizes, so sellers
+    asking at the same time cannot jointly overspend.
+
+    Without a budget, payments are only counted. Once `close` is called,
+    every further payment is refused.
+    """
+
+    def __init__(self, treasurer: X402Treasurer, budget: Optional[int] = None):
+        """
+        Initialize the treasurer.
+
+        Args:
+            treasurer: Treasurer authorizing the payments
+            budget: Maximum total amount, in atomic units of the asset,
+                unlimited if None
+        """
+        self._treasurer = treasurer
+        self._budget = budget
+        self._spent = 0
+        self._held = 0
+        self._reserved: Dict[str, int] = {}
+        self._closed = False
+
+    @property
+    def remaining(self) -> Optional[int]:
+        """Budget neither spent nor reserved for pending payments."""
+        if self._budget is None:
+            return None
+        return self._budget - self._spent - self._held - sum(self._reserved.values())
+
+    @property
+    def spent(self) -> int:
+        """Total of the completed payments."""
+        return self._spent
+
+    def close(self) -> None:
+        """Refuse every further payment."""
+        self._closed = True
+
+    async def onPaymentRequired(
+        self,
+        payment_required: x402PaymentRequiredResponse,
+        context: Dict[str, Any] | None = None,
+    ) -> X402Authorization | None:
+        if self._closed:
+            return None
+
+        floor = min((_amount(r) for r in payment_required.accepts), default=0)
+        if self._exceeds(floor):
+            logger.info(f"payment of {floor} exceeds remaining budget {self.remaining}")
+            return None
+
+        self._held += floor
+        try:
+            authorization = await self._treasurer.onPaymentRequired(
+                payment_required=payment_required, context=context
+            )
+        finally:
+            self._held -= floor
+        if authorization is None:
+            return None
+
+        amount = _payment_amount(authorization, floor)
+        if self._closed or self._exceeds(amount):
+            logger.info(
+                f"discarding payment of {amount}, remaining budget {self.remaining}"
+            )
+            # Never submitted
+            await self._treasurer.onStatus(
+                status=PaymentStatus.PAYMENT_REJECTED,
+                authorization=authorization,
+                context=context,
+            )
+            return None
+
+        self._reserved[authorization.authorization_id] = amount
+        return authorization
+
+    def _exceeds(self, amount: int) -> bool:
+        remaining = self.remaining
+        return remaining is not None and amount > remaining
+
+    async def onStatus(
+        self,
+        status: PaymentStatus,
+        authorization: X402Authorization,
+        context: Dict[str, Any] | None = None,
+    ) -> None:
+        if status == PaymentStatus.PAYMENT_COMPLETED:
+            self._spent += self._reserved.pop(authorization.authorization_id, 0)
+        elif status in (PaymentStatus.PAYMENT_FAILED, PaymentStatus.PAYMENT_REJECTED):
+            self._reserved.pop(authorization.authorization_id, None)
+        await self._treasurer.onStatus(
+            status=status, authorization=authorization, context=context
+        )
+
+
+def _amount(requirements: PaymentRequirements) -> int:
+    try:
+        return int(requirements.max_amount_required)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _payment_amount(authorization: X402Authorization, default: int) -> int:
+    try:
+        return int(authorization.payment.payload.authorization.value)
+    except (AttributeError, TypeError, ValueError):
+        return default
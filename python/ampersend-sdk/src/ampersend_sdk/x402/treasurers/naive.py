@@ -1,3 +1,4 @@
+import logging
 import uuid
 from typing import Any, Dict
 
@@ -7,25 +8,49 @@ from x402_a2a import (
 )
 from x402_a2a.types import PaymentStatus, x402PaymentRequiredResponse
 
+from ..selector import RequirementSelector
 from ..treasurer import X402Authorization, X402Treasurer
-from ..wallet import X402Wallet
+from ..wallet import AsyncX402Wallet, X402Wallet, create_payment
+
+logger = logging.getLogger(__name__)
 
 
 class NaiveTreasurer(X402Treasurer):
-    def __init__(self, wallet: X402Wallet):
+    def __init__(
+        self,
+        wallet: X402Wallet | AsyncX402Wallet,
+        selector: RequirementSelector | None = None,
+    ):
+        """
+        Initialize the treasurer.
+
+        Args:
+            wallet: Wallet creating the payments
+            selector: Picks which offered requirements to pay (default: a
+                RequirementSelector for the exact scheme)
+        """
         self._wallet = wallet
+        self._selector = selector or RequirementSelector()
 
     async def onPaymentRequired(
         self,
         payment_required: x402PaymentRequiredResponse,
         context: Dict[str, Any] | None = None,
     ) -> X402Authorization | None:
-        payment = self._wallet.create_payment(
-            requirements=payment_required.accepts[0],
+        requirements = self._selector.select(payment_required.accepts)
+        if requirements is None:
+            logger.warning("no offered payment requirements can be paid")
+            return None
+
+        payment = await create_payment(
+            self._wallet,
+            requirements=requirements,
         )
+        authorization_id = uuid.uuid4().hex
+        self._selector.track(authorization_id, requirements)
         return X402Authorization(
             payment=payment,
-            authorization_id=uuid.uuid4().hex,
+            authorization_id=authorization_id,
         )
 
     async def onStatus(
@@ -34,4 +59,4 @@ class NaiveTreasurer(X402Treasurer):
         authorization: X402Authorization,
         context: Dict[str, Any] | None = None,
     ) -> None:
-        pass
+        self._selector.observe(status, authorization.authorization_id)
@@ -1,3 +1,4 @@
+import inspect
 from typing import Protocol
 
 from x402_a2a import (
@@ -11,3 +12,26 @@ class X402Wallet(Protocol):
         self,
         requirements: PaymentRequirements,
     ) -> PaymentPayload: ...
+
+
+class AsyncX402Wallet(Protocol):
+    async def create_payment(
+        self,
+        requirements: PaymentRequirements,
+    ) -> PaymentPayload: ...
+
+
+async def create_payment(
+    wallet: X402Wallet | AsyncX402Wallet,
+    requirements: PaymentRequirements,
+) -> PaymentPayload:
+    """Create a payment with either a sync or an async wallet."""
+    payment = wallet.create_payment(requirements=requirements)
+    if inspect.isawaitable(payment):
+        return await payment
+    return payment
+
+
+def is_async_wallet(wallet: X402Wallet | AsyncX402Wallet) -> bool:
+    """Check whether the wallet implements AsyncX402Wallet."""
+    return inspect.iscoroutinefunction(wallet.create_payment)
@@ -1,16 +1,76 @@
-from eth_account import Account
-from x402_a2a import PaymentPayload, PaymentRequirements, process_payment
+import functools
+from concurrent.futures import Executor
+from typing import List, Optional, Sequence
+
+from eth_account.signers.local import LocalAccount
+from x402_a2a import PaymentPayload, PaymentRequirements
+
+from ....signing import SigningBackend, digest_signer
+from ..batch import create_exact_payments
+
+
+def _sign_digests(
+    private_key: bytes, backend: Optional[SigningBackend], digests: Sequence[bytes]
+) -> List[str]:
+    signer = digest_signer(private_key, backend)
+    return ["0x" + signer.sign_hash(d).hex() for d in digests]
 
 
 class AccountWallet:
-    def __init__(self, account: Account) -> None:
+    def __init__(
+        self, account: LocalAccount, signing_backend: Optional[SigningBackend] = None
+    ) -> None:
+        """
+        Initialize the wallet.
+
+        Args:
+            account: Account paying with ERC-3009 authorizations
+            signing_backend: secp256k1 backend (default: coincurve when installed)
+        """
         self._account = account
+        self._signing_backend = signing_backend
+        self._signer = digest_signer(bytes(account.key), signing_backend)
 
     def create_payment(
         self,
         requirements: PaymentRequirements,
     ) -> PaymentPayload:
-        return process_payment(
+        (payment,) = create_exact_payments(
+            requirements=[requirements],
+            sender_address=self._account.address,
+            sign_digests=self._sign_digests,
+        )
+        if isinstance(payment, Exception):
+            raise payment
+        return payment
+
+    def create_payments(
+        self,
+        requirements: List[PaymentRequirements],
+        executor: Executor | None = None,
+    ) -> List[PaymentPayload | Exception]:
+        """
+        Create payments for many requirements at once.
+
+        Args:
+            requirements: Requirements to pay, one payment each
+            executor: Executor to spread signing over, e.g. a ProcessPoolExecutor
+
+        Returns:
+            Payloads in input order, or the exception for items that failed
+        """
+        if executor is None:
+            sign_digests = self._sign_digests
+        else:
+            sign_digests = functools.partial(
+                _sign_digests, bytes(self._account.key), self._signing_backend
+            )
+        return create_exact_payments(
             requirements=requirements,
-            account=self._account,
+            sender_address=self._account.address,
+            sign_digests=sign_digests,
+            executor=executor,
         )
+
+    def _sign_digests(self, digests: Sequence[bytes]) -> List[str]:
+        return ["0x" + self._signer.sign_hash(d).hex() for d in digests]
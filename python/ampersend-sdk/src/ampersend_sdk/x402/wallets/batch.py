@@ -0,0 +1,165 @@
+"""
+Batch creation of exact (ERC-3009) payments.
+
+Shared by the wallets' `create_payments`: nonces are generated in one call,
+requirements are grouped by token domain so each domain separator is
+computed once, and signing is split into chunks that can run on an executor
+(e.g. a ProcessPoolExecutor to use several cores).
+"""
+
+import os
+import secrets
+import time
+from concurrent.futures import Executor, Future
+from typing import Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+from x402.chains import get_chain_id
+from x402.common import x402_VERSION
+from x402_a2a import PaymentPayload, PaymentRequirements
+from x402_a2a.types import EIP3009Authorization, ExactPaymentPayload
+
+from .eip3009 import domain_separator, transfer_with_authorization_digest
+
+# Signs a list of EIP-712 digests, returning hex signatures in the same order.
+# Must be picklable to be used with a ProcessPoolExecutor.
+DigestSigner = Callable[[Sequence[bytes]], List[str]]
+
+DomainKey = Tuple[str, str, int, str]
+
+
+class _Unsigned(NamedTuple):
+    slot: int
+    requirements: PaymentRequirements
+    authorization: EIP3009Authorization
+    digest: bytes
+
+
+def _domain_key(requirements: PaymentRequirements) -> DomainKey:
+    if requirements.scheme != "exact":
+        raise ValueError(f"Unsupported payment scheme: {requirements.scheme}")
+    if requirements.extra is None:
+        raise ValueError("Payment requirements are missing the token domain (extra)")
+    return (
+        requirements.extra["name"],
+        requirements.extra["version"],
+        int(get_chain_id(requirements.network)),
+        requirements.asset,
+    )
+
+
+def create_exact_payments(
+    requirements: Sequence[PaymentRequirements],
+    sender_address: str,
+    sign_digests: DigestSigner,
+    executor: Executor | None = None,
+    chunks: int | None = None,
+) -> List[PaymentPayload | Exception]:
+    """
+    Create exact payments for many requirements at once.
+
+    Args:
+        requirements: Requirements to pay, one payment each
+        sender_address: Address the authorizations transfer from
+        sign_digests: Signs a chunk of digests
+        executor: Executor to sign chunks on, signs inline if None
+        chunks: Number of chunks to split signing into (default: CPU count)
+
+    Returns:
+        Payloads in input order; items that could not be created hold the
+        exception instead.
+    """
+    results: List[PaymentPayload | Exception] = [
+        ValueError("payment not created")
+    ] * len(requirements)
+
+    # Group by token domain
+    groups: Dict[DomainKey, List[int]] = {}
+    for index, item in enumerate(requirements):
+        try:
+            groups.setdefault(_domain_key(item), []).append(index)
+        except Exception as error:
+            results[index] = error
+
+    # One random read for all nonces
+    nonces = secrets.token_bytes(32 * len(requirements))
+    now = int(time.time())
+
+    unsigned: List[_Unsigned] = []
+    for (name, version, chain_id, asset), indices in groups.items():
+        separator = domain_separator(name, version, chain_id, asset)
+        for index in indices:
+            item = requirements[index]
+            nonce = nonces[32 * index : 32 * (index + 1)]
+            try:
+                authorization = EIP3009Authorization.model_validate(
+                    {
+                        "from": sender_address,
+                        "to": item.pay_to,
+                        "value": item.max_amount_required,
+                        "validAfter": str(now - 60),
+                        "validBefore": str(now + item.max_timeout_seconds),
+                        "nonce": "0x" + nonce.hex(),
+                    }
+                )
+                digest = transfer_with_authorization_digest(
+                    domain_separator=separator,
+                    from_=authorization.from_,
+                    to=authorization.to,
+                    value=authorization.value,
+                    valid_after=authorization.valid_after,
+                    valid_before=authorization.valid_before,
+                    nonce=nonce,
+                )
+            except Exception as error:
+                results[index] = error
+                continue
+            unsigned.append(_Unsigned(index, item, authorization, digest))
+
+    if not unsigned:
+        return results
+
+    # Split signing into chunks
+    chunk_count = 1 if executor is None else (chunks or os.cpu_count() or 1)
+    chunk_size = -(-len(unsigned) // chunk_count)
+    batches = [
+        unsigned[i : i + chunk_size] for i in range(0, len(unsigned), chunk_size)
+    ]
+
+    signed: List[List[str] | Exception] = []
+    if executor is None:
+        for batch in batches:
+            try:
+                signed.append(sign_digests([u.digest for u in batch]))
+            except Exception as error:
+                signed.append(error)
+    else:
+        futures: List[Future[List[str]] | Exception] = []
+        for batch in batches:
+            try:
+                futures.append(executor.submit(sign_digests, [u.digest for u in batch]))
+            except Exception as error:
+                futures.append(error)
+        for future in futures:
+            try:
+                signed.append(
+                    future if isinstance(future, Exception) else future.result()
+                )
+            except Exception as error:
+                signed.append(error)
+
+    for batch, signatures in zip(batches, signed):
+        for position, u in enumerate(batch):
+            if isinstance(signatures, Exception):
+                results[u.slot] = signatures
+                continue
+            results[u.slot] = PaymentPayload(
+                x402_version=x402_VERSION,
+                scheme="exact",
+                network=u.requirements.network,
+                payload=ExactPaymentPayload(
+                    signature=signatures[position],
+                    authorization=u.authorization,
+                ),
+            )
+
+    return results
@@ -0,0 +1,3 @@
+from .wallet import ExecutorWallet
+
+__all__ = ["ExecutorWallet"]
@@ -0,0 +1,95 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, Self
+
+from x402_a2a import PaymentPayload, PaymentRequirements
+
+from ...wallet import X402Wallet
+
+# Wallet owned by a ProcessPoolExecutor worker, see ExecutorWallet.with_process_pool
+_worker_wallet: X402Wallet | None = None
+
+
+def _init_worker_wallet(wallet_factory: Callable[[], X402Wallet]) -> None:
+    global _worker_wallet
+    _worker_wallet = wallet_factory()
+
+
+def _create_payment_in_worker(requirements: PaymentRequirements) -> PaymentPayload:
+    assert _worker_wallet is not None, "worker wallet not initialized"
+    return _worker_wallet.create_payment(requirements=requirements)
+
+
+class ExecutorWallet:
+    """
+    AsyncX402Wallet that signs on an executor instead of the event loop.
+
+    Wraps a synchronous X402Wallet so that EIP-712 hashing and secp256k1
+    signing do not stall other coroutines.
+
+    Example:
+        # Thread pool (default executor when none is given)
+        wallet = ExecutorWallet(SmartAccountWallet(config), ThreadPoolExecutor(4))
+
+        # Process pool: each worker builds its own wallet from a picklable factory
+        wallet = ExecutorWallet.with_process_pool(
+            functools.partial(SmartAccountWallet, config), max_workers=4
+        )
+    """
+
+    def __init__(
+        self,
+        wallet: X402Wallet | None,
+        executor: Executor | None = None,
+        *,
+        owns_executor: bool = False,
+    ) -> None:
+        """
+        Args:
+            wallet: Wallet to sign with. None when every worker of a process
+                pool holds its own wallet (see with_process_pool).
+            executor: Executor to sign on, the loop's default executor if None
+            owns_executor: Shut the executor down in close()
+        """
+        self._wallet = wallet
+        self._executor = executor
+        self._owns_executor = owns_executor
+
+    @classmethod
+    def with_process_pool(
+        cls,
+        wallet_factory: Callable[[], X402Wallet],
+        max_workers: int | None = None,
+    ) -> Self:
+        """
+        Sign on a dedicated process pool.
+
+        Account objects cannot be pickled, so instead of shipping the wallet
+        with every call, each worker builds it once from `wallet_factory`
+        (which must be picklable) and only requirements and payloads cross
+        the process boundary.
+        """
+        executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker_wallet,
+            initargs=(wallet_factory,),
+        )
+        return cls(None, executor, owns_executor=True)
+
+    async def create_payment(
+        self,
+        requirements: PaymentRequirements,
+    ) -> PaymentPayload:
+        loop = asyncio.get_running_loop()
+        if self._wallet is None:
+            return await loop.run_in_executor(
+                self._executor, _create_payment_in_worker, requirements
+            )
+        return await loop.run_in_executor(
+            self._executor, self._wallet.create_payment, requirements
+        )
+
+    def close(self) -> None:
+        """Shut down the executor if this wallet created it."""
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
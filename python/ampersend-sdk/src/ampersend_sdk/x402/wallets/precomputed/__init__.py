@@ -0,0 +1,3 @@
+from .wallet import PrecomputedPaymentStats, PrecomputedPaymentWallet
+
+__all__ = ["PrecomputedPaymentStats", "PrecomputedPaymentWallet"]
@@ -0,0 +1,249 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+from x402_a2a import PaymentPayload, PaymentRequirements
+
+from ...wallet import X402Wallet
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, str, str, str, str, int, Optional[str], Optional[str]]
+
+
+class PrecomputedPaymentStats(BaseModel):
+    """Counters for a PrecomputedPaymentWallet."""
+
+    hits: int = 0
+    misses: int = 0
+    signed: int = 0
+    evicted: int = 0
+
+
+class _Pool:
+    def __init__(self, requirements: PaymentRequirements) -> None:
+        self.requirements = requirements
+        self.payments: Deque[PaymentPayload] = deque()
+        # Last time the pool was paid from or watched
+        self.last_used = time.time()
+
+
+def _valid_before(payment: PaymentPayload) -> int:
+    return int(payment.payload.authorization.valid_before)
+
+
+class PrecomputedPaymentWallet:
+    """
+    X402Wallet serving payments from pools of pre-signed authorizations.
+
+    Requirements paid through this wallet are remembered, and a background
+    task keeps a pool of `pool_size` payments signed ahead of time for each
+    of them. While a pool has a payment with enough validity left,
+    `create_payment` is a pop; otherwise it signs inline with the wrapped
+    wallet and wakes the refiller.
+
+    Each pooled authorization carries its own nonce and a validBefore set
+    when it was signed, so the pool rolls forward: entries with less than
+    `min_validity` seconds left, by default half of the requirements'
+    `max_timeout_seconds`, are evicted and replaced by the refiller.
+    Evicted authorizations were never handed out and cannot be settled.
+    Pools not used for `idle_timeout` seconds are dropped, so requirements
+    paid once are not re-signed forever.
+
+    Example:
+        wallet = PrecomputedPaymentWallet(SmartAccountWallet(config))
+        wallet.start()
+        ...
+        await wallet.close()
+    """
+
+    def __init__(
+        self,
+        wallet: X402Wallet,
+        *,
+        pool_size: int = 16,
+        min_validity: Optional[int] = None,
+        refill_interval: float = 1.0,
+        max_pools: int = 64,
+        idle_timeout: float = 600.0,
+    ) -> None:
+        """
+        Initialize the wallet.
+
+        Args:
+            wallet: Wallet signing the pooled payments
+            pool_size: Number of pre-signed payments kept per requirements
+            min_validity: Minimum seconds left before validBefore for a pooled
+                payment to be handed out, default: half of the requirements'
+                `max_timeout_seconds`
+            refill_interval: Seconds between refill passes when idle
+            max_pools: Maximum number of distinct requirements pooled; the
+                least recently used pool is dropped beyond this
+            idle_timeout: Seconds without payment after which a pool is
+                dropped
+        """
+        self._wallet = wallet
+        self._pool_size = pool_size
+        self._min_validity = min_validity
+        self._refill_interval = refill_interval
+        self._max_pools = max_pools
+        self._idle_timeout = idle_timeout
+        self._pools: Dict[PoolKey, _Pool] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._refiller: Optional[asyncio.Task[None]] = None
+        self.stats = PrecomputedPaymentStats()
+
+    @staticmethod
+    def key(requirements: PaymentRequirements) -> PoolKey:
+        """Requirements yielding interchangeable payments share a pool."""
+        extra: Dict[str, Any] = requirements.extra or {}
+        return (
+            requirements.scheme,
+            requirements.network,
+            requirements.pay_to.lower(),
+            requirements.asset.lower(),
+            requirements.max_amount_required,
+            requirements.max_timeout_seconds,
+            extra.get("name"),
+            extra.get("version"),
+        )
+
+    def start(self) -> None:
+        """Start the background refiller on the running loop."""
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._refiller is None or self._refiller.done():
+            self._refiller = asyncio.create_task(self._refill_forever())
+
+    def watch(self, requirements: PaymentRequirements) -> None:
+        """Keep a pool for these requirements without paying them yet."""
+        self._pool(requirements)
+        self._wake()
+
+    def create_payment(
+        self,
+        requirements: PaymentRequirements,
+    ) -> PaymentPayload:
+        pool = self._pool(requirements)
+        self._evict_expired(pool)
+        if pool.payments:
+            self.stats.hits += 1
+            payment = pool.payments.popleft()
+            if len(pool.payments) < self._pool_size // 2:
+                self._wake()
+            return payment
+
+        self.stats.misses += 1
+        self._wake()
+        return self._wallet.create_payment(requirements=requirements)
+
+    def available(self, requirements: PaymentRequirements) -> int:
+        """Number of pre-signed payments pooled for these requirements."""
+        pool = self._pools.get(self.key(requirements))
+        return len(pool.payments) if pool is not None else 0
+
+    async def refill(self) -> None:
+        """Drop idle pools, evict expired payments and top up every pool."""
+        idle_since = time.time() - self._idle_timeout
+        for key, pool in list(self._pools.items()):
+            if pool.last_used < idle_since:
+                del self._pools[key]
+                self.stats.evicted += len(pool.payments)
+                logger.debug(
+                    f"dropped idle payment pool for {pool.requirements.pay_to}"
+                )
+                continue
+            self._evict_expired(pool)
+            if pool.requirements.max_timeout_seconds <= self._min_validity_for(
+                pool.requirements
+            ):
+                # Would be evicted as soon as signed
+                continue
+            missing = self._pool_size - len(pool.payments)
+            if missing <= 0:
+                continue
+            try:
+                payments = await asyncio.to_thread(
+                    self._sign, pool.requirements, missing
+                )
+            except Exception as error:
+                # Keep filling the other pools
+                logger.error(
+                    f"signing payments for {pool.requirements.pay_to}"
+                    f' failed with "{error}"'
+                )
+                continue
+            pool.payments.extend(payments)
+            self.stats.signed += len(payments)
+
+    async def close(self) -> None:
+        """Stop the refiller and drop all pooled payments."""
+        if self._refiller is not None:
+            self._refiller.cancel()
+            try:
+                await self._refiller
+            except asyncio.CancelledError:
+                pass
+            self._refiller = None
+        self._pools.clear()
+
+    def _pool(self, requirements: PaymentRequirements) -> _Pool:
+        key = self.key(requirements)
+        pool = self._pools.pop(key, None)
+        if pool is None:
+            pool = _Pool(requirements)
+        pool.last_used = time.time()
+        # Re-insert to keep the dict in LRU order
+        self._pools[key] = pool
+        while len(self._pools) > self._max_pools:
+            del self._pools[next(iter(self._pools))]
+        return pool
+
+    def _min_validity_for(self, requirements: PaymentRequirements) -> int:
+        if self._min_validity is not None:
+            return self._min_validity
+        return requirements.max_timeout_seconds // 2
+
+    def _evict_expired(self, pool: _Pool) -> None:
+        deadline = time.time() + self._min_validity_for(pool.requirements)
+        # Pools are filled in signing order, so the oldest entries expire first
+        while pool.payments and _valid_before(pool.payments[0]) <= deadline:
+            pool.payments.popleft()
+            self.stats.evicted += 1
+
+    def _sign(
+        self, requirements: PaymentRequirements, count: int
+    ) -> List[PaymentPayload]:
+        create_payments = getattr(self._wallet, "create_payments", None)
+        if create_payments is None:
+            return [
+                self._wallet.create_payment(requirements=requirements)
+                for _ in range(count)
+            ]
+
+        payments: List[PaymentPayload] = []
+        for result in create_payments([requirements] * count):
+            if isinstance(result, Exception):
+                raise result
+            payments.append(result)
+        return payments
+
+    def _wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _refill_forever(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            try:
+                await self.refill()
+            except Exception as error:
+                logger.error(f'precomputed payment refill failed with "{error}"')
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._refill_interval)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
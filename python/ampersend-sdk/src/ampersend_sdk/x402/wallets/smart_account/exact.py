@@ -8,6 +8,7 @@ The signatures are compatible with ERC-1271 validation and can be verified
 on-chain by smart contract wallets.
 """
 
+from eth_utils.conversions import to_bytes
 from x402.chains import get_chain_id
 from x402.common import x402_VERSION
 from x402.exact import prepare_payment_header
@@ -17,7 +18,8 @@ from x402_a2a.types import (
     ExactPaymentPayload,
 )
 
-from ....smart_account.sign import SmartAccountConfig, smart_account_sign_typed_data
+from ....smart_account.sign import SmartAccountConfig, smart_account_signer
+from ..eip3009 import domain_separator, transfer_with_authorization_digest
 
 
 def sign_erc3009_authorization(
@@ -46,39 +48,24 @@ def sign_erc3009_authorization(
     Returns:
         ERC-1271 encoded signature
     """
-    # ERC-3009 domain
-    domain = {
-        "name": domain_name,
-        "version": domain_version,
-        "chainId": domain_chain_id,
-        "verifyingContract": domain_verifying_contract,
-    }
-
-    types = {
-        "EIP712Domain": [
-            {"name": "name", "type": "string"},
-            {"name": "version", "type": "string"},
-            {"name": "chainId", "type": "uint256"},
-            {"name": "verifyingContract", "type": "address"},
-        ],
-        "TransferWithAuthorization": [
-            {"name": "from", "type": "address"},
-            {"name": "to", "type": "address"},
-            {"name": "value", "type": "uint256"},
-            {"name": "validAfter", "type": "uint256"},
-            {"name": "validBefore", "type": "uint256"},
-            {"name": "nonce", "type": "bytes32"},
-        ],
-    }
-
-    return smart_account_sign_typed_data(
-        config=config,
-        domain=domain,
-        types=types,
-        message=authorization.model_dump(by_alias=True),
-        primary_type="TransferWithAuthorization",
+    # Domain separator is cached per token domain; only the struct is hashed
+    digest = transfer_with_authorization_digest(
+        domain_separator=domain_separator(
+            name=domain_name,
+            version=domain_version,
+            chain_id=domain_chain_id,
+            verifying_contract=domain_verifying_contract,
+        ),
+        from_=authorization.from_,
+        to=authorization.to,
+        value=authorization.value,
+        valid_after=authorization.valid_after,
+        valid_before=authorization.valid_before,
+        nonce=to_bytes(hexstr=authorization.nonce),
     )
 
+    return smart_account_signer(config).sign_hash(digest)
+
 
 def smart_account_create_payment(
     requirements: PaymentRequirements,
@@ -1,9 +1,19 @@
+import functools
+from concurrent.futures import Executor
+from typing import List, Sequence
+
 from x402_a2a import PaymentPayload, PaymentRequirements
 
-from ....smart_account.sign import SmartAccountConfig
+from ....smart_account.sign import SmartAccountConfig, smart_account_signer
+from ..batch import create_exact_payments
 from .exact import smart_account_create_payment
 
 
+def _sign_digests(config: SmartAccountConfig, digests: Sequence[bytes]) -> List[str]:
+    signer = smart_account_signer(config)
+    return [signer.sign_hash(d) for d in digests]
+
+
 class SmartAccountWallet:
     def __init__(self, config: SmartAccountConfig) -> None:
         self._config = config
@@ -16,3 +26,25 @@ class SmartAccountWallet:
             config=self._config,
             requirements=requirements,
         )
+
+    def create_payments(
+        self,
+        requirements: List[PaymentRequirements],
+        executor: Executor | None = None,
+    ) -> List[PaymentPayload | Exception]:
+        """
+        Create payments for many requirements at once.
+
+        Args:
+            requirements: Requirements to pay, one payment each
+            executor: Executor to spread signing over, e.g. a ProcessPoolExecutor
+
+        Returns:
+            Payloads in input order, or the exception for items that failed
+        """
+        return create_exact_payments(
+            requirements=requirements,
+            sender_address=self._config.smart_account_address,
+            sign_digests=functools.partial(_sign_digests, self._config),
+            executor=executor,
+        )
@@ -0,0 +1,129 @@
+"""Unit tests for AgentCardCache."""
+
+from pathlib import Path
+from typing import Dict, List
+from unittest.mock import patch
+
+import httpx
+import pytest
+from a2a.types import AgentCapabilities, AgentCard
+from ampersend_sdk.a2a.client import AgentCardCache
+
+URL = "https://agent.example/.well-known/agent-card.json"
+
+
+def _card(version: str = "1.0.0") -> Dict[str, object]:
+    return AgentCard(
+        name="agent",
+        description="agent",
+        url="https://agent.example",
+        version=version,
+        capabilities=AgentCapabilities(),
+        default_input_modes=["text"],
+        default_output_modes=["text"],
+        skills=[],
+    ).model_dump(mode="json", exclude_none=True, by_alias=True)
+
+
+class Seller:
+    """Serves a card with an ETag, answering 304 when it matches."""
+
+    def __init__(self, max_age: int | None = None) -> None:
+        self.version = "1.0.0"
+        self.max_age = max_age
+        self.requests: List[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        headers = {"ETag": f'"{self.version}"'}
+        if self.max_age is not None:
+            headers["Cache-Control"] = f"max-age={self.max_age}"
+        if request.headers.get("if-none-match") == headers["ETag"]:
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, json=_card(self.version), headers=headers)
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self))
+
+
+@pytest.mark.asyncio
+class TestAgentCardCache:
+    """Test TTL, revalidation and snapshots."""
+
+    async def test_fresh_card_is_not_fetched_again(self) -> None:
+        seller = Seller()
+        cache = AgentCardCache(ttl=60)
+
+        first = await cache.get(URL, seller.client())
+        second = await cache.get(URL, seller.client())
+
+        assert first is second
+        assert len(seller.requests) == 1
+        assert cache.stats.hits == 1
+
+    async def test_expired_card_is_revalidated_with_etag(self) -> None:
+        seller = Seller()
+        cache = AgentCardCache(ttl=60, max_stale=0)
+        with patch("time.time", return_value=1000.0):
+            card = await cache.get(URL, seller.client())
+
+        with patch("time.time", return_value=1061.0):
+            assert await cache.get(URL, seller.client()) is card
+
+        assert seller.requests[1].headers["if-none-match"] == '"1.0.0"'
+        assert cache.stats.revalidated == 1
+
+    async def test_changed_card_is_replaced(self) -> None:
+        seller = Seller()
+        cache = AgentCardCache(ttl=60, max_stale=0)
+        with patch("time.time", return_value=1000.0):
+            await cache.get(URL, seller.client())
+
+        seller.version = "2.0.0"
+        with patch("time.time", return_value=1061.0):
+            card = await cache.get(URL, seller.client())
+
+        assert card.version == "2.0.0"
+
+    async def test_seller_max_age_overrides_ttl(self) -> None:
+        seller = Seller(max_age=10)
+        cache = AgentCardCache(ttl=60, max_stale=0)
+        with patch("time.time", return_value=1000.0):
+            await cache.get(URL, seller.client())
+        with patch("time.time", return_value=1011.0):
+            await cache.get(URL, seller.client())
+
+        assert len(seller.requests) == 2
+
+    async def test_stale_card_is_served_while_revalidating(self) -> None:
+        seller = Seller()
+        cache = AgentCardCache(ttl=60)
+        with patch("time.time", return_value=1000.0):
+            card = await cache.get(URL, seller.client())
+
+        seller.version = "2.0.0"
+        with patch("time.time", return_value=1061.0):
+            assert await cache.get(URL, seller.client()) is card
+            await cache.close()
+            assert (await cache.get(URL, seller.client())).version == "2.0.0"
+
+        assert cache.stats.stale_hits == 1
+
+    async def test_snapshot_serves_cold_start(self, tmp_path: Path) -> None:
+        seller = Seller()
+        snapshot = str(tmp_path / "cards.json")
+        await AgentCardCache(snapshot_path=snapshot).get(URL, seller.client())
+
+        cache = AgentCardCache(snapshot_path=snapshot)
+        card = await cache.get(URL, seller.client())
+
+        assert card.name == "agent"
+        assert len(seller.requests) == 1
+
+    async def test_fetch_error_is_raised_without_cached_card(self) -> None:
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(500))
+        )
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await AgentCardCache().get(URL, client)
@@ -0,0 +1,95 @@
+"""Unit tests for the authorization stores."""
+
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from ampersend_sdk.a2a.client import (
+    InMemoryAuthorizationStore,
+    SqliteAuthorizationStore,
+)
+from ampersend_sdk.x402 import X402Authorization
+from payment_factories import make_authorization, make_payload
+
+
+def _authorization(
+    authorization_id: str = "auth-1", valid_for: int = 3600
+) -> X402Authorization:
+    return X402Authorization(
+        authorization_id=authorization_id,
+        payment=make_payload(
+            make_authorization(valid_before=int(time.time()) + valid_for)
+        ),
+    )
+
+
+@pytest.mark.asyncio
+class TestInMemoryAuthorizationStore:
+    """Test InMemoryAuthorizationStore."""
+
+    async def test_put_get_delete(self) -> None:
+        store = InMemoryAuthorizationStore()
+        authorization = _authorization()
+
+        await store.put("task-1", "context-1", authorization)
+
+        assert await store.get("task-1", "context-1") is authorization
+        assert await store.get("task-1", "context-2") is None
+        await store.delete("task-1", "context-1")
+        assert await store.get("task-1", "context-1") is None
+
+    async def test_expired_authorizations_are_ignored(self) -> None:
+        store = InMemoryAuthorizationStore()
+        await store.put("task-1", "context-1", _authorization(valid_for=-1))
+
+        assert await store.get("task-1", "context-1") is None
+
+    async def test_least_recently_used_is_evicted(self) -> None:
+        store = InMemoryAuthorizationStore(max_entries=2)
+        await store.put("task-1", "c", _authorization("1"))
+        await store.put("task-2", "c", _authorization("2"))
+        await store.get("task-1", "c")
+        await store.put("task-3", "c", _authorization("3"))
+
+        assert await store.get("task-1", "c") is not None
+        assert await store.get("task-2", "c") is None
+
+    async def test_payload_without_window_does_not_expire(self) -> None:
+        store = InMemoryAuthorizationStore()
+        authorization = X402Authorization(
+            payment=MagicMock(spec=[]), authorization_id="1"
+        )
+        await store.put("task-1", "c", authorization)
+
+        assert await store.get("task-1", "c") is authorization
+
+
+@pytest.mark.asyncio
+class TestSqliteAuthorizationStore:
+    """Test SqliteAuthorizationStore."""
+
+    async def test_survives_reopen(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "authorizations.db")
+        authorization = _authorization()
+
+        store = SqliteAuthorizationStore(path)
+        await store.put("task-1", "context-1", authorization)
+        await store.close()
+
+        reopened = SqliteAuthorizationStore(path)
+        try:
+            stored = await reopened.get("task-1", "context-1")
+            assert stored == authorization
+            await reopened.delete("task-1", "context-1")
+            assert await reopened.get("task-1", "context-1") is None
+        finally:
+            await reopened.close()
+
+    async def test_expired_authorizations_are_ignored(self, tmp_path: Path) -> None:
+        store = SqliteAuthorizationStore(str(tmp_path / "authorizations.db"))
+        try:
+            await store.put("task-1", "c", _authorization(valid_for=-1))
+            assert await store.get("task-1", "c") is None
+        finally:
+            await store.close()
@@ -0,0 +1,76 @@
+"""Unit tests for x402 extension signalling across transports."""
+
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from a2a.client.transports import JsonRpcTransport
+from a2a.client.transports.grpc import GrpcTransport
+from a2a.extensions.common import HTTP_EXTENSION_HEADER
+from ampersend_sdk.a2a.client.a2a_client_extensions_interceptor import (
+    install_extensions_interceptor,
+    x402_extension_interceptor,
+)
+from x402_a2a import X402_EXTENSION_URI
+
+
+def _grpc_transport() -> tuple[GrpcTransport, MagicMock]:
+    transport = GrpcTransport(channel=MagicMock(), agent_card=None)
+    stub = MagicMock()
+    transport.stub = stub
+    return transport, stub
+
+
+class TestInstallExtensionsInterceptor:
+    """Test installing the x402 extension on each transport."""
+
+    def test_jsonrpc_interceptor_is_added_once(self) -> None:
+        transport = JsonRpcTransport(httpx.AsyncClient(), url="https://agent.example")
+
+        assert install_extensions_interceptor(transport)
+        assert install_extensions_interceptor(transport)
+
+        assert transport.interceptors == [x402_extension_interceptor]
+
+    def test_grpc_calls_carry_extension_metadata(self) -> None:
+        transport, stub = _grpc_transport()
+
+        assert install_extensions_interceptor(transport)
+        request = MagicMock()
+        transport.stub.SendStreamingMessage(request, metadata=(("k", "v"),))
+
+        stub.SendStreamingMessage.assert_called_once_with(
+            request,
+            metadata=(("k", "v"), (HTTP_EXTENSION_HEADER.lower(), X402_EXTENSION_URI)),
+        )
+
+    def test_grpc_stub_is_wrapped_once(self) -> None:
+        transport, stub = _grpc_transport()
+
+        install_extensions_interceptor(transport)
+        install_extensions_interceptor(transport)
+        transport.stub.SendMessage(MagicMock())
+
+        metadata = stub.SendMessage.call_args.kwargs["metadata"]
+        assert len(metadata) == 1
+
+    def test_unsupported_transport(self) -> None:
+        assert not install_extensions_interceptor(MagicMock())
+
+
+@pytest.mark.asyncio
+class TestExtensionsInterceptor:
+    """Test the HTTP extension header."""
+
+    async def test_extension_is_not_repeated(self) -> None:
+        _payload, http_kwargs = await x402_extension_interceptor.intercept(
+            "message/send",
+            {},
+            {"headers": {HTTP_EXTENSION_HEADER: f"{X402_EXTENSION_URI}, other"}},
+            None,
+            None,
+        )
+
+        assert http_kwargs["headers"][HTTP_EXTENSION_HEADER] == (
+            f"{X402_EXTENSION_URI}, other"
+        )
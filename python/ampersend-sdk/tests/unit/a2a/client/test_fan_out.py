@@ -0,0 +1,205 @@
+"""Unit tests for fan_out."""
+
+import asyncio
+from typing import Any, AsyncIterator, List
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from a2a.client.client import ClientConfig
+from a2a.types import AgentCard, Message, TaskIdParams, TaskState
+from ampersend_sdk.a2a.client import FanOutEvent, X402ClientFactory
+from ampersend_sdk.a2a.client.fan_out import fan_out
+from ampersend_sdk.x402.treasurer import X402Authorization, X402Treasurer
+
+
+def _task(task_id: str, state: TaskState) -> MagicMock:
+    task = MagicMock(id=task_id)
+    task.status.state = state
+    return task
+
+
+class FakeSeller:
+    """Client streaming scripted events, with a delay before each one."""
+
+    def __init__(self, name: str, events: List[Any], delay: float) -> None:
+        self.card = MagicMock(url=f"https://{name}.example")
+        self._events = events
+        self._delay = delay
+        self.cancelled = False
+        self.cancel_task = AsyncMock()
+
+    async def send_message(self, request: Message, **kwargs: Any) -> AsyncIterator[Any]:
+        try:
+            for event in self._events:
+                await asyncio.sleep(self._delay)
+                yield event
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+async def _collect(sellers: List[FakeSeller], **kwargs: Any) -> List[FanOutEvent]:
+    request = Message(message_id="m-1", role="user", parts=[])  # type: ignore[arg-type]
+    return [
+        event
+        async for event in fan_out(
+            [(seller.card, seller) for seller in sellers],  # type: ignore[misc]
+            request,
+            **kwargs,
+        )
+    ]
+
+
+@pytest.mark.asyncio
+class TestFanOut:
+    """Test merging, winner selection and cancellation."""
+
+    async def test_first_answer_wins_and_losers_are_cancelled(self) -> None:
+        fast = FakeSeller(
+            "fast",
+            [
+                (_task("t-fast", TaskState.working), None),
+                (_task("t-fast", TaskState.completed), None),
+            ],
+            delay=0.01,
+        )
+        slow = FakeSeller(
+            "slow",
+            [
+                (_task("t-slow", TaskState.working), None),
+                (_task("t-slow", TaskState.completed), None),
+            ],
+            delay=0.015,
+        )
+        on_winner = MagicMock()
+
+        events = await _collect([fast, slow], on_winner=on_winner)
+
+        assert [(e.card, e.event[0].id) for e in events] == [  # type: ignore[index]
+            (fast.card, "t-fast"),
+            (slow.card, "t-slow"),
+            (fast.card, "t-fast"),
+        ]
+        on_winner.assert_called_once_with()
+        assert slow.cancelled
+        slow.cancel_task.assert_awaited_once_with(TaskIdParams(id="t-slow"))
+        fast.cancel_task.assert_not_awaited()
+
+    async def test_failing_seller_is_left_out(self) -> None:
+        class BrokenSeller(FakeSeller):
+            async def send_message(
+                self, request: Message, **kwargs: Any
+            ) -> AsyncIterator[Any]:
+                raise RuntimeError("unreachable")
+                yield
+
+        answer = Message(message_id="reply", role="agent", parts=[])  # type: ignore[arg-type]
+        ok = FakeSeller("ok", [answer], delay=0.01)
+
+        events = await _collect([BrokenSeller("broken", [], 0), ok])
+
+        assert [event.event for event in events] == [answer]
+
+    async def test_custom_winner(self) -> None:
+        seller = FakeSeller(
+            "seller",
+            [
+                (_task("t-1", TaskState.working), None),
+                (_task("t-1", TaskState.completed), None),
+            ],
+            delay=0,
+        )
+        on_winner = MagicMock()
+
+        await _collect(
+            [seller],
+            winner=lambda event: event[0].status.state == TaskState.working,
+            on_winner=on_winner,
+        )
+
+        on_winner.assert_called_once()
+
+
+class PayingSeller(FakeSeller):
+    """Seller asking for payment, completing only once paid."""
+
+    def __init__(
+        self, name: str, delay: float, treasurer: X402Treasurer, pays: bool = True
+    ) -> None:
+        super().__init__(name, [], delay)
+        self.treasurer = treasurer
+        self.pays = pays
+        self.close = AsyncMock()
+
+    async def send_message(self, request: Message, **kwargs: Any) -> AsyncIterator[Any]:
+        task_id = f"t-{self.card.url}"
+        await asyncio.sleep(self._delay)
+        authorization = (
+            await self.treasurer.onPaymentRequired(payment_required=MagicMock())
+            if self.pays
+            else True
+        )
+        if authorization is None:
+            yield (_task(task_id, TaskState.input_required), None)
+            return
+        await asyncio.sleep(self._delay)
+        yield (_task(task_id, TaskState.completed), None)
+
+
+@pytest.mark.asyncio
+class TestX402ClientFactoryFanOut:
+    """Test that a fan-out pays a single seller."""
+
+    async def test_losing_sellers_are_never_authorized(self) -> None:
+        treasurer = MagicMock(spec=X402Treasurer)
+        treasurer.onPaymentRequired = AsyncMock(
+            return_value=X402Authorization(payment=MagicMock(), authorization_id="a-1")
+        )
+        factory = X402ClientFactory(treasurer=treasurer, config=ClientConfig())
+        # first is paid at 10ms, free answers at 16ms, first answers at 20ms
+        delays = {"first": 0.01, "second": 0.012, "free": 0.008}
+
+        def create(card: AgentCard, seller_treasurer: X402Treasurer) -> PayingSeller:
+            return PayingSeller(
+                card.name,
+                delays[card.name],
+                seller_treasurer,
+                pays=card.name != "free",
+            )
+
+        cards = [MagicMock(spec=AgentCard) for _ in delays]
+        for card, name in zip(cards, delays):
+            card.name = name
+        request = Message(message_id="m-1", role="user", parts=[])  # type: ignore[arg-type]
+        with patch.object(factory, "_create", side_effect=create):
+            events = [event async for event in factory.fan_out(cards, request)]
+
+        treasurer.onPaymentRequired.assert_awaited_once()
+        # The free seller answered first, but the answer is the paid one's
+        assert events[-1].card.name == "first"
+        assert events[-1].event[0].status.state == TaskState.completed  # type: ignore[index]
+
+    async def test_failed_authorization_lets_another_seller_be_paid(self) -> None:
+        treasurer = MagicMock(spec=X402Treasurer)
+        treasurer.onPaymentRequired = AsyncMock(
+            side_effect=[
+                RuntimeError("treasurer down"),
+                X402Authorization(payment=MagicMock(), authorization_id="a-1"),
+            ]
+        )
+        factory = X402ClientFactory(treasurer=treasurer, config=ClientConfig())
+        delays = {"first": 0.01, "second": 0.02}
+
+        def create(card: AgentCard, seller_treasurer: X402Treasurer) -> PayingSeller:
+            return PayingSeller(card.name, delays[card.name], seller_treasurer)
+
+        cards = [MagicMock(spec=AgentCard) for _ in delays]
+        for card, name in zip(cards, delays):
+            card.name = name
+        request = Message(message_id="m-1", role="user", parts=[])  # type: ignore[arg-type]
+        with patch.object(factory, "_create", side_effect=create):
+            events = [event async for event in factory.fan_out(cards, request)]
+
+        assert treasurer.onPaymentRequired.await_count == 2
+        assert events[-1].card.name == "second"
+        assert events[-1].event[0].status.state == TaskState.completed  # type: ignore[index]
@@ -0,0 +1,95 @@
+"""Unit tests for PaymentRequirementsCache."""
+
+from unittest.mock import MagicMock, patch
+
+from a2a.client import ClientCallContext
+from a2a.types import AgentCapabilities, AgentCard, AgentSkill
+from ampersend_sdk.a2a.client import PaymentRequirementsCache, requirements_cache_key
+
+
+def _card(*skill_ids: str) -> AgentCard:
+    return AgentCard(
+        name="agent",
+        description="agent",
+        url="https://agent.example",
+        version="1.0.0",
+        capabilities=AgentCapabilities(),
+        default_input_modes=["text"],
+        default_output_modes=["text"],
+        skills=[
+            AgentSkill(id=skill_id, name=skill_id, description=skill_id, tags=[])
+            for skill_id in skill_ids
+        ],
+    )
+
+
+class TestRequirementsCacheKey:
+    """Test cache keys per agent and skill."""
+
+    def test_single_skill_is_default(self) -> None:
+        assert requirements_cache_key(_card("search")) == (
+            "https://agent.example",
+            "search",
+        )
+
+    def test_skill_from_context(self) -> None:
+        context = ClientCallContext(state={"skill_id": "summarize"})
+
+        key = requirements_cache_key(_card("search", "summarize"), context)
+
+        assert key == ("https://agent.example", "summarize")
+
+    def test_no_skill_when_ambiguous(self) -> None:
+        assert requirements_cache_key(_card("search", "summarize")) == (
+            "https://agent.example",
+            None,
+        )
+
+
+class TestPaymentRequirementsCache:
+    """Test TTL and capacity."""
+
+    def test_put_and_get(self) -> None:
+        cache = PaymentRequirementsCache()
+        payment_required = MagicMock()
+
+        cache.put(("a", None), payment_required)
+
+        assert cache.get(("a", None)) is payment_required
+        assert cache.get(("b", None)) is None
+
+    def test_entries_expire(self) -> None:
+        cache = PaymentRequirementsCache(ttl=10)
+        with patch("time.monotonic", return_value=100.0):
+            cache.put(("a", None), MagicMock())
+        with patch("time.monotonic", return_value=110.0):
+            assert cache.get(("a", None)) is None
+
+    def test_least_recently_used_is_evicted(self) -> None:
+        cache = PaymentRequirementsCache(max_entries=2)
+        cache.put(("a", None), MagicMock())
+        cache.put(("b", None), MagicMock())
+        cache.get(("a", None))
+        cache.put(("c", None), MagicMock())
+
+        assert cache.get(("a", None)) is not None
+        assert cache.get(("b", None)) is None
+
+    def test_invalidate(self) -> None:
+        cache = PaymentRequirementsCache()
+        cache.put(("a", None), MagicMock())
+
+        cache.invalidate(("a", None))
+
+        assert cache.get(("a", None)) is None
+
+    def test_unsupported_key_is_not_cached_until_retry(self) -> None:
+        cache = PaymentRequirementsCache(unsupported_ttl=60)
+        with patch("time.monotonic", return_value=100.0):
+            cache.put(("a", None), MagicMock())
+            cache.mark_unsupported(("a", None))
+            cache.put(("a", None), MagicMock())
+            assert cache.get(("a", None)) is None
+        with patch("time.monotonic", return_value=161.0):
+            cache.put(("a", None), MagicMock())
+            assert cache.get(("a", None)) is not None
@@ -0,0 +1,118 @@
+"""Unit tests for StatusDispatcher."""
+
+import asyncio
+from typing import Any, List, Tuple
+from unittest.mock import MagicMock
+
+import pytest
+from ampersend_sdk.a2a.client import StatusDispatcher
+from ampersend_sdk.x402 import X402Authorization, X402Treasurer
+from x402_a2a.types import PaymentStatus
+
+
+def _authorization(authorization_id: str) -> X402Authorization:
+    return X402Authorization(payment=MagicMock(), authorization_id=authorization_id)
+
+
+class RecordingTreasurer(MagicMock):
+    """Treasurer whose onStatus blocks until released."""
+
+    def __init__(self) -> None:
+        super().__init__(spec=X402Treasurer)
+        self.release = asyncio.Event()
+        self.received: List[Tuple[str, Any]] = []
+
+        async def on_status(
+            status: PaymentStatus, authorization: X402Authorization, context: Any
+        ) -> None:
+            await self.release.wait()
+            self.received.append((authorization.authorization_id, status))
+
+        self.onStatus = on_status
+
+
+@pytest.mark.asyncio
+class TestStatusDispatcher:
+    """Test StatusDispatcher."""
+
+    async def test_dispatch_does_not_wait_for_treasurer(self) -> None:
+        treasurer = RecordingTreasurer()
+        dispatcher = StatusDispatcher(treasurer)
+
+        dispatcher.dispatch(PaymentStatus.PAYMENT_SUBMITTED, _authorization("a"))
+
+        assert dispatcher.pending == 1
+        assert treasurer.received == []
+        treasurer.release.set()
+        await dispatcher.drain()
+        assert treasurer.received == [("a", PaymentStatus.PAYMENT_SUBMITTED)]
+        assert dispatcher.stats.delivered == 1
+
+    async def test_preserves_order_per_authorization(self) -> None:
+        treasurer = RecordingTreasurer()
+        dispatcher = StatusDispatcher(treasurer)
+        statuses = [
+            PaymentStatus.PAYMENT_SUBMITTED,
+            PaymentStatus.PAYMENT_VERIFIED,
+            PaymentStatus.PAYMENT_COMPLETED,
+        ]
+
+        for status in statuses:
+            dispatcher.dispatch(status, _authorization("a"))
+            dispatcher.dispatch(status, _authorization("b"))
+        treasurer.release.set()
+        await dispatcher.drain()
+
+        for key in ("a", "b"):
+            assert [s for k, s in treasurer.received if k == key] == statuses
+        assert dispatcher.pending == 0
+
+    async def test_drops_updates_beyond_max_pending(self) -> None:
+        treasurer = RecordingTreasurer()
+        dispatcher = StatusDispatcher(treasurer, max_pending=2)
+
+        for i in range(5):
+            dispatcher.dispatch(PaymentStatus.PAYMENT_SUBMITTED, _authorization(str(i)))
+
+        assert dispatcher.stats.dispatched == 2
+        assert dispatcher.stats.dropped == 3
+
+    async def test_failures_are_counted(self) -> None:
+        treasurer = MagicMock(spec=X402Treasurer)
+
+        async def on_status(**kwargs: Any) -> None:
+            raise RuntimeError("API down")
+
+        treasurer.onStatus = on_status
+        dispatcher = StatusDispatcher(treasurer)
+
+        dispatcher.dispatch(PaymentStatus.PAYMENT_SUBMITTED, _authorization("a"))
+        dispatcher.dispatch(PaymentStatus.PAYMENT_COMPLETED, _authorization("a"))
+        await dispatcher.drain()
+
+        assert dispatcher.stats.failed == 2
+        assert dispatcher.pending == 0
+
+    async def test_close_drains_then_rejects(self) -> None:
+        treasurer = RecordingTreasurer()
+        treasurer.release.set()
+        dispatcher = StatusDispatcher(treasurer)
+        dispatcher.dispatch(PaymentStatus.PAYMENT_SUBMITTED, _authorization("a"))
+
+        await dispatcher.close()
+        dispatcher.dispatch(PaymentStatus.PAYMENT_COMPLETED, _authorization("a"))
+
+        assert treasurer.received == [("a", PaymentStatus.PAYMENT_SUBMITTED)]
+        assert dispatcher.stats.dropped == 1
+
+    async def test_close_times_out_and_counts_dropped(self) -> None:
+        treasurer = RecordingTreasurer()
+        dispatcher = StatusDispatcher(treasurer)
+        dispatcher.dispatch(PaymentStatus.PAYMENT_SUBMITTED, _authorization("a"))
+        dispatcher.dispatch(PaymentStatus.PAYMENT_COMPLETED, _authorization("a"))
+
+        await dispatcher.close(timeout=0.01)
+
+        assert treasurer.received == []
+        assert dispatcher.stats.dropped == 2
+        assert dispatcher.pending == 0
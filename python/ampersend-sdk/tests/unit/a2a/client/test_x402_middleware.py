@@ -0,0 +1,525 @@
+"""Unit tests for x402_middleware."""
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, List
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from a2a.client import ClientCallContext, ClientEvent
+from a2a.types import (
+    Message,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+)
+from ampersend_sdk.a2a.client import (
+    InMemoryAuthorizationStore,
+    PaymentRequirementsCache,
+    StatusDispatcher,
+)
+from ampersend_sdk.a2a.client.x402_middleware import x402_middleware
+from ampersend_sdk.x402 import X402Authorization, X402Treasurer
+from x402_a2a.types import PaymentStatus
+
+
+def _task(state: TaskState, payment_status: PaymentStatus | None) -> MagicMock:
+    task = MagicMock(id="task-1", context_id="context-1")
+    task.status.state = state
+    task.payment_status = payment_status
+    return task
+
+
+def _status_event(task: MagicMock) -> TaskStatusUpdateEvent:
+    return TaskStatusUpdateEvent(
+        task_id=task.id,
+        context_id=task.context_id,
+        status=TaskStatus(state=task.status.state),
+        final=False,
+    )
+
+
+class FakeAgent:
+    """Serves one scripted stream per request and records stream closing."""
+
+    def __init__(self, streams: List[List[Any]]) -> None:
+        self._streams = streams
+        self.requests: List[Message] = []
+        self.consumed: List[int] = []
+        self.closed: List[int] = []
+
+    def __call__(
+        self, request: Message, *, context: ClientCallContext | None = None
+    ) -> AsyncIterator[ClientEvent | Message]:
+        index = len(self.requests)
+        self.requests.append(request)
+        return self._stream(index)
+
+    async def _stream(self, index: int) -> AsyncIterator[Any]:
+        self.consumed.append(0)
+        try:
+            for event in self._streams[index]:
+                self.consumed[index] += 1
+                yield event
+        finally:
+            self.closed.append(index)
+
+
+def _utils() -> MagicMock:
+    utils = MagicMock()
+    utils.get_payment_status.side_effect = lambda task: task.payment_status
+    utils.get_payment_requirements.return_value = MagicMock(name="PaymentRequired")
+    return utils
+
+
+def _authorization() -> X402Authorization:
+    payment = MagicMock()
+    payment.payload.authorization.valid_before = str(int(time.time()) + 3600)
+    return X402Authorization(payment=payment, authorization_id="auth-1")
+
+
+def _treasurer(authorize: bool = True) -> MagicMock:
+    treasurer = MagicMock(spec=X402Treasurer)
+    treasurer.onPaymentRequired = AsyncMock(
+        return_value=_authorization() if authorize else None
+    )
+    treasurer.onStatus = AsyncMock()
+    return treasurer
+
+
+_CACHE_KEY = ("https://agent.example", "skill")
+
+
+async def _run(
+    treasurer: MagicMock,
+    agent: FakeAgent,
+    utils: MagicMock,
+    dispatcher: StatusDispatcher | None = None,
+    store: InMemoryAuthorizationStore | None = None,
+    requirements_cache: PaymentRequirementsCache | None = None,
+    max_payment_rounds: int = 1,
+) -> List[ClientEvent | Message]:
+    submission = Message(
+        message_id="m-2",
+        role="user",  # type: ignore[arg-type]
+        parts=[],
+        metadata={"x402.payment.status": "payment-submitted"},
+    )
+    with patch(
+        "ampersend_sdk.a2a.client.x402_middleware.create_payment_submission_message",
+        return_value=submission,
+    ):
+        return [
+            event
+            async for event in x402_middleware(
+                treasurer=treasurer,
+                send_message=agent,
+                request=Message(message_id="m-1", role="user", parts=[]),  # type: ignore[arg-type]
+                utils=utils,
+                dispatcher=dispatcher,
+                store=store,
+                requirements_cache=requirements_cache,
+                cache_key=_CACHE_KEY,
+                max_payment_rounds=max_payment_rounds,
+            )
+        ]
+
+
+def _statuses(treasurer: MagicMock) -> List[PaymentStatus]:
+    return [call.kwargs["status"] for call in treasurer.onStatus.await_args_list]
+
+
+@pytest.mark.asyncio
+class TestX402MiddlewareStreaming:
+    """Test payment handling on streamed responses."""
+
+    async def test_pays_mid_stream_and_streams_resumed_task(self) -> None:
+        working = _task(TaskState.working, None)
+        required = _task(TaskState.input_required, PaymentStatus.PAYMENT_REQUIRED)
+        submitted = _task(TaskState.working, PaymentStatus.PAYMENT_SUBMITTED)
+        completed = _task(TaskState.completed, PaymentStatus.PAYMENT_COMPLETED)
+        artifact = MagicMock(name="TaskArtifactUpdateEvent")
+
+        agent = FakeAgent(
+            [
+                [
+                    (working, _status_event(working)),
+                    (required, _status_event(required)),
+                    (required, artifact),
+                ],
+                [
+                    (submitted, _status_event(submitted)),
+                    (submitted, artifact),
+                    (submitted, artifact),
+                    (completed, _status_event(completed)),
+                ],
+            ]
+        )
+        treasurer = _treasurer()
+
+        events = await _run(treasurer, agent, _utils())
+
+        # The payment-required stream is closed as soon as payment is made
+        assert agent.consumed[0] == 2
+        assert agent.closed == [0, 1]
+        assert agent.requests[1].context_id == "context-1"
+        assert [event[0] for event in events] == [  # type: ignore[index]
+            working,
+            submitted,
+            submitted,
+            submitted,
+            completed,
+        ]
+        # Artifact chunks do not repeat status updates
+        assert _statuses(treasurer) == [
+            PaymentStatus.PAYMENT_SUBMITTED,
+            PaymentStatus.PAYMENT_COMPLETED,
+        ]
+        treasurer.onPaymentRequired.assert_awaited_once()
+
+    async def test_artifact_chunks_do_not_trigger_payment(self) -> None:
+        required = _task(TaskState.input_required, PaymentStatus.PAYMENT_REQUIRED)
+        agent = FakeAgent([[(required, MagicMock(name="TaskArtifactUpdateEvent"))]])
+        treasurer = _treasurer()
+
+        events = await _run(treasurer, agent, _utils())
+
+        assert len(events) == 1
+        treasurer.onPaymentRequired.assert_not_awaited()
+
+    async def test_rejected_payment_is_relayed(self) -> None:
+        required = _task(TaskState.input_required, PaymentStatus.PAYMENT_REQUIRED)
+        agent = FakeAgent([[(required, _status_event(required))]])
+
+        events = await _run(_treasurer(authorize=False), agent, _utils())
+
+        assert [event[0] for event in events] == [required]  # type: ignore[index]
+        assert len(agent.requests) == 1
+
+
+@pytest.mark.asyncio
+class TestX402MiddlewareBlocking:
+    """Test payment handling on blocking responses."""
+
+    async def test_pays_and_resubmits(self) -> None:
+        required = _task(TaskState.input_required, PaymentStatus.PAYMENT_REQUIRED)
+        completed = _task(TaskState.completed, PaymentStatus.PAYMENT_COMPLETED)
+        agent = FakeAgent([[(required, None)], [(completed, None)]])
+        treasurer = _treasurer()
+
+        events = await _run(treasurer, agent, _utils())
+
+        assert events == [(completed, None)]
+        assert _statuses(treasurer) == [PaymentStatus.PAYMENT_COMPLETED]
+
+    async def test_messages_pass_through(self) -> None:
+        message = Message(message_id="reply", role="agent", parts=[])  # type: ignore[arg-type]
+        agent = FakeAgent([[message]])
+
+        events = await _run(_treasurer(), agent, _utils())
+
+        assert events == [message]
+
+
+@pytest.mark.asyncio
+class TestX402MiddlewarePaymentRounds:
+    """Test tasks asking for payment more than once."""
+
+    async def test_pays_each_step_up_to_max_rounds(self) -> None:
+        required = _task(TaskState.input_required, PaymentStatus.PAYMENT_REQUIRED)
+        completed = _task(TaskState.completed, PaymentStatus.PAYMENT_COMPLETED)
+        agent = FakeAgent([[(required, None)], [(required, None)], [(completed, None)]])
+        treasurer = _treasurer()
+
+        events = await _run(treasurer, agent, _utils(), max_payment_rounds=2)
+
+        assert treasurer.onPaymentRequired.await_count == 2
+        assert len(agent.requests) == 3
+        assert events == [(completed, None)]
+
+    async def test_payment_required_beyond_max_rounds_is_relayed(self) -> None:
+        required = _task(TaskState.input_required, PaymentStatus.PAYMENT_REQUIRED)
+        agent = FakeAgent([[(required, None)], [(required, None)]])
+        treasurer = _treasurer()
+
+        events = await _run(treasurer, agent, _utils())
+
+        treasurer.onPaymentRequired.assert_awaited_once()
+        assert len(agent.requests) == 2
+        assert events == [(required, None)]
+
+    async def test_used_stored_payment_is_not_resubmitted(self) -> None:
+        required = _task(TaskState.input_required, PaymentStatus.PAYMENT_REQUIRED)
+        agent = FakeAgent([[(required, None)], [(required, None)], []])
+        treasurer = _treasurer()
+        treasurer.onPaymentRequired.side_effect = [
+            X402Authorization(payment=_authorization().payment, authorization_id=i)
+            for i in ("auth-1", "auth-2")
+        ]
+        store = InMemoryAuthorizationStore()
+
+        await _run(treasurer, agent, _utils(), store=store, max_payment_rounds=2)
+
+        # The second step is paid anew rather than with the first payment
+        assert treasurer.onPaymentRequired.await_count == 2
+        stored = await store.get("task-1", "context-1")
+        assert stored is not None and stored.authorization_id == "auth-2"
+
+
+@pytest.mark.asyncio
+class TestX402MiddlewareDispatcher:
+    """Test background status delivery."""
+
+    async def test_responses_do_not_wait_for_onStatus(self) -> None:
+        required = _task(TaskState.input_required, PaymentStatus.PAYMENT_REQUIRED)
+        completed = _task(TaskState.completed, PaymentStatus.PAYMENT_COMPLETED)
+        agent = FakeAgent([[(required, None)], [(completed, None)]])
+        treasurer = _treasurer()
+        release = asyncio.Event()
+
+        async def on_status(**kwargs: Any) -> None:
+            await release.wait()
+
+        treasurer.onStatus = AsyncMock(side_effect=on_status)
+        dispatcher = StatusDispatcher(treasurer)
+
+        events = await asyncio.wait_for(
+            _run(treasurer, agent, _utils(), dispatcher), 1.0
+        )
+
+        assert events == [(completed, None)]
+        assert dispatcher.pending == 1
+        release.set()
+        await dispatcher.close()
+        assert _statuses(treasurer) == [PaymentStatus.PAYMENT_COMPLETED]
+
+
+@pytest.mark.asyncio
+class TestX402MiddlewareAuthorizationStore:
+    """Test reuse of stored authorizations."""
+
+    async def test_stored_payment_is_resubmitted(self) -> None:
+        required = _task(TaskState.input_required, PaymentStatus.PAYMENT_REQUIRED)
+        completed = _task(TaskState.completed, PaymentStatus.PAYMENT_COMPLETED)
+        agent = FakeAgent([[(required, None)], [(completed, None)]])
+        treasurer = _treasurer()
+        store = InMemoryAuthorizationStore()
+        stored = _authorization()
+        await store.put("task-1", "context-1", stored)
+
+        with patch(
+            "ampersend_sdk.a2a.client.x402_middleware.create_payment_submission_message",
+        ) as submission:
+            events = [
+                event
+                async for event in x402_middleware(
+                    treasurer=treasurer,
+                    send_message=agent,
+                    request=Message(message_id="m-1", role="user", parts=[]),  # type: ignore[arg-type]
+                    utils=_utils(),
+                    store=store,
+                )
+            ]
+
+        treasurer.onPaymentRequired.assert_not_awaited()
+        submission.assert_called_once_with(
+            task_id="task-1", payment_payload=stored.payment
+        )
+        assert events == [(completed, None)]
+        # Forgotten once the payment completed
+        assert await store.get("task-1", "context-1") is None
+
+    async def test_payment_is_stored_before_submission(self) -> None:
+        required = _task(TaskState.input_required, PaymentStatus.PAYMENT_REQUIRED)
+        store = InMemoryAuthorizationStore()
+        treasurer = _treasurer()
+        stored_at_submission: List[Any] = []
+
+        class Agent(FakeAgent):
+            def __call__(self, request: Message, **kwargs: Any) -> Any:
+                if self.requests:
+                    stored_at_submission.append(
+                        store._entries.get(("task-1", "context-1"))
+                    )
+                return super().__call__(request, **kwargs)
+
+        agent = Agent([[(required, None)], []])
+
+        await _run(treasurer, agent, _utils(), store=store)
+
+        assert stored_at_submission == [treasurer.onPaymentRequired.return_value]
+
+    async def test_status_of_earlier_payment_reaches_treasurer(self) -> None:
+        completed = _task(TaskState.completed, PaymentStatus.PAYMENT_COMPLETED)
+        agent = FakeAgent([[(completed, None)]])
+        treasurer = _treasurer()
+        store = InMemoryAuthorizationStore()
+        await store.put("task-1", "context-1", _authorization())
+
+        await _run(treasurer, agent, _utils(), store=store)
+
+        assert _statuses(treasurer) == [PaymentStatus.PAYMENT_COMPLETED]
+
+
+@pytest.mark.asyncio
+class TestX402MiddlewarePreflight:
+    """Test paying up front with cached requirements."""
+
+    async def test_requirements_are_cached(self) -> None:
+        required = _task(TaskState.input_required, PaymentStatus.PAYMENT_REQUIRED)
+        completed = _task(TaskState.completed, PaymentStatus.PAYMENT_COMPLETED)
+        agent = FakeAgent([[(required, None)], [(completed, None)]])
+        utils = _utils()
+        cache = PaymentRequirementsCache()
+
+        await _run(_treasurer(), agent, utils, requirements_cache=cache)
+
+        assert cache.get(_CACHE_KEY) is utils.get_payment_requirements.return_value
+        assert agent.requests[0].metadata is None
+
+    async def test_payment_is_attached_to_first_message(self) -> None:
+        completed = _task(TaskState.completed, PaymentStatus.PAYMENT_COMPLETED)
+        agent = FakeAgent([[(completed, None)]])
+        treasurer = _treasurer()
+        cache = PaymentRequirementsCache()
+        cached = MagicMock(name="PaymentRequired")
+        cache.put(_CACHE_KEY, cached)
+
+        events = await _run(treasurer, agent, _utils(), requirements_cache=cache)
+
+        treasurer.onPaymentRequired.assert_awaited_once_with(payment_required=cached)
+        assert len(agent.requests) == 1
+        assert agent.requests[0].message_id == "m-1"
+        assert agent.requests[0].metadata == {
+            "x402.payment.status": "payment-submitted"
+        }
+        assert events == [(completed, None)]
+        assert _statuses(treasurer) == [PaymentStatus.PAYMENT_COMPLETED]
+
+    async def test_preflight_counts_as_a_payment_round(self) -> None:
+        verified = _task(TaskState.working, PaymentStatus.PAYMENT_VERIFIED)
+        required = _task(TaskState.input_required, PaymentStatus.PAYMENT_REQUIRED)
+        agent = FakeAgent([[(verified, None), (required, None)]])
+        treasurer = _treasurer()
+        cache = PaymentRequirementsCache()
+        cache.put(_CACHE_KEY, MagicMock(name="Cached"))
+
+        events = await _run(
+            treasurer, agent, _utils(), requirements_cache=cache, max_payment_rounds=1
+        )
+
+        treasurer.onPaymentRequired.assert_awaited_once()
+        assert len(agent.requests) == 1
+        assert events == [(verified, None), (required, None)]
+
+    async def test_ignored_preflight_falls_back_to_regular_flow(self) -> None:
+        required = _task(TaskState.input_required, PaymentStatus.PAYMENT_REQUIRED)
+        completed = _task(TaskState.completed, PaymentStatus.PAYMENT_COMPLETED)
+        agent = FakeAgent([[(required, None)], [(completed, None)]])
+        treasurer = _treasurer()
+        utils = _utils()
+        cache = PaymentRequirementsCache()
+        cache.put(_CACHE_KEY, MagicMock(name="Stale"))
+
+        events = await _run(treasurer, agent, utils, requirements_cache=cache)
+
+        assert treasurer.onPaymentRequired.await_count == 2
+        assert events == [(completed, None)]
+        # The unused preflight payment is reported as failed
+        assert _statuses(treasurer) == [
+            PaymentStatus.PAYMENT_FAILED,
+            PaymentStatus.PAYMENT_COMPLETED,
+        ]
+        # The seller does not support preflight, later calls skip it
+        assert cache.get(_CACHE_KEY) is None
+        utils.get_payment_requirements.assert_called_once()
+
+    async def test_rejected_preflight_is_retried_without_payment(self) -> None:
+        rejected = _task(TaskState.failed, PaymentStatus.PAYMENT_REJECTED)
+        required = _task(TaskState.input_required, PaymentStatus.PAYMENT_REQUIRED)
+        completed = _task(TaskState.completed, PaymentStatus.PAYMENT_COMPLETED)
+        agent = FakeAgent([[(rejected, None)], [(required, None)], [(completed, None)]])
+        treasurer = _treasurer()
+        cache = PaymentRequirementsCache()
+        cache.put(_CACHE_KEY, MagicMock(name="Cached"))
+
+        events = await _run(treasurer, agent, _utils(), requirements_cache=cache)
+
+        assert events == [(completed, None)]
+        retry = agent.requests[1]
+        assert retry.metadata is None
+        assert retry.message_id != "m-1"
+        assert _statuses(treasurer) == [
+            PaymentStatus.PAYMENT_REJECTED,
+            PaymentStatus.PAYMENT_COMPLETED,
+        ]
+
+    async def test_failed_paid_task_is_not_retried(self) -> None:
+        failed = _task(TaskState.failed, PaymentStatus.PAYMENT_COMPLETED)
+        agent = FakeAgent([[(failed, None)], [(failed, None)]])
+        treasurer = _treasurer()
+        cache = PaymentRequirementsCache()
+        cache.put(_CACHE_KEY, MagicMock(name="Cached"))
+
+        events = await _run(treasurer, agent, _utils(), requirements_cache=cache)
+
+        assert events == [(failed, None)]
+        assert len(agent.requests) == 1
+        assert _statuses(treasurer) == [PaymentStatus.PAYMENT_COMPLETED]
+        assert cache.get(_CACHE_KEY) is not None
+
+    async def test_preflight_payment_is_stored(self) -> None:
+        verified = _task(TaskState.working, PaymentStatus.PAYMENT_VERIFIED)
+        agent = FakeAgent([[(verified, None)]])
+        store = InMemoryAuthorizationStore()
+        cache = PaymentRequirementsCache()
+        cache.put(_CACHE_KEY, MagicMock(name="Cached"))
+
+        await _run(_treasurer(), agent, _utils(), store=store, requirements_cache=cache)
+
+        stored = await store.get("task-1", "context-1")
+        assert stored is not None and stored.authorization_id == "auth-1"
+
+    async def test_refused_preflight_is_removed_from_store(self) -> None:
+        rejected = _task(TaskState.failed, PaymentStatus.PAYMENT_REJECTED)
+        required = _task(TaskState.input_required, PaymentStatus.PAYMENT_REQUIRED)
+        agent = FakeAgent([[(rejected, None)], [(required, None)]])
+        treasurer = _treasurer(authorize=False)
+        treasurer.onPaymentRequired.side_effect = [_authorization(), None]
+        store = InMemoryAuthorizationStore()
+        cache = PaymentRequirementsCache()
+        cache.put(_CACHE_KEY, MagicMock(name="Cached"))
+
+        await _run(treasurer, agent, _utils(), store=store, requirements_cache=cache)
+
+        assert await store.get("task-1", "context-1") is None
+        assert len(agent.requests) == 2
+
+    async def test_no_preflight_for_existing_task(self) -> None:
+        completed = _task(TaskState.completed, None)
+        agent = FakeAgent([[(completed, None)]])
+        treasurer = _treasurer()
+        cache = PaymentRequirementsCache()
+        cache.put(_CACHE_KEY, MagicMock(name="Cached"))
+
+        with patch(
+            "ampersend_sdk.a2a.client.x402_middleware.create_payment_submission_message",
+        ):
+            [
+                event
+                async for event in x402_middleware(
+                    treasurer=treasurer,
+                    send_message=agent,
+                    request=Message(
+                        message_id="m-1",
+                        role="user",  # type: ignore[arg-type]
+                        parts=[],
+                        task_id="task-1",
+                    ),
+                    utils=_utils(),
+                    requirements_cache=cache,
+                    cache_key=_CACHE_KEY,
+                )
+            ]
+
+        treasurer.onPaymentRequired.assert_not_awaited()
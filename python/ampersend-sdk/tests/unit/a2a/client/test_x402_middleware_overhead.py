@@ -0,0 +1,138 @@
+"""Micro-benchmark of x402_middleware's per-event overhead."""
+
+import logging
+import time
+from typing import Any, AsyncIterator
+from unittest.mock import MagicMock
+
+import pytest
+from a2a.client.base_client import BaseClient
+from a2a.client.client import ClientConfig
+from a2a.types import (
+    AgentCapabilities,
+    AgentCard,
+    Artifact,
+    Message,
+    Part,
+    Task,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from ampersend_sdk.a2a.client.x402_middleware import x402_middleware
+from ampersend_sdk.x402 import X402Treasurer
+
+logger = logging.getLogger(__name__)
+
+EVENTS = 2000
+REPEATS = 5
+
+
+class StreamingTransport:
+    """Transport streaming a task, then artifact chunks and status updates."""
+
+    async def send_message_streaming(
+        self, params: Any, *, context: Any = None
+    ) -> AsyncIterator[Any]:
+        yield Task(
+            id="task-1",
+            context_id="context-1",
+            status=TaskStatus(state=TaskState.working),
+        )
+        for i in range(EVENTS):
+            if i % 100 == 0:
+                yield TaskStatusUpdateEvent(
+                    task_id="task-1",
+                    context_id="context-1",
+                    status=TaskStatus(state=TaskState.working),
+                    final=False,
+                )
+            else:
+                yield TaskArtifactUpdateEvent(
+                    task_id="task-1",
+                    context_id="context-1",
+                    artifact=Artifact(
+                        artifact_id=f"chunk-{i}",
+                        parts=[Part(root=TextPart(text="chunk"))],
+                    ),
+                )
+
+
+class NoPaymentUtils:
+    """x402Utils stand-in for tasks that never ask for payment."""
+
+    def get_payment_status(self, task: Task) -> None:
+        return None
+
+
+def _client() -> BaseClient:
+    card = AgentCard(
+        name="agent",
+        description="agent",
+        url="https://agent.example",
+        version="1.0.0",
+        capabilities=AgentCapabilities(streaming=True),
+        default_input_modes=["text"],
+        default_output_modes=["text"],
+        skills=[],
+    )
+    return BaseClient(
+        card=card,
+        config=ClientConfig(streaming=True),
+        transport=StreamingTransport(),  # type: ignore[arg-type]
+        consumers=[],
+        middleware=[],
+    )
+
+
+def _request() -> Message:
+    return Message(message_id="m-1", role="user", parts=[])  # type: ignore[arg-type]
+
+
+async def _drain(stream: AsyncIterator[Any]) -> float:
+    """Seconds taken to drain the stream."""
+    start = time.perf_counter()
+    count = 0
+    async for _event in stream:
+        count += 1
+    elapsed = time.perf_counter() - start
+    assert count == EVENTS + 1
+    return elapsed
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+class TestX402MiddlewareOverhead:
+    """Compare streaming through x402_middleware to a raw BaseClient."""
+
+    async def test_per_event_overhead(self) -> None:
+        client = _client()
+        treasurer = MagicMock(spec=X402Treasurer)
+
+        def raw() -> AsyncIterator[Any]:
+            return client.send_message(_request())
+
+        def middleware() -> AsyncIterator[Any]:
+            return x402_middleware(
+                treasurer=treasurer,
+                send_message=client.send_message,
+                request=_request(),
+                utils=NoPaymentUtils(),
+            )
+
+        # Interleaved and best of, so warm-up and noise hit both alike
+        raw_time = middleware_time = float("inf")
+        for _ in range(REPEATS):
+            raw_time = min(raw_time, await _drain(raw()))
+            middleware_time = min(middleware_time, await _drain(middleware()))
+        overhead_us = (middleware_time - raw_time) / (EVENTS + 1) * 1e6
+        logger.info(
+            f"raw {raw_time / (EVENTS + 1) * 1e6:.2f}us/event,"
+            f" x402_middleware overhead {overhead_us:.2f}us/event"
+        )
+
+        # The middleware adds one generator hop, far cheaper than a2a's own
+        # task tracking per event
+        assert middleware_time < raw_time * 1.5
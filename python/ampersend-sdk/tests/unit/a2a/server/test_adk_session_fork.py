@@ -0,0 +1,129 @@
+"""Unit tests for AdkSessionFork."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from a2a.server.agent_execution import RequestContext
+from a2a.types import (
+    Message,
+    MessageSendParams,
+    Part,
+    Role,
+    Task,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+from ampersend_sdk.a2a.server.a2a_monkey import (
+    override_convert_a2a_request_to_adk_run_args,
+)
+from ampersend_sdk.a2a.server.adk_session_fork import (
+    SESSION_FORK_KEY,
+    AdkSessionFork,
+)
+from google.adk.events import Event, EventActions
+from google.adk.sessions import InMemorySessionService
+
+APP = "app"
+USER = "A2A_USER_ctx-1"
+
+
+def _context() -> RequestContext:
+    message = Message(
+        message_id="msg-1",
+        role=Role.user,
+        parts=[Part(root=TextPart(text="pay"))],
+        task_id="task-1",
+        context_id="ctx-1",
+    )
+    return RequestContext(
+        request=MessageSendParams(message=message),
+        task_id="task-1",
+        context_id="ctx-1",
+        task=Task(
+            id="task-1",
+            context_id="ctx-1",
+            status=TaskStatus(state=TaskState.input_required),
+        ),
+    )
+
+
+async def _sessions() -> tuple[AdkSessionFork, InMemorySessionService]:
+    service = InMemorySessionService()  # type: ignore[no-untyped-call]
+    session = await service.create_session(
+        app_name=APP, user_id=USER, session_id="ctx-1", state={"turns": 1}
+    )
+    await service.append_event(session, Event(author="user", invocation_id="i-1"))
+    runner = MagicMock(app_name=APP, session_service=service)
+    executor = MagicMock()
+    executor._resolve_runner = AsyncMock(return_value=runner)
+    return AdkSessionFork(executor), service
+
+
+async def _write(service: InMemorySessionService, session_id: str) -> None:
+    session = await service.get_session(
+        app_name=APP, user_id=USER, session_id=session_id
+    )
+    assert session is not None
+    await service.append_event(
+        session,
+        Event(
+            author="agent",
+            invocation_id="i-2",
+            actions=EventActions(state_delta={"x402_payment_verified": True}),
+        ),
+    )
+
+
+@pytest.mark.asyncio
+class TestAdkSessionFork:
+    """Test forking, committing and dropping ADK sessions."""
+
+    async def test_fork_runs_on_a_copy_of_the_session(self) -> None:
+        sessions, service = await _sessions()
+
+        fork = await sessions.fork(_context())
+
+        assert fork.current_task is not None and fork.current_task.metadata
+        fork_id = fork.current_task.metadata[SESSION_FORK_KEY]
+        forked = await service.get_session(
+            app_name=APP, user_id=USER, session_id=fork_id
+        )
+        assert forked is not None
+        assert forked.state == {"turns": 1}
+        assert len(forked.events) == 1
+        run_args = override_convert_a2a_request_to_adk_run_args(fork)
+        assert run_args["session_id"] == fork_id
+        assert SESSION_FORK_KEY not in run_args["state_delta"]
+
+    async def test_dropped_fork_leaves_session_untouched(self) -> None:
+        sessions, service = await _sessions()
+        fork = await sessions.fork(_context())
+        assert fork.current_task is not None and fork.current_task.metadata
+        await _write(service, fork.current_task.metadata[SESSION_FORK_KEY])
+
+        await sessions.drop(fork)
+
+        session = await service.get_session(
+            app_name=APP, user_id=USER, session_id="ctx-1"
+        )
+        assert session is not None
+        assert "x402_payment_verified" not in session.state
+        assert len(session.events) == 1
+        listed = await service.list_sessions(app_name=APP, user_id=USER)
+        assert [s.id for s in listed.sessions] == ["ctx-1"]
+
+    async def test_committed_fork_writes_session(self) -> None:
+        sessions, service = await _sessions()
+        fork = await sessions.fork(_context())
+        assert fork.current_task is not None and fork.current_task.metadata
+        await _write(service, fork.current_task.metadata[SESSION_FORK_KEY])
+
+        await sessions.commit(fork)
+
+        session = await service.get_session(
+            app_name=APP, user_id=USER, session_id="ctx-1"
+        )
+        assert session is not None
+        assert session.state == {"turns": 1, "x402_payment_verified": True}
+        assert [e.invocation_id for e in session.events] == ["i-1", "i-2"]
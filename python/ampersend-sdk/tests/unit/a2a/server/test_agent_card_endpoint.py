@@ -0,0 +1,67 @@
+"""Unit tests for agent_card_endpoint."""
+
+from a2a.types import AgentCapabilities, AgentCard
+from ampersend_sdk.a2a.server.agent_card_endpoint import agent_card_endpoint
+from starlette.applications import Starlette
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+
+def _client(max_age: int = 60) -> TestClient:
+    card = AgentCard(
+        name="agent",
+        description="agent",
+        url="https://agent.example",
+        version="1.0.0",
+        capabilities=AgentCapabilities(),
+        default_input_modes=["text"],
+        default_output_modes=["text"],
+        skills=[],
+    )
+    endpoint = agent_card_endpoint(card, max_age=max_age)
+    return TestClient(Starlette(routes=[Route("/card", endpoint)]))
+
+
+class TestAgentCardEndpoint:
+    """Test validators and conditional requests."""
+
+    def test_serves_card_with_validators(self) -> None:
+        response = _client(max_age=60).get("/card")
+
+        assert response.status_code == 200
+        assert response.json()["name"] == "agent"
+        assert response.headers["etag"].startswith('"')
+        assert "last-modified" in response.headers
+        assert response.headers["cache-control"] == "public, max-age=60"
+
+    def test_matching_etag_is_not_modified(self) -> None:
+        client = _client()
+        etag = client.get("/card").headers["etag"]
+
+        response = client.get("/card", headers={"If-None-Match": f'"other", W/{etag}'})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_other_etag_is_served(self) -> None:
+        response = _client().get("/card", headers={"If-None-Match": '"other"'})
+
+        assert response.status_code == 200
+
+    def test_if_modified_since(self) -> None:
+        client = _client()
+        last_modified = client.get("/card").headers["last-modified"]
+
+        assert (
+            client.get(
+                "/card", headers={"If-Modified-Since": last_modified}
+            ).status_code
+            == 304
+        )
+        assert (
+            client.get(
+                "/card", headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"}
+            ).status_code
+            == 200
+        )
@@ -0,0 +1,137 @@
+"""Unit tests for FacilitatorX402ServerExecutor local checks."""
+
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from ampersend_sdk.a2a.server import InMemoryNonceIndex, PaymentPreverifier
+from ampersend_sdk.a2a.server.facilitator_x402_server_executor import (
+    FacilitatorX402ServerExecutor,
+)
+from payment_factories import FROM, PAY_TO, make_authorization, make_payload
+from x402_a2a.types import (
+    PaymentPayload,
+    PaymentRequirements,
+    VerifyResponse,
+)
+
+
+def _requirements() -> PaymentRequirements:
+    return PaymentRequirements(
+        scheme="exact",
+        network="base-sepolia",
+        max_amount_required="1000",
+        resource="https://agent.example",
+        description="",
+        mime_type="application/json",
+        pay_to=PAY_TO,
+        max_timeout_seconds=300,
+        asset="0x036CbD53842c5426634e7929541eC2318f3dCF7e",
+    )
+
+
+def _payload(
+    valid_before: int | None = None, nonce: str = "0x" + "11" * 32
+) -> PaymentPayload:
+    return make_payload(make_authorization(valid_before=valid_before, nonce=nonce))
+
+
+def _executor(is_valid: bool = True) -> tuple[FacilitatorX402ServerExecutor, AsyncMock]:
+    verify = AsyncMock(
+        return_value=VerifyResponse.model_validate(
+            {"isValid": is_valid, "invalidReason": None, "payer": FROM}
+        )
+    )
+    with patch(
+        "ampersend_sdk.a2a.server.facilitator_x402_server_executor.FacilitatorClient"
+    ) as facilitator:
+        facilitator.return_value.verify = verify
+        executor = FacilitatorX402ServerExecutor(
+            delegate=MagicMock(), config=MagicMock(), nonce_index=InMemoryNonceIndex()
+        )
+    return executor, verify
+
+
+@pytest.mark.asyncio
+class TestFacilitatorX402ServerExecutorVerify:
+    """Test payments rejected without the facilitator."""
+
+    async def test_valid_payment_is_verified_by_facilitator(self) -> None:
+        executor, verify = _executor()
+
+        response = await executor.verify_payment(_payload(), _requirements())
+
+        assert response.is_valid
+        verify.assert_awaited_once()
+
+    async def test_replay_is_rejected_locally(self) -> None:
+        executor, verify = _executor()
+        await executor.verify_payment(_payload(), _requirements())
+
+        response = await executor.verify_payment(_payload(), _requirements())
+
+        assert not response.is_valid
+        assert (
+            response.invalid_reason == "invalid_exact_evm_payload_authorization_nonce"
+        )
+        assert response.payer == FROM
+        verify.assert_awaited_once()
+
+    async def test_expired_authorization_is_rejected_locally(self) -> None:
+        executor, verify = _executor()
+
+        response = await executor.verify_payment(
+            _payload(valid_before=int(time.time()) + 2), _requirements()
+        )
+
+        assert response.invalid_reason == (
+            "invalid_exact_evm_payload_authorization_valid_before"
+        )
+        verify.assert_not_awaited()
+
+    async def test_malformed_payload_is_rejected_locally(self) -> None:
+        executor, verify = _executor()
+
+        response = await executor.verify_payment(
+            _payload(nonce="0x1234"), _requirements()
+        )
+
+        assert response.invalid_reason == "invalid_payload"
+        verify.assert_not_awaited()
+
+    async def test_network_mismatch_is_rejected_locally(self) -> None:
+        executor, verify = _executor()
+        requirements = _requirements()
+        requirements.network = "base"
+
+        response = await executor.verify_payment(_payload(), requirements)
+
+        assert response.invalid_reason == "invalid_network"
+        verify.assert_not_awaited()
+
+    async def test_nonce_of_invalid_payment_is_released(self) -> None:
+        executor, verify = _executor(is_valid=False)
+        await executor.verify_payment(_payload(), _requirements())
+
+        await executor.verify_payment(_payload(), _requirements())
+
+        assert verify.await_count == 2
+
+    async def test_preverifier_rejects_bad_signature_locally(self) -> None:
+        verify = AsyncMock()
+        with patch(
+            "ampersend_sdk.a2a.server.facilitator_x402_server_executor.FacilitatorClient"
+        ) as facilitator:
+            facilitator.return_value.verify = verify
+            executor = FacilitatorX402ServerExecutor(
+                delegate=MagicMock(),
+                config=MagicMock(),
+                preverifier=PaymentPreverifier(),
+            )
+        requirements = _requirements()
+        requirements.extra = {"name": "USDC", "version": "2"}
+
+        response = await executor.verify_payment(_payload(), requirements)
+
+        assert response.invalid_reason == "invalid_exact_evm_payload_signature"
+        verify.assert_not_awaited()
@@ -0,0 +1,96 @@
+"""Unit tests for the nonce indexes."""
+
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from ampersend_sdk.a2a.server import InMemoryNonceIndex, SqliteNonceIndex
+
+FROM = "0x857b06519E91e3A54538791bDbb0E22373e36b66"
+NONCE = "0x" + "ab" * 32
+
+
+@pytest.mark.asyncio
+class TestInMemoryNonceIndex:
+    """Test replay detection and bounds."""
+
+    async def test_second_claim_is_a_replay(self) -> None:
+        index = InMemoryNonceIndex()
+        expires_at = time.time() + 60
+
+        assert await index.claim(FROM, NONCE, expires_at)
+        assert not await index.claim(FROM.lower(), NONCE[2:].upper(), expires_at)
+
+    async def test_expired_nonce_can_be_claimed_again(self) -> None:
+        index = InMemoryNonceIndex()
+        with patch("time.time", return_value=1000.0):
+            assert await index.claim(FROM, NONCE, 1060.0)
+        with patch("time.time", return_value=1061.0):
+            assert await index.claim(FROM, NONCE, 1120.0)
+            assert len(index) == 1
+
+    async def test_released_nonce_can_be_claimed_again(self) -> None:
+        index = InMemoryNonceIndex()
+        expires_at = time.time() + 60
+        await index.claim(FROM, NONCE, expires_at)
+
+        await index.release(FROM, NONCE)
+
+        assert await index.claim(FROM, NONCE, expires_at)
+
+    async def test_bounded_by_dropping_closest_to_expiry(self) -> None:
+        index = InMemoryNonceIndex(max_entries=2)
+        now = time.time()
+        await index.claim(FROM, "0x01", now + 30)
+        await index.claim(FROM, "0x02", now + 90)
+        await index.claim(FROM, "0x03", now + 60)
+
+        assert len(index) == 2
+        assert await index.claim(FROM, "0x01", now + 30)
+        assert not await index.claim(FROM, "0x02", now + 90)
+
+    async def test_nonce_is_held_at_most_max_validity(self) -> None:
+        index = InMemoryNonceIndex(max_validity=60.0)
+        with patch("time.time", return_value=1000.0):
+            assert await index.claim(FROM, NONCE, 1_000_000.0)
+        with patch("time.time", return_value=1061.0):
+            assert await index.claim(FROM, NONCE, 1_000_000.0)
+
+    async def test_released_nonces_do_not_grow_the_heap(self) -> None:
+        index = InMemoryNonceIndex()
+        expires_at = time.time() + 60
+        for i in range(1000):
+            await index.claim(FROM, f"0x{i:064x}", expires_at)
+            await index.release(FROM, f"0x{i:064x}")
+
+        assert len(index) == 0
+        assert len(index._expiry) <= 64
+
+
+@pytest.mark.asyncio
+class TestSqliteNonceIndex:
+    """Test the shared SQLite index."""
+
+    async def test_claims_are_shared_between_instances(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "nonces.db")
+        first, second = SqliteNonceIndex(path), SqliteNonceIndex(path)
+        expires_at = time.time() + 60
+        try:
+            assert await first.claim(FROM, NONCE, expires_at)
+            assert not await second.claim(FROM, NONCE, expires_at)
+
+            await second.release(FROM, NONCE)
+            assert await first.claim(FROM, NONCE, expires_at)
+        finally:
+            await first.close()
+            await second.close()
+
+    async def test_expired_nonce_can_be_claimed_again(self, tmp_path: Path) -> None:
+        index = SqliteNonceIndex(str(tmp_path / "nonces.db"))
+        try:
+            assert await index.claim(FROM, NONCE, time.time() - 1)
+            assert await index.claim(FROM, NONCE, time.time() + 60)
+            assert not await index.claim(FROM, NONCE, time.time() + 60)
+        finally:
+            await index.close()
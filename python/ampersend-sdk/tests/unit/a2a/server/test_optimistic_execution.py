@@ -0,0 +1,265 @@
+"""Unit tests for optimistic agent execution."""
+
+import asyncio
+from typing import Any, List
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from a2a.server.agent_execution import AgentExecutor, RequestContext
+from a2a.server.events import EventQueue
+from a2a.types import (
+    Message,
+    MessageSendParams,
+    Part,
+    Role,
+    Task,
+    TaskState,
+    TaskStatus,
+    TextPart,
+)
+from ampersend_sdk.a2a.server.optimistic_execution import (
+    PAYMENT_VERIFIED_KEY,
+    EventBuffer,
+    OptimisticDelegate,
+)
+from ampersend_sdk.a2a.server.x402_server_executor import X402ServerExecutor
+from x402_a2a.executors import x402ServerExecutor
+from x402_a2a.types import PaymentStatus
+
+
+def _context() -> RequestContext:
+    task = Task(
+        id="task-1",
+        context_id="ctx-1",
+        status=TaskStatus(state=TaskState.input_required),
+        metadata={"other": 1},
+    )
+    message = Message(
+        message_id="msg-1",
+        role=Role.user,
+        parts=[Part(root=TextPart(text="pay"))],
+        task_id="task-1",
+        context_id="ctx-1",
+    )
+    return RequestContext(
+        request=MessageSendParams(message=message),
+        task_id="task-1",
+        context_id="ctx-1",
+        task=task,
+    )
+
+
+def _event(text: str) -> Message:
+    return Message(
+        message_id=text, role=Role.agent, parts=[Part(root=TextPart(text=text))]
+    )
+
+
+class _Agent(AgentExecutor):
+    """Agent enqueueing one event, then another once `proceed` is set."""
+
+    def __init__(self) -> None:
+        self.started = asyncio.Event()
+        self.proceed = asyncio.Event()
+        self.cancelled = False
+        self.tasks: List[Task] = []
+
+    async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
+        assert context.current_task is not None
+        self.tasks.append(context.current_task)
+        await event_queue.enqueue_event(_event("first"))
+        self.started.set()
+        try:
+            await self.proceed.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        await event_queue.enqueue_event(_event("second"))
+
+    async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
+        pass
+
+
+class TestEventBuffer:
+    """Test holding and releasing events."""
+
+    @pytest.mark.asyncio
+    async def test_release_forwards_in_order(self) -> None:
+        buffer = EventBuffer()
+        target = MagicMock(enqueue_event=AsyncMock())
+        await buffer.enqueue_event(_event("a"))
+        await buffer.enqueue_event(_event("b"))
+        target.enqueue_event.assert_not_awaited()
+
+        await buffer.release(target)
+        await buffer.enqueue_event(_event("c"))
+
+        assert [c.args[0] for c in target.enqueue_event.await_args_list] == [
+            _event("a"),
+            _event("b"),
+            _event("c"),
+        ]
+
+
+@pytest.mark.asyncio
+class TestOptimisticDelegate:
+    """Test runs started ahead of verification."""
+
+    async def test_run_is_marked_paid_without_changing_task(self) -> None:
+        agent = _Agent()
+        delegate = OptimisticDelegate(agent)
+        context = _context()
+
+        await delegate.start(context)
+        await agent.started.wait()
+
+        assert agent.tasks[0].metadata == {"other": 1, PAYMENT_VERIFIED_KEY: True}
+        assert context.current_task is not None
+        assert context.current_task.metadata == {"other": 1}
+        await delegate.discard(context)
+
+    async def test_execute_releases_buffered_events(self) -> None:
+        agent = _Agent()
+        delegate = OptimisticDelegate(agent)
+        context = _context()
+        target = MagicMock(enqueue_event=AsyncMock())
+
+        await delegate.start(context)
+        await agent.started.wait()
+        target.enqueue_event.assert_not_awaited()
+
+        agent.proceed.set()
+        await delegate.execute(context, target)
+        await delegate.discard(context)
+
+        assert [c.args[0] for c in target.enqueue_event.await_args_list] == [
+            _event("first"),
+            _event("second"),
+        ]
+        assert len(agent.tasks) == 1
+        assert not agent.cancelled
+
+    async def test_discard_cancels_run(self) -> None:
+        agent = _Agent()
+        delegate = OptimisticDelegate(agent)
+        context = _context()
+
+        await delegate.start(context)
+        await agent.started.wait()
+        await delegate.discard(context)
+
+        assert agent.cancelled
+
+    async def test_second_start_cancels_earlier_run(self) -> None:
+        agent = _Agent()
+        delegate = OptimisticDelegate(agent)
+        context = _context()
+
+        await delegate.start(context)
+        await agent.started.wait()
+        await delegate.start(context)
+
+        assert agent.cancelled
+        await delegate.discard(context)
+
+    async def test_discarded_run_drops_its_session_fork(self) -> None:
+        agent = _Agent()
+        sessions = MagicMock(
+            fork=AsyncMock(side_effect=lambda context: context),
+            commit=AsyncMock(),
+            drop=AsyncMock(),
+        )
+        delegate = OptimisticDelegate(agent, sessions)
+        context = _context()
+
+        await delegate.start(context)
+        await agent.started.wait()
+        await delegate.discard(context)
+
+        sessions.drop.assert_awaited_once()
+        sessions.commit.assert_not_awaited()
+
+    async def test_released_run_commits_its_session_fork(self) -> None:
+        agent = _Agent()
+        agent.proceed.set()
+        sessions = MagicMock(
+            fork=AsyncMock(side_effect=lambda context: context),
+            commit=AsyncMock(),
+            drop=AsyncMock(),
+        )
+        delegate = OptimisticDelegate(agent, sessions)
+        context = _context()
+
+        await delegate.start(context)
+        await delegate.execute(context, MagicMock(enqueue_event=AsyncMock()))
+
+        sessions.commit.assert_awaited_once()
+        sessions.drop.assert_not_awaited()
+
+    async def test_execute_without_run_delegates(self) -> None:
+        agent = _Agent()
+        agent.proceed.set()
+        delegate = OptimisticDelegate(agent)
+        target = MagicMock(enqueue_event=AsyncMock())
+
+        await delegate.execute(_context(), target)
+
+        assert target.enqueue_event.await_count == 2
+
+
+@pytest.mark.asyncio
+class TestX402ServerExecutorOptimistic:
+    """Test optimistic mode around the x402 executor's verification."""
+
+    def _executor(self, agent: _Agent) -> X402ServerExecutor:
+        executor = X402ServerExecutor(
+            delegate=agent,
+            config=MagicMock(),
+            optimistic=True,
+        )
+        executor._x402_utils = MagicMock()
+        executor._x402_utils.get_payment_status_from_message.return_value = (
+            PaymentStatus.PAYMENT_SUBMITTED
+        )
+        return executor
+
+    async def test_agent_runs_during_verification(self) -> None:
+        agent = _Agent()
+        agent.proceed.set()
+        executor = self._executor(agent)
+        queue = MagicMock(enqueue_event=AsyncMock())
+
+        async def execute(
+            self: X402ServerExecutor, context: RequestContext, event_queue: Any
+        ) -> None:
+            # Verification: the agent is already running
+            await agent.started.wait()
+            await self._delegate.execute(context, event_queue)
+
+        context = _context()
+        with patch.object(x402ServerExecutor, "execute", execute, create=True):
+            await executor.execute(context, queue)
+
+        assert [c.args[0] for c in queue.enqueue_event.await_args_list] == [
+            _event("first"),
+            _event("second"),
+        ]
+        assert len(agent.tasks) == 1
+
+    async def test_failed_verification_discards_run(self) -> None:
+        agent = _Agent()
+        executor = self._executor(agent)
+        queue = MagicMock(enqueue_event=AsyncMock())
+
+        async def execute(
+            self: X402ServerExecutor, context: RequestContext, event_queue: Any
+        ) -> None:
+            # Verification failed: the delegate is never called
+            await agent.started.wait()
+
+        context = _context()
+        with patch.object(x402ServerExecutor, "execute", execute, create=True):
+            await executor.execute(context, queue)
+
+        assert agent.cancelled
+        queue.enqueue_event.assert_not_awaited()
@@ -0,0 +1,150 @@
+"""Unit tests for offline payment checks."""
+
+import pytest
+from ampersend_sdk.a2a.server import PaymentPreverifier
+from ampersend_sdk.a2a.server.payment_checks import check_exact_payment
+from ampersend_sdk.signing import digest_signer
+from ampersend_sdk.smart_account.sign import encode_1271_signature
+from ampersend_sdk.x402.wallets.eip3009 import (
+    domain_separator,
+    transfer_with_authorization_digest,
+)
+from eth_account import Account
+from payment_factories import PAY_TO, make_authorization, make_payload
+from x402_a2a.types import (
+    EIP3009Authorization,
+    PaymentPayload,
+    PaymentRequirements,
+)
+
+PRIVATE_KEY = "0x" + "a" * 64
+OWNER = Account.from_key(PRIVATE_KEY).address
+SMART_ACCOUNT = "0x1234567890123456789012345678901234567890"
+VALIDATOR = "0x000000000013fdB5234E4E3162a810F54d9f7E98"
+TOKEN = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
+
+
+def _requirements() -> PaymentRequirements:
+    return PaymentRequirements(
+        scheme="exact",
+        network="base-sepolia",
+        max_amount_required="1000",
+        resource="https://agent.example",
+        description="",
+        mime_type="application/json",
+        pay_to=PAY_TO,
+        max_timeout_seconds=300,
+        asset=TOKEN,
+        extra={"name": "USDC", "version": "2"},
+    )
+
+
+def _authorization(from_: str, value: str = "1000") -> EIP3009Authorization:
+    return make_authorization(from_=from_, value=value)
+
+
+def _signature(authorization: EIP3009Authorization, chain_id: int = 84532) -> bytes:
+    digest = transfer_with_authorization_digest(
+        domain_separator=domain_separator("USDC", "2", chain_id, TOKEN),
+        from_=authorization.from_,
+        to=authorization.to,
+        value=authorization.value,
+        valid_after=authorization.valid_after,
+        valid_before=authorization.valid_before,
+        nonce=bytes.fromhex(authorization.nonce[2:]),
+    )
+    return digest_signer(PRIVATE_KEY).sign_hash(digest)
+
+
+def _payload(authorization: EIP3009Authorization, signature: bytes) -> PaymentPayload:
+    return make_payload(authorization, "0x" + signature.hex())
+
+
+class TestCheckExactPayment:
+    """Test amount and recipient checks."""
+
+    def test_valid_payment(self) -> None:
+        authorization = _authorization(OWNER)
+        payload = _payload(authorization, _signature(authorization))
+
+        assert check_exact_payment(payload, _requirements()).invalid_reason is None
+
+    def test_insufficient_value(self) -> None:
+        authorization = _authorization(OWNER, value="999")
+        payload = _payload(authorization, _signature(authorization))
+
+        assert check_exact_payment(payload, _requirements()).invalid_reason == (
+            "invalid_exact_evm_payload_authorization_value"
+        )
+
+    def test_wrong_recipient(self) -> None:
+        authorization = _authorization(OWNER)
+        payload = _payload(authorization, _signature(authorization))
+        requirements = _requirements()
+        requirements.pay_to = SMART_ACCOUNT
+
+        assert check_exact_payment(payload, requirements).invalid_reason == (
+            "invalid_exact_evm_payload_recipient_mismatch"
+        )
+
+
+class TestPaymentPreverifier:
+    """Test offline signature checks."""
+
+    def test_eoa_signature(self) -> None:
+        authorization = _authorization(OWNER)
+        payload = _payload(authorization, _signature(authorization))
+
+        assert PaymentPreverifier().verify(payload, _requirements()) is None
+
+    def test_signature_of_another_payer(self) -> None:
+        authorization = _authorization(SMART_ACCOUNT)
+        payload = _payload(authorization, _signature(authorization))
+
+        assert PaymentPreverifier().verify(payload, _requirements()) == (
+            "invalid_exact_evm_payload_signature"
+        )
+
+    def test_signature_for_another_chain(self) -> None:
+        authorization = _authorization(OWNER)
+        payload = _payload(authorization, _signature(authorization, chain_id=8453))
+
+        assert PaymentPreverifier().verify(payload, _requirements()) == (
+            "invalid_exact_evm_payload_signature"
+        )
+
+    def test_tampered_signature(self) -> None:
+        authorization = _authorization(OWNER)
+        signature = bytearray(_signature(authorization))
+        signature[64] = 5
+        payload = _payload(authorization, bytes(signature))
+
+        assert PaymentPreverifier().verify(payload, _requirements()) == (
+            "invalid_exact_evm_payload_signature"
+        )
+
+    @pytest.mark.parametrize("validator", [VALIDATOR, SMART_ACCOUNT])
+    def test_smart_account_signature(self, validator: str) -> None:
+        authorization = _authorization(SMART_ACCOUNT)
+        signature = encode_1271_signature(
+            smart_account_address=SMART_ACCOUNT,
+            validator_address=validator,
+            signature=_signature(authorization),
+        )
+        payload = _payload(authorization, bytes.fromhex(signature.removeprefix("0x")))
+
+        assert PaymentPreverifier().verify(payload, _requirements()) is None
+        known = PaymentPreverifier(smart_account_owners=lambda account: [OWNER])
+        assert known.verify(payload, _requirements()) is None
+        other = PaymentPreverifier(smart_account_owners=lambda account: [PAY_TO])
+        assert other.verify(payload, _requirements()) == (
+            "invalid_exact_evm_payload_signature"
+        )
+
+    def test_unknown_token_domain_is_passed_on(self) -> None:
+        authorization = _authorization(SMART_ACCOUNT)
+        payload = _payload(authorization, _signature(authorization))
+        requirements = _requirements()
+        requirements.extra = None
+
+        assert PaymentPreverifier().verify(payload, requirements) is None
@@ -0,0 +1,287 @@
+"""Unit tests for the settlement queues and scheduler."""
+
+import asyncio
+import time
+from pathlib import Path
+from typing import AsyncIterator
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from ampersend_sdk.a2a.server import (
+    InMemorySettlementQueue,
+    PendingSettlement,
+    SettlementQueue,
+    SettlementScheduler,
+    SqliteSettlementQueue,
+)
+from ampersend_sdk.a2a.server.facilitator_x402_server_executor import (
+    FacilitatorX402ServerExecutor,
+)
+from payment_factories import FROM, PAY_TO, make_authorization, make_payload
+from x402_a2a.types import (
+    PaymentPayload,
+    PaymentRequirements,
+    SettleResponse,
+)
+
+ASSET = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
+
+
+def _requirements() -> PaymentRequirements:
+    return PaymentRequirements(
+        scheme="exact",
+        network="base-sepolia",
+        max_amount_required="1000",
+        resource="https://agent.example",
+        description="",
+        mime_type="application/json",
+        pay_to=PAY_TO,
+        max_timeout_seconds=300,
+        asset=ASSET,
+    )
+
+
+def _payload(nonce: int = 1, valid_before: int | None = None) -> PaymentPayload:
+    return make_payload(
+        make_authorization(
+            valid_before=valid_before, nonce="0x" + nonce.to_bytes(32, "big").hex()
+        )
+    )
+
+
+def _settled() -> SettleResponse:
+    return SettleResponse(success=True, transaction="0xabc", network="base-sepolia")
+
+
+def _scheduler(settle: AsyncMock, **kwargs: object) -> SettlementScheduler:
+    scheduler = SettlementScheduler(**kwargs)  # type: ignore[arg-type]
+    scheduler.attach(settle)
+    return scheduler
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+async def queue(
+    request: pytest.FixtureRequest, tmp_path: Path
+) -> AsyncIterator[SettlementQueue]:
+    if request.param == "memory":
+        yield InMemorySettlementQueue()
+        return
+    sqlite_queue = SqliteSettlementQueue(str(tmp_path / "settlements.db"))
+    yield sqlite_queue
+    await sqlite_queue.close()
+
+
+@pytest.mark.asyncio
+class TestSettlementQueue:
+    """Test both queues behave alike."""
+
+    async def test_add_is_idempotent(self, queue: SettlementQueue) -> None:
+        settlement = PendingSettlement("a", _payload(), _requirements(), 1.0)
+
+        assert await queue.add(settlement)
+        assert not await queue.add(settlement)
+        assert [s.settlement_id for s in await queue.pending()] == ["a"]
+
+    async def test_due_oldest_first_and_limited(self, queue: SettlementQueue) -> None:
+        await queue.add(PendingSettlement("b", _payload(2), _requirements(), 2.0))
+        await queue.add(PendingSettlement("a", _payload(1), _requirements(), 1.0))
+        await queue.add(
+            PendingSettlement(
+                "c", _payload(3), _requirements(), 0.5, next_attempt_at=float("inf")
+            )
+        )
+
+        due = await queue.due(now=10.0, limit=1)
+
+        assert [s.settlement_id for s in due] == ["a"]
+
+    async def test_update_and_remove(self, queue: SettlementQueue) -> None:
+        settlement = PendingSettlement("a", _payload(), _requirements(), 1.0)
+        await queue.add(settlement)
+
+        await queue.update(
+            settlement._replace(attempts=2, next_attempt_at=50.0, last_error="boom")
+        )
+        assert await queue.due(now=10.0, limit=10) == []
+        (pending,) = await queue.pending()
+        assert (pending.attempts, pending.last_error) == (2, "boom")
+
+        await queue.remove("a")
+        assert await queue.pending() == []
+
+    async def test_sqlite_survives_reopen(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "settlements.db")
+        first = SqliteSettlementQueue(path)
+        await first.add(PendingSettlement("a", _payload(), _requirements(), 1.0))
+        await first.close()
+
+        second = SqliteSettlementQueue(path)
+        (pending,) = await second.pending()
+        await second.close()
+
+        assert pending.settlement_id == "a"
+        assert pending.requirements == _requirements()
+
+
+@pytest.mark.asyncio
+class TestSettlementScheduler:
+    """Test settlement modes, retries and reconciliation."""
+
+    async def test_inline_settles_before_returning(self) -> None:
+        settle = AsyncMock(return_value=_settled())
+        scheduler = _scheduler(settle, mode="inline")
+
+        response = await scheduler.settle(_payload(), _requirements())
+
+        assert response.transaction == "0xabc"
+        settle.assert_awaited_once()
+
+    async def test_deferred_returns_before_settling(self) -> None:
+        released = asyncio.Event()
+
+        async def slow_settle(*args: object) -> SettleResponse:
+            await released.wait()
+            return _settled()
+
+        scheduler = _scheduler(AsyncMock(side_effect=slow_settle))
+
+        response = await scheduler.settle(_payload(), _requirements())
+        assert response.success and response.transaction is None
+        assert response.payer == FROM
+
+        released.set()
+        await scheduler.close()
+        assert scheduler.stats.settled == 1
+        assert (await scheduler.report()).unsettled == []
+
+    async def test_batch_waits_for_batch_size(self) -> None:
+        settle = AsyncMock(return_value=_settled())
+        scheduler = _scheduler(settle, mode="batch", batch_size=3, batch_interval=60.0)
+
+        await scheduler.settle(_payload(1), _requirements())
+        await scheduler.settle(_payload(2), _requirements())
+        await asyncio.sleep(0.05)
+        settle.assert_not_awaited()
+
+        await scheduler.settle(_payload(3), _requirements())
+        for _ in range(100):
+            if settle.await_count == 3:
+                break
+            await asyncio.sleep(0.01)
+        assert settle.await_count == 3
+        await scheduler.close()
+
+    async def test_batch_interval(self) -> None:
+        settle = AsyncMock(return_value=_settled())
+        scheduler = _scheduler(
+            settle, mode="batch", batch_size=100, batch_interval=0.05
+        )
+
+        await scheduler.settle(_payload(), _requirements())
+        await asyncio.sleep(0.2)
+
+        settle.assert_awaited_once()
+        await scheduler.close()
+
+    async def test_failures_are_retried_with_backoff(self) -> None:
+        settle = AsyncMock(
+            side_effect=[
+                SettleResponse(success=False, error_reason="insufficient_funds"),
+                RuntimeError("facilitator down"),
+                _settled(),
+            ]
+        )
+        scheduler = _scheduler(settle, mode="batch", retry_backoff=10.0)
+        await scheduler.settle(_payload(), _requirements())
+
+        now = time.time()
+        with patch("time.time", return_value=now):
+            await scheduler.flush()
+        (unsettled,) = (await scheduler.report()).unsettled
+        assert unsettled.attempts == 1
+        assert unsettled.last_error == "insufficient_funds"
+        assert unsettled.next_attempt_at == pytest.approx(now + 10.0)
+
+        with patch("time.time", return_value=now + 5):
+            await scheduler.flush()
+        assert settle.await_count == 1
+
+        with patch("time.time", return_value=now + 10):
+            await scheduler.flush()
+        (unsettled,) = (await scheduler.report()).unsettled
+        assert unsettled.next_attempt_at == pytest.approx(now + 30.0)
+
+        with patch("time.time", return_value=now + 30):
+            await scheduler.flush()
+        assert (await scheduler.report()).unsettled == []
+        assert scheduler.stats.failed_attempts == 2
+        await scheduler.close()
+
+    async def test_report_lists_exhausted_payments(self) -> None:
+        settle = AsyncMock(return_value=SettleResponse(success=False))
+        scheduler = _scheduler(settle, mode="batch", max_attempts=1)
+        await scheduler.settle(_payload(1), _requirements())
+        await scheduler.settle(_payload(2), _requirements())
+
+        await scheduler.flush()
+        await scheduler.flush()
+
+        report = await scheduler.report()
+        assert settle.await_count == 2
+        assert report.exhausted == 2
+        assert report.totals == {f"base-sepolia:{ASSET}": 2000}
+        assert all(u.next_attempt_at is None for u in report.unsettled)
+        await scheduler.close()
+
+    async def test_expired_authorization_is_not_attempted(self) -> None:
+        settle = AsyncMock(return_value=_settled())
+        scheduler = _scheduler(settle, mode="batch")
+        await scheduler.settle(
+            _payload(valid_before=int(time.time()) - 1), _requirements()
+        )
+
+        await scheduler.flush()
+
+        settle.assert_not_awaited()
+        (unsettled,) = (await scheduler.report()).unsettled
+        assert unsettled.last_error == "authorization expired"
+        await scheduler.close()
+
+    async def test_replayed_payment_is_refused(self) -> None:
+        scheduler = _scheduler(AsyncMock(return_value=_settled()), mode="batch")
+
+        first = await scheduler.settle(_payload(), _requirements())
+        replay = await scheduler.settle(_payload(), _requirements())
+
+        assert first.success
+        assert not replay.success
+        assert replay.error_reason == "payment already submitted"
+        assert len((await scheduler.report()).unsettled) == 1
+        await scheduler.close()
+
+    async def test_unattached_scheduler_raises(self) -> None:
+        with pytest.raises(RuntimeError):
+            await SettlementScheduler().settle(_payload(), _requirements())
+
+
+@pytest.mark.asyncio
+class TestFacilitatorX402ServerExecutorSettlement:
+    """Test the executor settling through a scheduler."""
+
+    async def test_settle_payment_is_deferred(self) -> None:
+        settle = AsyncMock(return_value=_settled())
+        scheduler = SettlementScheduler(mode="batch")
+        with patch(
+            "ampersend_sdk.a2a.server.facilitator_x402_server_executor.FacilitatorClient"
+        ) as facilitator:
+            facilitator.return_value.settle = settle
+            executor = FacilitatorX402ServerExecutor(
+                delegate=MagicMock(), config=MagicMock(), settlement=scheduler
+            )
+
+        response = await executor.settle_payment(_payload(), _requirements())
+        assert response.success
+        settle.assert_not_awaited()
+
+        await scheduler.close()
+        settle.assert_awaited_once()
@@ -0,0 +1,126 @@
+"""Unit tests for the local authorization cache."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from ampersend_sdk.ampersend import (
+    AmpersendTreasurer,
+    ApiClient,
+    AuthorizationCache,
+)
+from ampersend_sdk.ampersend.types import ApiResponseAgentPaymentAuthorization
+from ampersend_sdk.x402 import X402Wallet
+
+
+def _requirements(amount: str = "1000") -> MagicMock:
+    return MagicMock(
+        scheme="exact",
+        pay_to="0x9876543210987654321098765432109876543210",
+        asset="0x036CbD53842c5426634e7929541eC2318f3dCF7e",
+        max_amount_required=amount,
+        network="base-sepolia",
+    )
+
+
+def _authorized(daily: str, monthly: str) -> ApiResponseAgentPaymentAuthorization:
+    return ApiResponseAgentPaymentAuthorization(
+        authorized=True,
+        limits={"dailyRemaining": daily, "monthlyRemaining": monthly},
+    )
+
+
+class TestAuthorizationCache:
+    """Test AuthorizationCache."""
+
+    def test_unknown_payment_is_not_reserved(self) -> None:
+        cache = AuthorizationCache()
+        assert cache.try_reserve(_requirements()) is False
+
+    def test_reserves_within_mirrored_limits(self) -> None:
+        cache = AuthorizationCache()
+        cache.record(_requirements(), _authorized(daily="2500", monthly="10000"))
+
+        assert cache.try_reserve(_requirements()) is True
+        assert cache.try_reserve(_requirements()) is True
+        # Only 500 left of the daily limit
+        assert cache.try_reserve(_requirements()) is False
+
+    def test_requires_known_limits(self) -> None:
+        cache = AuthorizationCache()
+        cache.record(
+            _requirements(), ApiResponseAgentPaymentAuthorization(authorized=True)
+        )
+        assert cache.try_reserve(_requirements()) is False
+
+    def test_different_amount_bucket_is_not_reserved(self) -> None:
+        cache = AuthorizationCache()
+        cache.record(_requirements("1000"), _authorized("1000000", "1000000"))
+
+        assert cache.try_reserve(_requirements("1001")) is True
+        assert cache.try_reserve(_requirements("100000")) is False
+
+    def test_expired_entries_are_not_reserved(self) -> None:
+        cache = AuthorizationCache(ttl=0)
+        cache.record(_requirements(), _authorized("1000000", "1000000"))
+        assert cache.try_reserve(_requirements()) is False
+
+    def test_denial_evicts_entry(self) -> None:
+        cache = AuthorizationCache()
+        cache.record(_requirements(), _authorized("1000000", "1000000"))
+        cache.record(
+            _requirements(),
+            ApiResponseAgentPaymentAuthorization(authorized=False, reason="limit"),
+        )
+        assert cache.try_reserve(_requirements()) is False
+
+    def test_reconciliation_keeps_lower_limit(self) -> None:
+        cache = AuthorizationCache()
+        cache.record(_requirements(), _authorized(daily="1500", monthly="10000"))
+        assert cache.try_reserve(_requirements()) is True
+
+        # Server has not seen the local approval yet
+        cache.record(_requirements(), _authorized(daily="1500", monthly="10000"))
+        assert cache.try_reserve(_requirements()) is False
+
+
+@pytest.mark.asyncio
+class TestAmpersendTreasurerWithCache:
+    """Test AmpersendTreasurer with an AuthorizationCache."""
+
+    async def test_repeat_payment_is_approved_locally(self) -> None:
+        api_client = AsyncMock(spec=ApiClient)
+        api_client.authorize_payment = AsyncMock(
+            return_value=_authorized("1000000", "1000000")
+        )
+        mock_wallet = MagicMock(spec=X402Wallet)
+        mock_wallet.create_payment.return_value = MagicMock(name="PaymentPayload")
+
+        treasurer = AmpersendTreasurer(
+            api_client=api_client,
+            wallet=mock_wallet,
+            authorization_cache=AuthorizationCache(),
+        )
+        payment_required = MagicMock()
+        payment_required.accepts = [_requirements()]
+
+        assert await treasurer.onPaymentRequired(payment_required) is not None
+        assert api_client.authorize_payment.call_count == 1
+
+        # Second payment does not wait for the API
+        release = asyncio.Event()
+
+        async def slow_authorize(*args: object) -> ApiResponseAgentPaymentAuthorization:
+            await release.wait()
+            return _authorized("1000000", "1000000")
+
+        api_client.authorize_payment.side_effect = slow_authorize
+        result = await asyncio.wait_for(
+            treasurer.onPaymentRequired(payment_required), 0.1
+        )
+        assert result is not None
+
+        # ...but is reconciled in the background
+        release.set()
+        await asyncio.gather(*treasurer._background_tasks)
+        assert api_client.authorize_payment.call_count == 2
@@ -1,9 +1,11 @@
 """Unit tests for Ampersend treasurer."""
 
+import asyncio
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
-from ampersend_sdk.ampersend import AmpersendTreasurer, ApiClient
+from ampersend_sdk.ampersend import AmpersendTreasurer, ApiClient, PaymentEventSink
 from ampersend_sdk.ampersend.types import (
     ApiResponseAgentPaymentAuthorization,
 )
@@ -114,3 +116,94 @@ class TestAmpersendTreasurer:
         assert call_args[1]["event_id"] == auth_id
         assert call_args[1]["payment"] == payment
         assert call_args[1]["event"].event_type == "accepted"
+
+    async def test_events_go_to_event_sink(self) -> None:
+        """Test that events are submitted to the sink instead of reported inline."""
+        api_client = AsyncMock(spec=ApiClient)
+        api_client.authorize_payment = AsyncMock(
+            return_value=ApiResponseAgentPaymentAuthorization(authorized=True)
+        )
+        event_sink = AsyncMock(spec=PaymentEventSink)
+
+        mock_wallet = MagicMock(spec=X402Wallet)
+        mock_wallet.create_payment.return_value = MagicMock(name="PaymentPayload")
+
+        authorizer = AmpersendTreasurer(
+            api_client=api_client,
+            wallet=mock_wallet,
+            event_sink=event_sink,
+        )
+
+        payment_required = MagicMock()
+        payment_required.accepts = [MagicMock(scheme="exact")]
+
+        result = await authorizer.onPaymentRequired(payment_required)
+        assert result is not None
+
+        await authorizer.onStatus(
+            status=PaymentStatus.PAYMENT_COMPLETED,
+            authorization=result,
+        )
+
+        api_client.report_payment_event.assert_not_called()
+        assert event_sink.submit.call_count == 2
+        assert event_sink.submit.call_args[1]["event"].event_type == "accepted"
+
+    async def test_speculative_signing_overlaps_authorization(self) -> None:
+        """Test that signing starts before authorization completes."""
+        signed = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def create_payment(requirements: object) -> MagicMock:
+            loop.call_soon_threadsafe(signed.set)
+            return MagicMock(name="PaymentPayload")
+
+        async def authorize_payment(*args: object) -> Any:
+            # Only returns once the wallet has signed in the background
+            await asyncio.wait_for(signed.wait(), 1)
+            return ApiResponseAgentPaymentAuthorization(authorized=True)
+
+        api_client = AsyncMock(spec=ApiClient)
+        api_client.authorize_payment = AsyncMock(side_effect=authorize_payment)
+        mock_wallet = MagicMock(spec=X402Wallet)
+        mock_wallet.create_payment.side_effect = create_payment
+
+        authorizer = AmpersendTreasurer(
+            api_client=api_client,
+            wallet=mock_wallet,
+            speculative_signing=True,
+        )
+
+        payment_required = MagicMock()
+        payment_required.accepts = [MagicMock(scheme="exact")]
+
+        result = await authorizer.onPaymentRequired(payment_required)
+
+        assert result is not None
+        mock_wallet.create_payment.assert_called_once()
+        api_client.report_payment_event.assert_called_once()
+
+    async def test_speculative_signing_discarded_when_rejected(self) -> None:
+        """Test that a speculative signature is dropped on rejection."""
+        api_client = AsyncMock(spec=ApiClient)
+        api_client.authorize_payment = AsyncMock(
+            return_value=ApiResponseAgentPaymentAuthorization(
+                authorized=False, reason="Insufficient funds"
+            )
+        )
+        mock_wallet = MagicMock(spec=X402Wallet)
+        mock_wallet.create_payment.return_value = MagicMock(name="PaymentPayload")
+
+        authorizer = AmpersendTreasurer(
+            api_client=api_client,
+            wallet=mock_wallet,
+            speculative_signing=True,
+        )
+
+        payment_required = MagicMock()
+        payment_required.accepts = [MagicMock(scheme="exact")]
+
+        result = await authorizer.onPaymentRequired(payment_required)
+
+        assert result is None
+        api_client.report_payment_event.assert_not_called()
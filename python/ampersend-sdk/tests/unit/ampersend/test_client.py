@@ -0,0 +1,188 @@
+"""Unit tests for ApiClient."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+from ampersend_sdk.ampersend import ApiClient, ApiClientOptions
+from ampersend_sdk.ampersend.types import AuthenticationState
+from x402.types import PaymentRequirements
+
+
+def _make_client(
+    auth_refresh_margin: int = 60000, coalesce_authorizations: bool = False
+) -> ApiClient:
+    return ApiClient(
+        ApiClientOptions(
+            base_url="https://api.example.com",
+            session_key_private_key="0x" + "a" * 64,
+            auth_refresh_margin=auth_refresh_margin,
+            coalesce_authorizations=coalesce_authorizations,
+        )
+    )
+
+
+def _requirements(
+    pay_to: str = "0x9876543210987654321098765432109876543210",
+) -> PaymentRequirements:
+    return PaymentRequirements(
+        scheme="exact",
+        network="base-sepolia",
+        max_amount_required="1000",
+        resource="https://seller.example.com",
+        description="test",
+        mime_type="application/json",
+        pay_to=pay_to,
+        max_timeout_seconds=60,
+        asset="0x036CbD53842c5426634e7929541eC2318f3dCF7e",
+        extra={"name": "USDC", "version": "2"},
+    )
+
+
+def _auth(expires_in: timedelta, token: str = "token") -> AuthenticationState:
+    return AuthenticationState(
+        token=token,
+        agent_address="0x1234567890123456789012345678901234567890",
+        expires_at=datetime.now(timezone.utc) + expires_in,
+    )
+
+
+@pytest.mark.asyncio
+class TestApiClientAuthentication:
+    """Test ApiClient token handling."""
+
+    async def test_valid_token_skips_lock(self) -> None:
+        """A valid token is returned without waiting on the auth lock."""
+        client = _make_client()
+        client._auth = _auth(timedelta(hours=1))
+
+        async with client._auth_lock:
+            auth = await asyncio.wait_for(client._ensure_authenticated(), 0.1)
+
+        assert auth.token == "token"
+        assert client._refresh_task is None
+
+    async def test_expired_token_authenticates_once(self) -> None:
+        """Concurrent callers share a single login when the token expired."""
+        client = _make_client()
+        calls = 0
+
+        async def perform_authentication() -> None:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            client._auth = _auth(timedelta(hours=1), token="fresh")
+
+        client._perform_authentication = perform_authentication  # type: ignore[method-assign]
+
+        results = await asyncio.gather(
+            *(client._ensure_authenticated() for _ in range(10))
+        )
+
+        assert calls == 1
+        assert all(auth.token == "fresh" for auth in results)
+
+    async def test_refresh_in_background_before_expiry(self) -> None:
+        """Tokens close to expiry are refreshed without blocking callers."""
+        client = _make_client(auth_refresh_margin=60000)
+        client._auth = _auth(timedelta(seconds=30), token="old")
+        refreshed = asyncio.Event()
+        calls = 0
+
+        async def perform_authentication() -> None:
+            nonlocal calls
+            calls += 1
+            await refreshed.wait()
+            client._auth = _auth(timedelta(hours=1), token="new")
+
+        client._perform_authentication = perform_authentication  # type: ignore[method-assign]
+
+        # Callers keep using the current token while the refresh is in flight
+        results = await asyncio.gather(
+            *(client._ensure_authenticated() for _ in range(10))
+        )
+        assert all(auth.token == "old" for auth in results)
+
+        refreshed.set()
+        assert client._refresh_task is not None
+        await client._refresh_task
+
+        assert calls == 1
+        assert (await client._ensure_authenticated()).token == "new"
+
+    async def test_close_cancels_background_refresh(self) -> None:
+        """Closing the client cancels an in-flight refresh."""
+        client = _make_client()
+        client._auth = _auth(timedelta(seconds=30))
+
+        async def perform_authentication() -> None:
+            await asyncio.Event().wait()
+
+        client._perform_authentication = perform_authentication  # type: ignore[method-assign]
+
+        await client._ensure_authenticated()
+        task = client._refresh_task
+        assert task is not None
+
+        await client.close()
+        await asyncio.sleep(0)
+
+        assert task.cancelled()
+        assert client._refresh_task is None
+
+
+@pytest.mark.asyncio
+class TestApiClientAuthorizeCoalescing:
+    """Test single-flight coalescing of authorize_payment."""
+
+    @staticmethod
+    def _fetch_mock() -> AsyncMock:
+        async def fetch(*args: Any, **kwargs: Any) -> Any:
+            await asyncio.sleep(0.01)
+            return {"authorized": True, "limits": {"dailyRemaining": "100"}}
+
+        return AsyncMock(side_effect=fetch)
+
+    async def test_identical_calls_share_one_request(self) -> None:
+        client = _make_client(coalesce_authorizations=True)
+        client._auth = _auth(timedelta(hours=1))
+        client._fetch = self._fetch_mock()  # type: ignore[method-assign]
+
+        results = await asyncio.gather(
+            *(client.authorize_payment([_requirements()]) for _ in range(50))
+        )
+
+        assert client._fetch.call_count == 1
+        assert all(result.authorized for result in results)
+        # Each caller gets its own copy
+        results[0].limits["dailyRemaining"] = "0"  # type: ignore[index]
+        assert results[1].limits == {"dailyRemaining": "100"}
+        assert client._inflight_authorizations == {}
+
+    async def test_different_calls_are_not_coalesced(self) -> None:
+        client = _make_client(coalesce_authorizations=True)
+        client._auth = _auth(timedelta(hours=1))
+        client._fetch = self._fetch_mock()  # type: ignore[method-assign]
+
+        await asyncio.gather(
+            client.authorize_payment([_requirements()]),
+            client.authorize_payment([_requirements()], context={"task": "1"}),
+            client.authorize_payment(
+                [_requirements(pay_to="0x1111111111111111111111111111111111111111")]
+            ),
+        )
+
+        assert client._fetch.call_count == 3
+
+    async def test_calls_are_not_coalesced_by_default(self) -> None:
+        client = _make_client()
+        client._auth = _auth(timedelta(hours=1))
+        client._fetch = self._fetch_mock()  # type: ignore[method-assign]
+
+        await asyncio.gather(
+            *(client.authorize_payment([_requirements()]) for _ in range(5))
+        )
+
+        assert client._fetch.call_count == 5
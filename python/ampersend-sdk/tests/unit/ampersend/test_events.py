@@ -0,0 +1,133 @@
+"""Unit tests for the payment event queue."""
+
+import asyncio
+import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from ampersend_sdk.ampersend import ApiClient, ApiClientOptions, PaymentEventQueue
+from ampersend_sdk.ampersend.types import PaymentEvent, PaymentEventType
+
+
+def _event(event_type: PaymentEventType = PaymentEventType.SENDING) -> PaymentEvent:
+    return PaymentEvent(
+        event_type=event_type,
+        timestamp=datetime.datetime.now(datetime.UTC),
+    )
+
+
+@pytest.mark.asyncio
+class TestPaymentEventQueue:
+    """Test PaymentEventQueue."""
+
+    async def test_submit_does_not_wait_for_delivery(self) -> None:
+        """Submitting returns before the event has been reported."""
+        api_client = AsyncMock(spec=ApiClient)
+        delivered = asyncio.Event()
+
+        async def report_payment_event(**kwargs: object) -> None:
+            await delivered.wait()
+
+        api_client.report_payment_event = AsyncMock(side_effect=report_payment_event)
+        queue = PaymentEventQueue(api_client, flush_interval=0.01)
+
+        await asyncio.wait_for(queue.submit("id-1", MagicMock(), _event()), 0.1)
+        assert queue.stats.enqueued == 1
+        assert queue.stats.delivered == 0
+
+        delivered.set()
+        await queue.flush()
+        assert queue.stats.delivered == 1
+
+    async def test_batches_by_size(self) -> None:
+        """Events are delivered in batches of at most batch_size."""
+        api_client = AsyncMock(spec=ApiClient)
+        api_client.report_payment_event = AsyncMock()
+        queue = PaymentEventQueue(api_client, batch_size=3, flush_interval=1)
+
+        for i in range(7):
+            await queue.submit(f"id-{i}", MagicMock(), _event())
+        await queue.flush()
+
+        assert api_client.report_payment_event.call_count == 7
+        assert queue.stats.delivered == 7
+        assert queue.stats.batches == 3
+
+    async def test_events_of_a_payment_are_delivered_in_order(self) -> None:
+        """Events sharing an event_id are sent one after the other."""
+        api_client = AsyncMock(spec=ApiClient)
+        delivered: list[tuple[str, PaymentEventType]] = []
+
+        async def report_payment_event(
+            event_id: str, payment: object, event: PaymentEvent
+        ) -> None:
+            # The first event of each payment is the slowest
+            if event.event_type == PaymentEventType.SENDING:
+                await asyncio.sleep(0.02)
+            delivered.append((event_id, event.event_type))
+
+        api_client.report_payment_event = AsyncMock(side_effect=report_payment_event)
+        queue = PaymentEventQueue(api_client, batch_size=10, flush_interval=0.01)
+
+        for event_id in ("id-1", "id-2"):
+            await queue.submit(event_id, MagicMock(), _event())
+            await queue.submit(event_id, MagicMock(), _event(PaymentEventType.ACCEPTED))
+        await queue.flush()
+
+        assert queue.stats.batches == 1
+        for event_id in ("id-1", "id-2"):
+            assert [t for i, t in delivered if i == event_id] == [
+                PaymentEventType.SENDING,
+                PaymentEventType.ACCEPTED,
+            ]
+
+    async def test_failures_are_counted(self) -> None:
+        """Failed deliveries are counted and do not stop the queue."""
+        api_client = AsyncMock(spec=ApiClient)
+        api_client.report_payment_event = AsyncMock(
+            side_effect=[Exception("boom"), None]
+        )
+        queue = PaymentEventQueue(api_client, batch_size=1, flush_interval=0)
+
+        await queue.submit("id-1", MagicMock(), _event())
+        await queue.submit("id-2", MagicMock(), _event())
+        await queue.flush()
+
+        assert queue.stats.failed == 1
+        assert queue.stats.delivered == 1
+
+    async def test_backpressure_when_full(self) -> None:
+        """Submit waits for room once max_size events are pending."""
+        api_client = AsyncMock(spec=ApiClient)
+        release = asyncio.Event()
+
+        async def report_payment_event(**kwargs: object) -> None:
+            await release.wait()
+
+        api_client.report_payment_event = AsyncMock(side_effect=report_payment_event)
+        queue = PaymentEventQueue(
+            api_client, max_size=1, batch_size=1, flush_interval=0
+        )
+
+        await queue.submit("id-1", MagicMock(), _event())
+        await asyncio.sleep(0)  # worker picks up id-1
+        await queue.submit("id-2", MagicMock(), _event())
+
+        with pytest.raises(TimeoutError):
+            await asyncio.wait_for(queue.submit("id-3", MagicMock(), _event()), 0.05)
+
+        release.set()
+        await queue.flush()
+
+    async def test_flushed_on_client_close(self) -> None:
+        """Closing the ApiClient delivers pending events first."""
+        api_client = ApiClient(ApiClientOptions(base_url="https://api.example.com"))
+        api_client.report_payment_event = AsyncMock()  # type: ignore[method-assign]
+
+        queue = PaymentEventQueue(api_client, flush_interval=10)
+        await queue.submit("id-1", MagicMock(), _event())
+
+        await api_client.close()
+
+        api_client.report_payment_event.assert_called_once()
+        assert queue.stats.delivered == 1
@@ -0,0 +1,136 @@
+"""Unit tests for the durable payment event outbox."""
+
+import asyncio
+import datetime
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+from ampersend_sdk.ampersend import ApiClient, PaymentEventOutbox
+from ampersend_sdk.ampersend.types import PaymentEvent, PaymentEventType
+from payment_factories import make_authorization, make_payload
+from x402.types import PaymentPayload
+
+
+def _payment() -> PaymentPayload:
+    return make_payload(make_authorization(valid_after=0, valid_before=9999999999))
+
+
+def _event(event_type: PaymentEventType = PaymentEventType.SENDING) -> PaymentEvent:
+    return PaymentEvent(
+        event_type=event_type,
+        timestamp=datetime.datetime.now(datetime.UTC),
+    )
+
+
+@pytest.mark.asyncio
+class TestPaymentEventOutbox:
+    """Test PaymentEventOutbox."""
+
+    async def test_submit_delivers_in_background(self, tmp_path: Path) -> None:
+        """Submitted events are delivered and removed from the outbox."""
+        api_client = AsyncMock(spec=ApiClient)
+        api_client.report_payment_event = AsyncMock()
+        outbox = PaymentEventOutbox(api_client, str(tmp_path / "outbox.db"))
+
+        await asyncio.gather(
+            *(outbox.submit(f"id-{i}", _payment(), _event()) for i in range(5))
+        )
+        await outbox.flush()
+
+        assert api_client.report_payment_event.call_count == 5
+        assert outbox.stats.delivered == 5
+        assert await outbox.pending() == 0
+        await outbox.close()
+
+    async def test_duplicate_events_are_ignored(self, tmp_path: Path) -> None:
+        """A replayed event is stored once."""
+        api_client = AsyncMock(spec=ApiClient)
+        api_client.report_payment_event = AsyncMock(side_effect=Exception("down"))
+        outbox = PaymentEventOutbox(api_client, str(tmp_path / "outbox.db"))
+        sending = _event()
+
+        await outbox.submit("id-1", _payment(), sending)
+        await outbox.submit("id-1", _payment(), sending)
+        await outbox.submit("id-1", _payment(), _event(PaymentEventType.ACCEPTED))
+
+        assert await outbox.pending() == 2
+        await outbox.close()
+
+    async def test_repeated_event_type_is_kept(self, tmp_path: Path) -> None:
+        """A later event of the same type, e.g. after a retry, is stored."""
+        api_client = AsyncMock(spec=ApiClient)
+        api_client.report_payment_event = AsyncMock(side_effect=Exception("down"))
+        outbox = PaymentEventOutbox(api_client, str(tmp_path / "outbox.db"))
+        first = _event()
+        retry = first.model_copy(
+            update={"timestamp": first.timestamp + datetime.timedelta(seconds=1)}
+        )
+
+        await outbox.submit("id-1", _payment(), first)
+        await outbox.submit("id-1", _payment(), retry)
+
+        assert await outbox.pending() == 2
+        await outbox.close()
+
+    async def test_replays_after_restart(self, tmp_path: Path) -> None:
+        """Events that failed to deliver are replayed by a new outbox."""
+        path = str(tmp_path / "outbox.db")
+
+        failing_client = AsyncMock(spec=ApiClient)
+        failing_client.report_payment_event = AsyncMock(side_effect=Exception("down"))
+        outbox = PaymentEventOutbox(failing_client, path)
+        await outbox.submit("id-1", _payment(), _event())
+        await outbox.close()
+        assert outbox.stats.failed >= 1
+
+        api_client = AsyncMock(spec=ApiClient)
+        api_client.report_payment_event = AsyncMock()
+        restarted = PaymentEventOutbox(api_client, path)
+        assert await restarted.pending() == 1
+
+        # Skip the retry backoff recorded by the failed attempt
+        await restarted._db.run(
+            lambda db: db.execute("UPDATE payment_events SET next_attempt_at = 0")
+        )
+        await restarted.flush()
+
+        api_client.report_payment_event.assert_called_once()
+        call_args = api_client.report_payment_event.call_args[1]
+        assert call_args["event_id"] == "id-1"
+        assert call_args["payment"] == _payment()
+        assert await restarted.pending() == 0
+        await restarted.close()
+
+    async def test_failed_event_holds_back_later_events(self, tmp_path: Path) -> None:
+        """A payment's later events wait for an earlier one to be retried."""
+        delivered: list[PaymentEventType] = []
+        failures = [Exception("down")]
+
+        async def report_payment_event(
+            event_id: str, payment: PaymentPayload, event: PaymentEvent
+        ) -> None:
+            if event.event_type == PaymentEventType.SENDING and failures:
+                raise failures.pop()
+            delivered.append(event.event_type)
+
+        api_client = AsyncMock(spec=ApiClient)
+        api_client.report_payment_event = AsyncMock(side_effect=report_payment_event)
+        outbox = PaymentEventOutbox(api_client, str(tmp_path / "outbox.db"))
+
+        await outbox.submit("id-1", _payment(), _event(PaymentEventType.SENDING))
+        await outbox.submit("id-1", _payment(), _event(PaymentEventType.ACCEPTED))
+        await outbox.flush()
+
+        assert delivered == []
+        assert await outbox.pending() == 2
+
+        # Skip the retry backoff recorded by the failed attempt
+        await outbox._db.run(
+            lambda db: db.execute("UPDATE payment_events SET next_attempt_at = 0")
+        )
+        await outbox.flush()
+
+        assert delivered == [PaymentEventType.SENDING, PaymentEventType.ACCEPTED]
+        assert await outbox.pending() == 0
+        await outbox.close()
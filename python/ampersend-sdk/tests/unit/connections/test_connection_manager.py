@@ -0,0 +1,117 @@
+"""Unit tests for ConnectionManager."""
+
+from typing import List
+from unittest.mock import patch
+
+import httpx
+import pytest
+from ampersend_sdk.connections import ConnectionManager, default_connection_manager
+from ampersend_sdk.connections.manager import Origin
+
+
+class MockConnectionManager(ConnectionManager):
+    """ConnectionManager answering every request from mock transports."""
+
+    def __init__(self, **kwargs: float) -> None:
+        super().__init__(http2=False, **kwargs)  # type: ignore[arg-type]
+        self.opened: List[Origin] = []
+        self.closed: List[Origin] = []
+
+    def _open(self, origin: Origin) -> httpx.AsyncBaseTransport:
+        self.opened.append(origin)
+        manager = self
+
+        class Transport(httpx.MockTransport):
+            async def aclose(self) -> None:
+                manager.closed.append(origin)
+
+        return Transport(
+            lambda request: httpx.Response(
+                200, stream=httpx.ByteStream(str(origin).encode())
+            )
+        )
+
+
+@pytest.mark.asyncio
+class TestConnectionManager:
+    """Test per-origin pooling and idle eviction."""
+
+    async def test_one_pool_per_origin(self) -> None:
+        manager = MockConnectionManager()
+
+        await manager.client.get("https://a.example/x")
+        await manager.client.get("https://a.example:443/y")
+        response = await manager.client.get("http://b.example:8080/")
+
+        assert manager.opened == [
+            ("https", "a.example", 443),
+            ("http", "b.example", 8080),
+        ]
+        assert response.text == str(("http", "b.example", 8080))
+        assert manager.stats.requests == 3
+
+    async def test_client_is_shared(self) -> None:
+        manager = MockConnectionManager()
+
+        assert manager.client is manager.client
+
+    async def test_client_with_timeout_shares_connections(self) -> None:
+        manager = MockConnectionManager(timeout=30)
+
+        client = manager.client_with_timeout(600)
+        await client.get("https://a.example/")
+        await manager.client.get("https://a.example/")
+
+        assert client.timeout == httpx.Timeout(600)
+        assert manager.client_with_timeout(600) is client
+        assert manager.client_with_timeout(30) is manager.client
+        assert manager.opened == [("https", "a.example", 443)]
+
+    async def test_idle_pools_are_evicted(self) -> None:
+        manager = MockConnectionManager(idle_timeout=10)
+        with patch("time.monotonic", return_value=100.0):
+            await manager.client.get("https://a.example/")
+        with patch("time.monotonic", return_value=105.0):
+            await manager.client.get("https://b.example/")
+
+        with patch("time.monotonic", return_value=111.0):
+            await manager.evict_idle()
+
+        assert manager.closed == [("https", "a.example", 443)]
+        assert manager.hosts == 1
+        assert manager.stats.evicted == 1
+
+    async def test_pools_with_open_responses_are_kept(self) -> None:
+        manager = MockConnectionManager(idle_timeout=10)
+        with patch("time.monotonic", return_value=100.0):
+            request = manager.client.build_request("GET", "https://a.example/")
+            response = await manager.client.send(request, stream=True)
+
+        with patch("time.monotonic", return_value=200.0):
+            await manager.evict_idle()
+            assert manager.closed == []
+            await response.aclose()
+
+        with patch("time.monotonic", return_value=211.0):
+            await manager.evict_idle()
+        assert manager.closed == [("https", "a.example", 443)]
+
+    async def test_aclose_closes_every_pool(self) -> None:
+        manager = MockConnectionManager()
+        await manager.client.get("https://a.example/")
+        await manager.client.get("https://b.example/")
+
+        await manager.aclose()
+
+        assert sorted(manager.closed) == [
+            ("https", "a.example", 443),
+            ("https", "b.example", 443),
+        ]
+        assert manager.hosts == 0
+
+
+class TestDefaultConnectionManager:
+    """Test the process-wide manager."""
+
+    def test_is_shared(self) -> None:
+        assert default_connection_manager() is default_connection_manager()
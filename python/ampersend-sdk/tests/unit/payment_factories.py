@@ -0,0 +1,47 @@
+"""Payments shared by the unit tests."""
+
+import time
+
+from x402.types import EIP3009Authorization, ExactPaymentPayload, PaymentPayload
+
+FROM = "0x857b06519E91e3A54538791bDbb0E22373e36b66"
+PAY_TO = "0x209693Bc6afc0C5328bA36FaF03C514EF312287C"
+
+
+def make_authorization(
+    *,
+    from_: str = FROM,
+    to: str = PAY_TO,
+    value: str = "1000",
+    valid_after: int | None = None,
+    valid_before: int | None = None,
+    nonce: str = "0x" + "11" * 32,
+) -> EIP3009Authorization:
+    """EIP-3009 authorization, by default valid from a minute ago for 5 minutes."""
+    now = int(time.time())
+    return EIP3009Authorization.model_validate(
+        {
+            "from": from_,
+            "to": to,
+            "value": value,
+            "validAfter": str(now - 60 if valid_after is None else valid_after),
+            "validBefore": str(now + 300 if valid_before is None else valid_before),
+            "nonce": nonce,
+        }
+    )
+
+
+def make_payload(
+    authorization: EIP3009Authorization | None = None,
+    signature: str = "0x" + "22" * 65,
+) -> PaymentPayload:
+    """Exact base-sepolia payment carrying `authorization`."""
+    return PaymentPayload(
+        x402_version=1,
+        scheme="exact",
+        network="base-sepolia",
+        payload=ExactPaymentPayload(
+            signature=signature,
+            authorization=authorization or make_authorization(),
+        ),
+    )
@@ -0,0 +1,186 @@
+"""Conformance tests for the secp256k1 signing backends."""
+
+import importlib.util
+from typing import Any, Dict
+from unittest.mock import patch
+
+import pytest
+from ampersend_sdk.signing import (
+    SigningBackend,
+    default_backend,
+    digest_signer,
+    recover_address,
+)
+from ampersend_sdk.smart_account import SmartAccountConfig, SmartAccountSigner
+from ampersend_sdk.smart_account.sign import encode_1271_signature
+from ampersend_sdk.x402.wallets.eip3009 import (
+    domain_separator,
+    transfer_with_authorization_digest,
+)
+from eth_account import Account
+from eth_utils.crypto import keccak
+
+HAS_COINCURVE = importlib.util.find_spec("coincurve") is not None
+
+BACKENDS = [
+    pytest.param("eth_account", id="eth_account"),
+    pytest.param(
+        "coincurve",
+        id="coincurve",
+        marks=pytest.mark.skipif(not HAS_COINCURVE, reason="coincurve not installed"),
+    ),
+]
+
+TOKEN = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
+SMART_ACCOUNT = "0x1234567890123456789012345678901234567890"
+VALIDATOR = "0x000000000013fdB5234E4E3162a810F54d9f7E98"
+
+# Same keys and authorizations as test_sign_erc3009.py
+VECTORS = [
+    (
+        "0x" + "a" * 64,
+        {
+            "from": SMART_ACCOUNT,
+            "to": "0x9876543210987654321098765432109876543210",
+            "value": "1000000",
+            "validAfter": "0",
+            "validBefore": "9999999999",
+            "nonce": "0x" + "00" * 32,
+        },
+    ),
+    (
+        "0x" + "b" * 64,
+        {
+            "from": SMART_ACCOUNT,
+            "to": "0x9876543210987654321098765432109876543210",
+            "value": "1000000",
+            "validAfter": "100",
+            "validBefore": "200",
+            "nonce": "0x" + "01" * 32,
+        },
+    ),
+]
+
+
+def _reference_signature(private_key: str, message: Dict[str, Any]) -> bytes:
+    """Signature from eth_account's full typed data path."""
+    signed = Account.from_key(private_key).sign_typed_data(
+        domain_data={
+            "name": "USDC",
+            "version": "2",
+            "chainId": 84532,
+            "verifyingContract": TOKEN,
+        },
+        message_types={
+            "TransferWithAuthorization": [
+                {"name": "from", "type": "address"},
+                {"name": "to", "type": "address"},
+                {"name": "value", "type": "uint256"},
+                {"name": "validAfter", "type": "uint256"},
+                {"name": "validBefore", "type": "uint256"},
+                {"name": "nonce", "type": "bytes32"},
+            ]
+        },
+        message_data={
+            **message,
+            "value": int(message["value"]),
+            "validAfter": int(message["validAfter"]),
+            "validBefore": int(message["validBefore"]),
+            "nonce": bytes.fromhex(message["nonce"][2:]),
+        },
+    )
+    return bytes(signed.signature)
+
+
+def _digest(message: Dict[str, Any]) -> bytes:
+    return transfer_with_authorization_digest(
+        domain_separator=domain_separator("USDC", "2", 84532, TOKEN),
+        from_=message["from"],
+        to=message["to"],
+        value=message["value"],
+        valid_after=message["validAfter"],
+        valid_before=message["validBefore"],
+        nonce=bytes.fromhex(message["nonce"][2:]),
+    )
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+class TestSigningBackendConformance:
+    """Every backend must produce byte-identical signatures."""
+
+    def test_address_matches_eth_account(self, backend: SigningBackend) -> None:
+        for private_key, _ in VECTORS:
+            signer = digest_signer(private_key, backend)
+            assert signer.address == Account.from_key(private_key).address
+
+    def test_erc3009_vectors(self, backend: SigningBackend) -> None:
+        for private_key, message in VECTORS:
+            signature = digest_signer(private_key, backend).sign_hash(_digest(message))
+            assert signature == _reference_signature(private_key, message)
+
+    @pytest.mark.parametrize("validator", [VALIDATOR, SMART_ACCOUNT])
+    def test_1271_vectors(self, backend: SigningBackend, validator: str) -> None:
+        """Covers both the plain and the v-adjusted (account == validator) layout."""
+        for private_key, message in VECTORS:
+            config = SmartAccountConfig(
+                session_key=private_key,
+                smart_account_address=SMART_ACCOUNT,
+                validator_address=validator,
+            )
+            expected = encode_1271_signature(
+                smart_account_address=SMART_ACCOUNT,
+                validator_address=validator,
+                signature=_reference_signature(private_key, message),
+            )
+
+            signer = SmartAccountSigner(config, backend)
+            assert signer.sign_hash(_digest(message)) == expected
+
+    def test_many_digests(self, backend: SigningBackend) -> None:
+        """Covers both recovery ids and low-s normalization."""
+        private_key = "0x" + "a" * 64
+        account = Account.from_key(private_key)
+        signer = digest_signer(private_key, backend)
+
+        for i in range(64):
+            digest = keccak(i.to_bytes(32, "big"))
+            assert signer.sign_hash(digest) == bytes(
+                account.unsafe_sign_hash(digest).signature
+            )
+
+    def test_recover_address(self, backend: SigningBackend) -> None:
+        for private_key, message in VECTORS:
+            signature = _reference_signature(private_key, message)
+            address = Account.from_key(private_key).address
+
+            assert recover_address(_digest(message), signature, backend) == address
+            # v in {0, 1}
+            raw_v = signature[:64] + bytes([signature[64] - 27])
+            assert recover_address(_digest(message), raw_v, backend) == address
+
+    def test_recover_malformed_signature(self, backend: SigningBackend) -> None:
+        digest = _digest(VECTORS[0][1])
+        with pytest.raises(ValueError):
+            recover_address(digest, b"\x01" * 64, backend)
+        with pytest.raises(ValueError):
+            recover_address(digest, b"\x01" * 64 + b"\x05", backend)
+
+
+class TestDigestSigner:
+    """Test backend selection."""
+
+    def test_default_backend(self) -> None:
+        assert default_backend() == ("coincurve" if HAS_COINCURVE else "eth_account")
+
+    def test_unknown_backend(self) -> None:
+        with pytest.raises(ValueError):
+            digest_signer("0x" + "a" * 64, "openssl")  # type: ignore[arg-type]
+
+    def test_coincurve_backend_without_coincurve(self) -> None:
+        digest = _digest(VECTORS[0][1])
+        signature = _reference_signature(*VECTORS[0])
+        with patch("ampersend_sdk.signing.backend.coincurve", None):
+            with pytest.raises(ImportError, match="coincurve"):
+                digest_signer("0x" + "a" * 64, "coincurve")
+            with pytest.raises(ImportError, match="coincurve"):
+                recover_address(digest, signature, "coincurve")
@@ -0,0 +1,97 @@
+"""Unit tests for the compiled smart account signer."""
+
+from ampersend_sdk.smart_account import (
+    SmartAccountConfig,
+    SmartAccountSigner,
+    smart_account_sign_typed_data,
+    smart_account_signer,
+)
+from ampersend_sdk.x402.wallets.eip3009 import (
+    domain_separator,
+    transfer_with_authorization_digest,
+)
+from eth_account.messages import encode_typed_data
+from eth_utils.crypto import keccak
+
+CONFIG = SmartAccountConfig(
+    smart_account_address="0x1234567890123456789012345678901234567890",
+    session_key="0x" + "b" * 64,
+    validator_address="0x000000000013fdB5234E4E3162a810F54d9f7E98",
+)
+TOKEN = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
+DOMAIN = {
+    "name": "USDC",
+    "version": "2",
+    "chainId": 84532,
+    "verifyingContract": TOKEN,
+}
+TYPES = {
+    "EIP712Domain": [
+        {"name": "name", "type": "string"},
+        {"name": "version", "type": "string"},
+        {"name": "chainId", "type": "uint256"},
+        {"name": "verifyingContract", "type": "address"},
+    ],
+    "TransferWithAuthorization": [
+        {"name": "from", "type": "address"},
+        {"name": "to", "type": "address"},
+        {"name": "value", "type": "uint256"},
+        {"name": "validAfter", "type": "uint256"},
+        {"name": "validBefore", "type": "uint256"},
+        {"name": "nonce", "type": "bytes32"},
+    ],
+}
+MESSAGE = {
+    "from": CONFIG.smart_account_address,
+    "to": "0x9876543210987654321098765432109876543210",
+    "value": "1000000",
+    "validAfter": "100",
+    "validBefore": "200",
+    "nonce": "0x" + "01" * 32,
+}
+
+
+def _digest() -> bytes:
+    return transfer_with_authorization_digest(
+        domain_separator=domain_separator("USDC", "2", 84532, TOKEN),
+        from_=MESSAGE["from"],
+        to=MESSAGE["to"],
+        value=MESSAGE["value"],
+        valid_after=MESSAGE["validAfter"],
+        valid_before=MESSAGE["validBefore"],
+        nonce=bytes.fromhex("01" * 32),
+    )
+
+
+class TestSmartAccountSigner:
+    """Test SmartAccountSigner."""
+
+    def test_digest_matches_encode_typed_data(self) -> None:
+        """Test that the cached-domain digest matches eth_account's encoding."""
+        signable = encode_typed_data(
+            full_message={
+                "types": TYPES,
+                "primaryType": "TransferWithAuthorization",
+                "domain": DOMAIN,
+                "message": MESSAGE,
+            }
+        )
+        expected = keccak(b"\x19" + signable.version + signable.header + signable.body)
+
+        assert _digest() == expected
+
+    def test_sign_hash_matches_typed_data_signature(self) -> None:
+        """Test that signing the digest gives byte-identical signatures."""
+        expected = smart_account_sign_typed_data(
+            config=CONFIG,
+            domain=DOMAIN,
+            types=TYPES,
+            message=MESSAGE,
+            primary_type="TransferWithAuthorization",
+        )
+
+        assert SmartAccountSigner(CONFIG).sign_hash(_digest()) == expected
+
+    def test_signer_is_shared_per_config(self) -> None:
+        """Test that the signer is built once per config."""
+        assert smart_account_signer(CONFIG) is smart_account_signer(CONFIG)
@@ -0,0 +1,138 @@
+"""Unit tests for RequirementSelector."""
+
+from unittest.mock import MagicMock
+
+from ampersend_sdk.x402 import RequirementSelector
+from ampersend_sdk.x402.selector import LatencyHistogram, requirement_key
+from x402.networks import SupportedNetworks
+from x402_a2a.types import PaymentRequirements, PaymentStatus
+
+
+def _requirements(
+    network: SupportedNetworks = "base-sepolia",
+    scheme: str = "exact",
+    amount: str = "1000",
+    asset: str = "0x036CbD53842c5426634e7929541eC2318f3dCF7e",
+) -> PaymentRequirements:
+    return PaymentRequirements(
+        scheme=scheme,
+        network=network,
+        max_amount_required=amount,
+        resource="https://seller.example.com",
+        description="test",
+        mime_type="application/json",
+        pay_to="0x9876543210987654321098765432109876543210",
+        max_timeout_seconds=60,
+        asset=asset,
+        extra={"name": "USDC", "version": "2"},
+    )
+
+
+def _observe(
+    selector: RequirementSelector,
+    requirements: PaymentRequirements,
+    status: PaymentStatus,
+    samples: int = 1,
+) -> None:
+    for i in range(samples):
+        authorization_id = f"{requirements.network}-{status}-{i}"
+        selector.track(authorization_id, requirements)
+        selector.observe(status, authorization_id)
+
+
+class TestLatencyHistogram:
+    """Test LatencyHistogram."""
+
+    def test_quantile_uses_bucket_upper_bound(self) -> None:
+        histogram = LatencyHistogram()
+        for latency in (10, 20, 300, 400, 700):
+            histogram.record(latency)
+
+        assert histogram.quantile(0.5) == 500
+        assert histogram.quantile(1.0) == 1000
+
+    def test_window_rolls(self) -> None:
+        histogram = LatencyHistogram(window=2)
+        for latency in (20000, 20000, 10, 10):
+            histogram.record(latency)
+
+        assert len(histogram) == 2
+        assert histogram.quantile(1.0) == 50
+
+
+class TestRequirementSelector:
+    """Test RequirementSelector."""
+
+    def test_filters_unsignable_requirements(self) -> None:
+        selector = RequirementSelector(networks=["base"])
+        accepts = [
+            _requirements(network="base-sepolia"),
+            _requirements(network="base", scheme="upto"),
+            _requirements(network="base"),
+        ]
+
+        assert selector.rank(accepts) == [accepts[2]]
+        assert selector.select(accepts[:2]) is None
+
+    def test_index_groups_by_network_scheme_asset(self) -> None:
+        selector = RequirementSelector()
+        accepts = [
+            _requirements(amount="1"),
+            _requirements(amount="2"),
+            _requirements(network="base"),
+        ]
+
+        index = selector.index(accepts)
+
+        assert index[requirement_key(accepts[0])] == accepts[:2]
+        assert index[requirement_key(accepts[2])] == [accepts[2]]
+
+    def test_ranks_by_amount_without_samples(self) -> None:
+        selector = RequirementSelector()
+        accepts = [
+            _requirements(network="base", amount="2000"),
+            _requirements(network="base-sepolia", amount="1000"),
+        ]
+
+        assert selector.select(accepts) is accepts[1]
+
+    def test_prefers_fastest_network(self) -> None:
+        selector = RequirementSelector()
+        slow = _requirements(network="base", amount="1000")
+        fast = _requirements(network="base-sepolia", amount="2000")
+
+        # Failures count as the slowest bucket
+        _observe(selector, slow, PaymentStatus.PAYMENT_FAILED, samples=3)
+        _observe(selector, fast, PaymentStatus.PAYMENT_COMPLETED, samples=3)
+
+        assert selector.select([slow, fast]) is fast
+        assert selector.latency(requirement_key(fast)) == 50
+
+    def test_unmeasured_options_are_explored(self) -> None:
+        selector = RequirementSelector()
+        measured = _requirements(network="base")
+        unmeasured = _requirements(network="base-sepolia")
+        _observe(selector, measured, PaymentStatus.PAYMENT_COMPLETED)
+
+        assert selector.select([measured, unmeasured]) is unmeasured
+
+    def test_observe_ignores_untracked_and_intermediate_updates(self) -> None:
+        selector = RequirementSelector()
+        requirements = _requirements()
+        selector.observe(PaymentStatus.PAYMENT_COMPLETED, "unknown")
+        selector.observe(MagicMock(), "unknown")
+
+        selector.track("id", requirements)
+        selector.observe(PaymentStatus.PAYMENT_SUBMITTED, "id")
+        selector.observe(PaymentStatus.PAYMENT_VERIFIED, "id")
+        assert selector.latency(requirement_key(requirements)) is None
+
+        selector.observe(PaymentStatus.PAYMENT_COMPLETED, "id")
+        assert selector.latency(requirement_key(requirements)) is not None
+
+    def test_tracked_payments_are_bounded(self) -> None:
+        selector = RequirementSelector(max_tracked=2)
+        for i in range(5):
+            selector.track(str(i), _requirements())
+
+        assert list(selector._tracked) == ["3", "4"]
@@ -0,0 +1,116 @@
+"""Unit tests for BudgetTreasurer."""
+
+import asyncio
+import uuid
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from ampersend_sdk.x402 import X402Authorization, X402Treasurer
+from ampersend_sdk.x402.treasurers import BudgetTreasurer
+from x402_a2a.types import PaymentStatus
+
+
+def _payment_required(amount: int) -> MagicMock:
+    payment_required = MagicMock(name="x402PaymentRequiredResponse")
+    payment_required.accepts = [MagicMock(max_amount_required=str(amount))]
+    return payment_required
+
+
+def _inner() -> MagicMock:
+    """Treasurer paying the first offered amount."""
+
+    async def authorize(payment_required: Any, **kwargs: Any) -> X402Authorization:
+        payment = MagicMock()
+        payment.payload.authorization.value = payment_required.accepts[
+            0
+        ].max_amount_required
+        return X402Authorization(payment=payment, authorization_id=uuid.uuid4().hex)
+
+    treasurer = MagicMock(spec=X402Treasurer)
+    treasurer.onPaymentRequired = AsyncMock(side_effect=authorize)
+    treasurer.onStatus = AsyncMock()
+    return treasurer
+
+
+@pytest.mark.asyncio
+class TestBudgetTreasurer:
+    """Test budget accounting."""
+
+    async def test_pays_within_budget(self) -> None:
+        treasurer = BudgetTreasurer(_inner(), budget=100)
+
+        authorization = await treasurer.onPaymentRequired(_payment_required(60))
+
+        assert authorization is not None
+        assert treasurer.remaining == 40
+
+    async def test_refuses_payment_over_remaining_budget(self) -> None:
+        inner = _inner()
+        treasurer = BudgetTreasurer(inner, budget=100)
+        await treasurer.onPaymentRequired(_payment_required(60))
+
+        assert await treasurer.onPaymentRequired(_payment_required(60)) is None
+        assert inner.onPaymentRequired.await_count == 1
+
+    async def test_concurrent_payments_do_not_overspend(self) -> None:
+        inner = _inner()
+        authorize = inner.onPaymentRequired.side_effect
+
+        async def slow_authorize(*args: Any, **kwargs: Any) -> Any:
+            await asyncio.sleep(0.01)
+            return await authorize(*args, **kwargs)
+
+        inner.onPaymentRequired.side_effect = slow_authorize
+        treasurer = BudgetTreasurer(inner, budget=100)
+
+        results = await asyncio.gather(
+            *(treasurer.onPaymentRequired(_payment_required(40)) for _ in range(3))
+        )
+
+        assert sum(result is not None for result in results) == 2
+        assert treasurer.remaining == 20
+
+    async def test_failed_payment_is_released(self) -> None:
+        treasurer = BudgetTreasurer(_inner(), budget=100)
+        authorization = await treasurer.onPaymentRequired(_payment_required(60))
+        assert authorization is not None
+
+        await treasurer.onStatus(PaymentStatus.PAYMENT_FAILED, authorization)
+
+        assert treasurer.remaining == 100
+
+    async def test_completed_payment_is_spent(self) -> None:
+        inner = _inner()
+        treasurer = BudgetTreasurer(inner, budget=100)
+        authorization = await treasurer.onPaymentRequired(_payment_required(60))
+        assert authorization is not None
+
+        await treasurer.onStatus(PaymentStatus.PAYMENT_COMPLETED, authorization)
+
+        assert treasurer.spent == 60
+        assert treasurer.remaining == 40
+        inner.onStatus.assert_awaited_once()
+
+    async def test_closed_refuses_and_reports_discarded_payments(self) -> None:
+        inner = _inner()
+        treasurer = BudgetTreasurer(inner)
+        release = asyncio.Event()
+        authorize = inner.onPaymentRequired.side_effect
+
+        async def blocked_authorize(*args: Any, **kwargs: Any) -> Any:
+            await release.wait()
+            return await authorize(*args, **kwargs)
+
+        inner.onPaymentRequired.side_effect = blocked_authorize
+        pending = asyncio.create_task(treasurer.onPaymentRequired(_payment_required(1)))
+        await asyncio.sleep(0)
+
+        treasurer.close()
+        release.set()
+
+        assert await pending is None
+        assert inner.onStatus.await_args.kwargs["status"] == (
+            PaymentStatus.PAYMENT_REJECTED
+        )
+        assert await treasurer.onPaymentRequired(_payment_required(1)) is None
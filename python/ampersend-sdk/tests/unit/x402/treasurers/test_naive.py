@@ -1,9 +1,9 @@
 """Unit tests for NaiveTreasurer."""
 
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
-from ampersend_sdk.x402 import X402Wallet
+from ampersend_sdk.x402 import AsyncX402Wallet, X402Wallet
 from ampersend_sdk.x402.treasurers import (
     NaiveTreasurer,
 )
@@ -50,3 +50,39 @@ class TestNaiveTreasurer:
             authorization=MagicMock(authorization_id="test-id", payment=MagicMock()),
             context=None,
         )
+
+    async def test_onPaymentRequired_with_async_wallet(self) -> None:
+        """Test that async wallets are awaited."""
+        mock_wallet = MagicMock(spec=AsyncX402Wallet)
+        mock_wallet.create_payment = AsyncMock(
+            return_value=MagicMock(name="PaymentPayload")
+        )
+
+        treasurer = NaiveTreasurer(wallet=mock_wallet)
+
+        mock_payment_required = MagicMock(name="x402PaymentRequiredResponse")
+        mock_payment_required.accepts = [MagicMock(scheme="exact")]
+
+        result = await treasurer.onPaymentRequired(mock_payment_required)
+        assert result is not None
+        assert result.payment is mock_wallet.create_payment.return_value
+        mock_wallet.create_payment.assert_awaited_once()
+
+    async def test_onPaymentRequired_pays_selected_requirements(self) -> None:
+        """Test that the selector picks what gets paid."""
+        mock_wallet = MagicMock(spec=X402Wallet)
+        mock_wallet.create_payment.return_value = MagicMock(name="PaymentPayload")
+        unsupported = MagicMock(scheme="upto")
+        supported = MagicMock(scheme="exact", max_amount_required="1000")
+
+        treasurer = NaiveTreasurer(wallet=mock_wallet)
+
+        mock_payment_required = MagicMock(name="x402PaymentRequiredResponse")
+        mock_payment_required.accepts = [unsupported, supported]
+        result = await treasurer.onPaymentRequired(mock_payment_required)
+
+        assert result is not None
+        mock_wallet.create_payment.assert_called_once_with(requirements=supported)
+
+        mock_payment_required.accepts = [unsupported]
+        assert await treasurer.onPaymentRequired(mock_payment_required) is None
@@ -0,0 +1,73 @@
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+from ampersend_sdk.smart_account import SmartAccountConfig
+from ampersend_sdk.x402.wallets.executor import ExecutorWallet
+from ampersend_sdk.x402.wallets.smart_account import SmartAccountWallet
+from x402_a2a import PaymentRequirements
+
+SMART_ACCOUNT_ADDRESS = "0x1234567890123456789012345678901234567890"
+PAY_TO = "0x9876543210987654321098765432109876543210"
+
+
+def _config() -> SmartAccountConfig:
+    return SmartAccountConfig(
+        smart_account_address=SMART_ACCOUNT_ADDRESS,
+        session_key="0x" + "a" * 64,
+        validator_address=SMART_ACCOUNT_ADDRESS,
+    )
+
+
+def _requirements() -> PaymentRequirements:
+    return PaymentRequirements(
+        scheme="exact",
+        network="base-sepolia",
+        max_amount_required="1000000",
+        resource="https://seller.example.com",
+        description="test",
+        mime_type="application/json",
+        pay_to=PAY_TO,
+        max_timeout_seconds=3600,
+        asset="0x036CbD53842c5426634e7929541eC2318f3dCF7e",
+        extra={"version": "2", "name": "USDC"},
+    )
+
+
+@pytest.mark.asyncio
+class TestExecutorWallet:
+    async def test_signs_on_executor_thread(self) -> None:
+        threads = []
+        inner = MagicMock()
+        inner.create_payment.side_effect = lambda requirements: threads.append(
+            threading.current_thread()
+        )
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            wallet = ExecutorWallet(inner, executor)
+            await wallet.create_payment(requirements=MagicMock())
+
+        assert threads and threads[0] is not threading.current_thread()
+
+    async def test_thread_pool_payment(self) -> None:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            wallet = ExecutorWallet(SmartAccountWallet(config=_config()), executor)
+            payment = await wallet.create_payment(requirements=_requirements())
+
+        assert payment.scheme == "exact"
+        assert payment.payload.authorization.from_ == SMART_ACCOUNT_ADDRESS
+        assert payment.payload.authorization.to == PAY_TO
+
+    async def test_process_pool_payment(self) -> None:
+        wallet = ExecutorWallet.with_process_pool(
+            functools.partial(SmartAccountWallet, _config()), max_workers=1
+        )
+        try:
+            payment = await wallet.create_payment(requirements=_requirements())
+        finally:
+            wallet.close()
+
+        assert payment.scheme == "exact"
+        assert payment.payload.authorization.from_ == SMART_ACCOUNT_ADDRESS
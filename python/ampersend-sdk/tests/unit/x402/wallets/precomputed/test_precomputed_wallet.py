@@ -0,0 +1,169 @@
+import asyncio
+import time
+from typing import List
+from unittest.mock import MagicMock
+
+import pytest
+from ampersend_sdk.smart_account import SmartAccountConfig
+from ampersend_sdk.x402.wallets.precomputed import PrecomputedPaymentWallet
+from ampersend_sdk.x402.wallets.smart_account import SmartAccountWallet
+from x402_a2a import PaymentPayload, PaymentRequirements
+
+SMART_ACCOUNT_ADDRESS = "0x1234567890123456789012345678901234567890"
+
+
+def _requirements(
+    amount: str = "1000000", max_timeout_seconds: int = 3600
+) -> PaymentRequirements:
+    return PaymentRequirements(
+        scheme="exact",
+        network="base-sepolia",
+        max_amount_required=amount,
+        resource="https://seller.example.com",
+        description="test",
+        mime_type="application/json",
+        pay_to="0x9876543210987654321098765432109876543210",
+        max_timeout_seconds=max_timeout_seconds,
+        asset="0x036CbD53842c5426634e7929541eC2318f3dCF7e",
+        extra={"version": "2", "name": "USDC"},
+    )
+
+
+def _inner() -> SmartAccountWallet:
+    return SmartAccountWallet(
+        SmartAccountConfig(
+            smart_account_address=SMART_ACCOUNT_ADDRESS,
+            session_key="0x" + "a" * 64,
+            validator_address=SMART_ACCOUNT_ADDRESS,
+        )
+    )
+
+
+def _nonces(payments: List[PaymentPayload]) -> set[str]:
+    return {p.payload.authorization.nonce for p in payments}
+
+
+@pytest.mark.asyncio
+class TestPrecomputedPaymentWallet:
+    async def test_miss_signs_inline_and_registers_pool(self) -> None:
+        wallet = PrecomputedPaymentWallet(_inner(), pool_size=4)
+
+        payment = wallet.create_payment(_requirements())
+
+        assert payment.payload.authorization.value == "1000000"
+        assert wallet.stats.misses == 1
+        assert wallet.available(_requirements()) == 0
+
+        await wallet.refill()
+        assert wallet.available(_requirements()) == 4
+
+    async def test_hits_pop_distinct_presigned_payments(self) -> None:
+        inner = _inner()
+        wallet = PrecomputedPaymentWallet(inner, pool_size=4)
+        wallet.watch(_requirements())
+        await wallet.refill()
+
+        inner.create_payment = MagicMock()  # type: ignore[method-assign]
+        payments = [wallet.create_payment(_requirements()) for _ in range(4)]
+
+        inner.create_payment.assert_not_called()
+        assert wallet.stats.hits == 4
+        assert len(_nonces(payments)) == 4
+
+    async def test_pools_are_per_requirements(self) -> None:
+        wallet = PrecomputedPaymentWallet(_inner(), pool_size=2)
+        wallet.watch(_requirements(amount="1"))
+        await wallet.refill()
+
+        payment = wallet.create_payment(_requirements(amount="2"))
+
+        assert payment.payload.authorization.value == "2"
+        assert wallet.stats.misses == 1
+        assert wallet.available(_requirements(amount="1")) == 2
+
+    async def test_expired_payments_are_evicted(self) -> None:
+        wallet = PrecomputedPaymentWallet(_inner(), pool_size=2, min_validity=30)
+        wallet.watch(_requirements())
+        await wallet.refill()
+
+        # Pretend the pool was signed long ago
+        for payment in wallet._pools[wallet.key(_requirements())].payments:
+            payment.payload.authorization.valid_before = str(int(time.time()) + 10)
+
+        wallet.create_payment(_requirements())
+
+        assert wallet.stats.evicted == 2
+        assert wallet.stats.misses == 1
+
+    async def test_payments_past_half_their_timeout_are_evicted(self) -> None:
+        wallet = PrecomputedPaymentWallet(_inner(), pool_size=2)
+        wallet.watch(_requirements(max_timeout_seconds=600))
+        await wallet.refill()
+
+        payments = wallet._pools[
+            wallet.key(_requirements(max_timeout_seconds=600))
+        ].payments
+        payments[0].payload.authorization.valid_before = str(int(time.time()) + 299)
+        payments[1].payload.authorization.valid_before = str(int(time.time()) + 310)
+
+        wallet.create_payment(_requirements(max_timeout_seconds=600))
+
+        assert wallet.stats.evicted == 1
+        assert wallet.stats.hits == 1
+
+    async def test_short_timeouts_are_not_pooled(self) -> None:
+        wallet = PrecomputedPaymentWallet(_inner(), pool_size=2, min_validity=30)
+        wallet.watch(_requirements(max_timeout_seconds=10))
+
+        await wallet.refill()
+
+        assert wallet.available(_requirements(max_timeout_seconds=10)) == 0
+
+    async def test_signing_failure_does_not_stop_other_pools(self) -> None:
+        inner = _inner()
+        create_payments = inner.create_payments
+
+        def fail_for_amount_1(
+            requirements: List[PaymentRequirements],
+        ) -> List[PaymentPayload | Exception]:
+            if requirements[0].max_amount_required == "1":
+                raise RuntimeError("signer unavailable")
+            return create_payments(requirements)
+
+        inner.create_payments = fail_for_amount_1  # type: ignore[method-assign,assignment]
+        wallet = PrecomputedPaymentWallet(inner, pool_size=2)
+        wallet.watch(_requirements(amount="1"))
+        wallet.watch(_requirements(amount="2"))
+
+        await wallet.refill()
+
+        assert wallet.available(_requirements(amount="1")) == 0
+        assert wallet.available(_requirements(amount="2")) == 2
+
+    async def test_idle_pools_are_dropped(self) -> None:
+        wallet = PrecomputedPaymentWallet(_inner(), pool_size=2, idle_timeout=60)
+        wallet.watch(_requirements(amount="1"))
+        wallet.watch(_requirements(amount="2"))
+        await wallet.refill()
+
+        # Pretend the first pool was last used long ago
+        wallet._pools[wallet.key(_requirements(amount="1"))].last_used -= 120
+        await wallet.refill()
+
+        assert wallet.available(_requirements(amount="1")) == 0
+        assert wallet.available(_requirements(amount="2")) == 2
+        assert wallet.stats.evicted == 2
+
+    async def test_background_refill(self) -> None:
+        wallet = PrecomputedPaymentWallet(_inner(), pool_size=3, refill_interval=60)
+        wallet.start()
+        try:
+            wallet.create_payment(_requirements())
+            for _ in range(100):
+                if wallet.available(_requirements()) == 3:
+                    break
+                await asyncio.sleep(0.01)
+            assert wallet.available(_requirements()) == 3
+        finally:
+            await wallet.close()
+        assert wallet.available(_requirements()) == 0
@@ -0,0 +1,160 @@
+"""Unit tests for batch payment creation."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from ampersend_sdk.smart_account import SmartAccountConfig
+from ampersend_sdk.x402.wallets.account import AccountWallet
+from ampersend_sdk.x402.wallets.smart_account import SmartAccountWallet
+from ampersend_sdk.x402.wallets.smart_account.exact import sign_erc3009_authorization
+from eth_account import Account
+from eth_account.messages import SignableMessage, encode_typed_data
+from eth_utils.conversions import to_bytes
+from x402_a2a import PaymentPayload, PaymentRequirements
+
+USDC = "0x036CbD53842c5426634e7929541eC2318f3dCF7e"
+SMART_ACCOUNT = "0x1234567890123456789012345678901234567890"
+
+
+def _requirements(
+    amount: str = "1000",
+    asset: str = USDC,
+    name: str = "USDC",
+    scheme: str = "exact",
+) -> PaymentRequirements:
+    return PaymentRequirements(
+        scheme=scheme,
+        network="base-sepolia",
+        max_amount_required=amount,
+        resource="https://seller.example.com",
+        description="test",
+        mime_type="application/json",
+        pay_to="0x9876543210987654321098765432109876543210",
+        max_timeout_seconds=300,
+        asset=asset,
+        extra={"name": name, "version": "2"},
+    )
+
+
+def _signable(
+    requirements: PaymentRequirements, payment: PaymentPayload
+) -> SignableMessage:
+    auth = payment.payload.authorization
+    assert requirements.extra is not None
+    return encode_typed_data(
+        domain_data={
+            "name": requirements.extra["name"],
+            "version": requirements.extra["version"],
+            "chainId": 84532,
+            "verifyingContract": requirements.asset,
+        },
+        message_types={
+            "TransferWithAuthorization": [
+                {"name": "from", "type": "address"},
+                {"name": "to", "type": "address"},
+                {"name": "value", "type": "uint256"},
+                {"name": "validAfter", "type": "uint256"},
+                {"name": "validBefore", "type": "uint256"},
+                {"name": "nonce", "type": "bytes32"},
+            ]
+        },
+        message_data={
+            "from": auth.from_,
+            "to": auth.to,
+            "value": int(auth.value),
+            "validAfter": int(auth.valid_after),
+            "validBefore": int(auth.valid_before),
+            "nonce": to_bytes(hexstr=auth.nonce),
+        },
+    )
+
+
+class TestAccountWalletCreatePayments:
+    """Test AccountWallet.create_payments."""
+
+    def test_signatures_recover_to_account(self) -> None:
+        account = Account.from_key("0x" + "a" * 64)
+        wallet = AccountWallet(account)
+        requirements = [
+            _requirements(amount=str(i + 1), name="USDC" if i % 2 else "EURC")
+            for i in range(6)
+        ]
+
+        payments = wallet.create_payments(requirements)
+
+        assert len(payments) == 6
+        for item, payment in zip(requirements, payments):
+            assert isinstance(payment, PaymentPayload)
+            auth = payment.payload.authorization
+            assert auth.from_ == account.address
+            assert auth.value == item.max_amount_required
+            assert len(to_bytes(hexstr=auth.nonce)) == 32
+            recovered = Account.recover_message(
+                _signable(item, payment), signature=payment.payload.signature
+            )
+            assert recovered == account.address
+
+        nonces = {p.payload.authorization.nonce for p in payments}  # type: ignore[union-attr]
+        assert len(nonces) == 6
+
+    def test_per_item_errors_keep_order(self) -> None:
+        wallet = AccountWallet(Account.from_key("0x" + "a" * 64))
+        requirements = [
+            _requirements(amount="1"),
+            _requirements(scheme="upto"),
+            _requirements(amount="3"),
+        ]
+
+        payments = wallet.create_payments(requirements)
+
+        assert isinstance(payments[0], PaymentPayload)
+        assert isinstance(payments[1], ValueError)
+        assert isinstance(payments[2], PaymentPayload)
+        assert payments[0].payload.authorization.value == "1"
+        assert payments[2].payload.authorization.value == "3"
+
+
+class TestSmartAccountWalletCreatePayments:
+    """Test SmartAccountWallet.create_payments."""
+
+    def test_matches_single_signing_path(self) -> None:
+        config = SmartAccountConfig(
+            session_key="0x" + "a" * 64,
+            smart_account_address=SMART_ACCOUNT,
+            validator_address="0x000000000013fdB5234E4E3162a810F54d9f7E98",
+        )
+        wallet = SmartAccountWallet(config)
+        requirements = [_requirements(amount=str(i + 1)) for i in range(8)]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            payments = wallet.create_payments(requirements, executor=executor)
+
+        for item, payment in zip(requirements, payments):
+            assert isinstance(payment, PaymentPayload)
+            assert payment.payload.authorization.from_ == SMART_ACCOUNT
+            assert payment.payload.signature == sign_erc3009_authorization(
+                config=config,
+                authorization=payment.payload.authorization,
+                domain_verifying_contract=item.asset,
+                domain_chain_id=84532,
+                domain_name="USDC",
+                domain_version="2",
+            )
+
+    def test_signing_failure_is_reported_per_item(self) -> None:
+        config = SmartAccountConfig(
+            session_key="0x" + "a" * 64,
+            smart_account_address=SMART_ACCOUNT,
+            validator_address=SMART_ACCOUNT,
+        )
+        wallet = SmartAccountWallet(config)
+
+        class FailingExecutor(ThreadPoolExecutor):
+            def submit(self, fn, /, *args, **kwargs):  # type: ignore[no-untyped-def]
+                raise RuntimeError("executor down")
+
+        with FailingExecutor(max_workers=1) as executor:
+            payments = wallet.create_payments(
+                [_requirements(), _requirements()], executor=executor
+            )
+
+        assert all(isinstance(p, RuntimeError) for p in payments)